@@ -1,825 +1,2231 @@
-import phylib
-import os
-import sqlite3
-import math
-
-################################################################################
-# import constants from phylib to global varaibles
-BALL_RADIUS = phylib.PHYLIB_BALL_RADIUS
-BALL_DIAMETER = phylib.PHYLIB_BALL_DIAMETER
-HOLE_RADIUS = phylib.PHYLIB_HOLE_RADIUS
-TABLE_LENGTH = phylib.PHYLIB_TABLE_LENGTH
-TABLE_WIDTH = phylib.PHYLIB_TABLE_WIDTH
-SIM_RATE = phylib.PHYLIB_SIM_RATE
-VEL_EPSILON = phylib.PHYLIB_VEL_EPSILON
-DRAG = phylib.PHYLIB_DRAG
-MAX_TIME = phylib.PHYLIB_MAX_TIME
-MAX_OBJECTS = phylib.PHYLIB_MAX_OBJECTS
-FRAME_RATE = 0.01
-
-HEADER = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
-<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN"
-"http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
-<svg width="700" height="1375" viewBox="-25 -25 1400 2750"
-xmlns="http://www.w3.org/2000/svg"
-xmlns:xlink="http://www.w3.org/1999/xlink">
-<rect width="1350" height="2700" x="0" y="0" fill="#C0D0C0" onmousemove="trackit(event);"/>"""
-FOOTER = """</svg>\n"""
-
-################################################################################
-# the standard colours of pool balls
-# if you are curious check this out:
-# https://billiards.colostate.edu/faq/ball/colors/
-
-BALL_COLOURS = [
-    "WHITE",
-    "YELLOW",
-    "BLUE",
-    "RED",
-    "PURPLE",
-    "ORANGE",
-    "GREEN",
-    "BROWN",
-    "BLACK",
-    "LIGHTYELLOW",
-    "LIGHTBLUE",
-    "PINK",             # no LIGHTRED
-    "MEDIUMPURPLE",     # no LIGHTPURPLE
-    "LIGHTSALMON",      # no LIGHTORANGE
-    "LIGHTGREEN",
-    "SANDYBROWN",       # no LIGHTBROWN
-]
-
-################################################################################
-
-
-class Coordinate(phylib.phylib_coord):
-    """
-    This creates a Coordinate subclass, that adds nothing new, but looks
-    more like a nice Python class.
-    """
-    pass
-
-################################################################################
-
-
-class StillBall(phylib.phylib_object):
-    """
-    Python StillBall class.
-    """
-
-    def __init__(self, number, pos):
-        """
-        Constructor function. Requires ball number and position (x,y) as
-        arguments.
-        """
-
-        # this creates a generic phylib_object
-        phylib.phylib_object.__init__(self,
-                                      phylib.PHYLIB_STILL_BALL,
-                                      number,
-                                      pos, None, None,
-                                      0.0, 0.0)
-
-        # this converts the phylib_object into a StillBall class
-        self.obj.still_ball.number = number
-        self.obj.still_ball.pos = pos
-        self.__class__ = StillBall
-
-    # StillBall:
-    def svg(self):
-        """
-        where cx and cy are the pos of the Ball, r is the BALL_RADIUS, and fill is the
-        appropriate value from BALL_COLOURS.
-        """
-        return """ <circle cx="%d" cy="%d" r="%d" fill="%s" id="%d" />\n""" % (
-            float(self.obj.still_ball.pos.x),
-            float(self.obj.still_ball.pos.y),
-            BALL_RADIUS,
-            BALL_COLOURS[self.obj.still_ball.number], self.obj.still_ball.number
-        )
-
-################################################################################
-
-
-class RollingBall(phylib.phylib_object):
-    """
-    Python RollingBall class.
-    """
-
-    def __init__(self, number, pos, vel, acc):
-        """
-        Constructor function. Requires ball number and position (x,y) as
-        arguments.
-        """
-
-        # this creates a generic phylib_object
-        phylib.phylib_object.__init__(self,
-                                      phylib.PHYLIB_ROLLING_BALL,
-                                      number,
-                                      pos, vel, acc,
-                                      0.0, 0.0)
-
-        # this converts the phylib_object into a RollingBall class
-        self.obj.rolling_ball.number = number
-        self.obj.rolling_ball.pos = pos
-        self.obj.rolling_ball.vel = vel
-        self.obj.rolling_ball.acc = acc
-        self.__class__ = RollingBall
-
-    # RollingBall:
-    def svg(self):
-        """
-        where cx and cy are the pos of the Ball, r is the BALL_RADIUS, and fill is the
-        appropriate value from BALL_COLOURS.
-        """
-        return """ <circle cx="%d" cy="%d" r="%d" fill="%s" id="%d" />\n""" % (
-            float(self.obj.rolling_ball.pos.x),
-            float(self.obj.rolling_ball.pos.y),
-            BALL_RADIUS,
-            BALL_COLOURS[self.obj.rolling_ball.number], self.obj.rolling_ball.number
-        )
-
-################################################################################
-
-
-class Hole(phylib.phylib_object):
-    """
-    Python Hole class.
-    """
-
-    def __init__(self, pos):
-        """
-        Constructor function. Requires ball number and position (x,y) as
-        arguments.
-        """
-
-        # this creates a generic phylib_object
-        phylib.phylib_object.__init__(self,
-                                      phylib.PHYLIB_HOLE,
-                                      0,
-                                      pos, None, None,
-                                      0.0, 0.0)
-
-        # this converts the phylib_object into a Hole class
-        self.obj.hole.pos = pos
-        self.__class__ = Hole
-
-    # Hole:
-    def svg(self):
-        """
-        where cx and cy are the pos of the Hole, and r is the HOLE_RADIUS.
-        """
-        return """ <circle cx="%d" cy="%d" r="%d" fill="black" />\n""" % (
-            float(self.obj.hole.pos.x),
-            float(self.obj.hole.pos.y),
-            HOLE_RADIUS
-        )
-
-################################################################################
-
-
-class HCushion(phylib.phylib_object):
-    """
-    Python HCushion class.
-    """
-
-    def __init__(self, y):
-        """
-        Constructor function. Requires ball number and position (x,y) as
-        arguments.
-        """
-
-        # this creates a generic phylib_object
-        phylib.phylib_object.__init__(self,
-                                      phylib.PHYLIB_HCUSHION,
-                                      0,
-                                      None, None, None,
-                                      0.0, y)
-
-        # this converts the phylib_object into a HCushion class
-        self.obj.hcushion.y = y
-        self.__class__ = HCushion
-
-    # HCushion:
-    def svg(self):
-        """
-        where y is -25 if the cushion is at the top and y is 2700 if the cushion is at bottom.
-        """
-        if self.obj.hcushion.y == 0:
-            self.obj.hcushion.y = -25
-        else:
-            self.obj.hcushion.y == 2700
-        return """ <rect width="1400" height="25" x="-25" y="%d" fill="darkgreen" />\n""" % (
-            float(self.obj.hcushion.y)
-        )
-
-################################################################################
-
-
-class VCushion(phylib.phylib_object):
-    """
-    Python VCushion class.
-    """
-
-    def __init__(self, x):
-        """
-        Constructor function. Requires ball number and position (x,y) as
-        arguments.
-        """
-
-        # this creates a generic phylib_object
-        phylib.phylib_object.__init__(self,
-                                      phylib.PHYLIB_VCUSHION,
-                                      0,
-                                      None, None, None,
-                                      x, 0.0)
-
-        # this converts the phylib_object into a VCushion class
-        self.obj.vcushion.x = x
-        self.__class__ = VCushion
-
-    # VCushion:
-    def svg(self):
-        """
-        where x is -25 if the cushion is on the left and x is 1350 if the cushion is at the right.
-        """
-        if self.obj.vcushion.x == 0:
-            self.obj.vcushion.x = -25
-        else:
-            self.obj.vcushion.x == 2700
-        return """ <rect width="25" height="2750" x="%d" y="-25" fill="darkgreen" />\n""" % (
-            float(self.obj.vcushion.x)
-        )
-
-################################################################################
-
-
-class Table(phylib.phylib_table):
-    """
-    Pool table class.
-    """
-
-    def __init__(self):
-        """
-        Table constructor method.
-        This method call the phylib_table constructor and sets the current
-        object index to -1.
-        """
-        phylib.phylib_table.__init__(self)
-
-        self.current = -1
-
-    def __iadd__(self, other):
-        """
-        += operator overloading method.
-        This method allows you to write "table+=object" to add another object
-        to the table.
-        """
-        self.add_object(other)
-        return self
-
-    def __iter__(self):
-        """
-        This method adds iterator support for the table.
-        This allows you to write "for object in table:" to loop over all
-        the objects in the table.
-        """
-        return self
-
-    def __next__(self):
-        """
-        This provides the next object from the table in a loop.
-        """
-        self.current += 1  # increment the index to the next object
-        if self.current < MAX_OBJECTS:   # check if there are no more objects
-            return self[self.current]  # return the latest object
-
-        # if we get there then we have gone through all the objects
-        self.current = -1    # reset the index counter
-        raise StopIteration  # raise StopIteration to tell for loop to stop
-
-    def __getitem__(self, index):
-        """
-        This method adds item retreivel support using square brackets [ ] .
-        It calls get_object (see phylib.i) to retreive a generic phylib_object
-        and then sets the __class__ attribute to make the class match
-        the object type.
-        """
-        result = self.get_object(index)
-        if result == None:
-            return None
-        if result.type == phylib.PHYLIB_STILL_BALL:
-            result.__class__ = StillBall
-        if result.type == phylib.PHYLIB_ROLLING_BALL:
-            result.__class__ = RollingBall
-        if result.type == phylib.PHYLIB_HOLE:
-            result.__class__ = Hole
-        if result.type == phylib.PHYLIB_HCUSHION:
-            result.__class__ = HCushion
-        if result.type == phylib.PHYLIB_VCUSHION:
-            result.__class__ = VCushion
-        return result
-
-    def __str__(self):
-        """
-        Returns a string representation of the table that matches
-        the phylib_print_table function from A1Test1.c.
-        """
-        result = ""    # create empty string
-        result += "time = %6.1f;\n" % self.time    # append time
-        for i, obj in enumerate(self):  # loop over all objects and number them
-            result += "  [%02d] = %s\n" % (i, obj)  # append object description
-        return result  # return the string
-
-    def segment(self):
-        """
-        Calls the segment method from phylib.i (which calls the phylib_segment
-        functions in phylib.c.
-        Sets the __class__ of the returned phylib_table object to Table
-        to make it a Table object.
-        """
-
-        result = phylib.phylib_table.segment(self)
-        if result:
-            result.__class__ = Table
-            result.current = -1
-        return result
-
-    # add svg method here
-    def svg(self):
-        """
-        This method should create a string that consists of the concatenation of the HEADER + 
-        return values of the svg method called on every object in the Table + 
-        FOOTER
-        """
-        tableString = HEADER
-        for obj in self:
-            if obj:
-                tableString += obj.svg()
-        tableString += FOOTER
-        return tableString
-
-    def roll(self, t):
-        new = Table()
-        for ball in self:
-            if isinstance(ball, RollingBall):
-                # create4 a new ball with the same number as the old ball
-                new_ball = RollingBall(ball.obj.rolling_ball.number,
-                                       Coordinate(0, 0),
-                                       Coordinate(0, 0),
-                                       Coordinate(0, 0))
-                # compute where it rolls to
-                phylib.phylib_roll(new_ball, ball, t)
-                # add ball to table
-                new += new_ball
-            if isinstance(ball, StillBall):
-                # create a new ball with the same number and pos as the old ball
-                new_ball = StillBall(ball.obj.still_ball.number,
-                                     Coordinate(ball.obj.still_ball.pos.x,
-                                                ball.obj.still_ball.pos.y))
-                # add ball to table
-                new += new_ball
-        # return table
-        return new
-
-################################################################################
-
-
-class Database ():
-
-    def __init__(self, reset=False):
-
-        # If reset is set to True, it should first delete the file “ phylib.db”
-        # so that a fresh database is created upon connection
-        if reset == True and os.path.exists('phylib.db'):
-            os.remove('phylib.db')
-
-        # This constructor should create/open a database connection to a file
-        # in the local directory called “phylib.db” and store it as a class attribute.
-        conn = sqlite3.connect('phylib.db')
-        # connection=sqlite3
-
-        self.db = conn
-
-    def createDB(self):
-
-        cur = self.db.cursor()
-
-        # Create the database tables described above.
-        # If any of the tables already exist,
-        # it should leave them alone and not re-create them.
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS Ball (
-            BALLID INTEGER PRIMARY KEY AUTOINCREMENT,
-            BALLNO INTEGER NOT NULL,
-            XPOS FLOAT NOT NULL,
-            YPOS FLOAT NOT NULL,
-            XVEL FLOAT,
-            YVEL FLOAT
-        );
-        """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS TTable(
-            TABLEID INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
-            TIME FLOAT NOT NULL
-        );
-        """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS BallTable (
-            BALLID INTEGER NOT NULL,
-            TABLEID INTEGER NOT NULL, 
-            FOREIGN KEY(BALLID) REFERENCES Ball (BALLID),
-            FOREIGN KEY(TABLEID) REFERENCES TTable (TABLEID)
-        );
-        """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS Shot (
-            SHOTID INTEGER PRIMARY KEY AUTOINCREMENT,
-            PLAYERID INTEGER NOT NULL,
-            GAMEID INTEGER NOT NULL,
-            FOREIGN KEY(PLAYERID) REFERENCES Player(PLAYERID),
-            FOREIGN KEY(GAMEID) REFERENCES Game(GAMEID)
-        );
-        """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS TableShot (
-            TABLEID INTEGER NOT NULL,
-            SHOTID INTEGER NOT NULL,
-            PRIMARY KEY (TABLEID, SHOTID),
-            FOREIGN KEY(TABLEID) REFERENCES TTable(TABLEID),
-            FOREIGN KEY(SHOTID) REFERENCES Shot(SHOTID)
-        );
-        """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS Game (
-            GAMEID INTEGER PRIMARY KEY AUTOINCREMENT,
-            GAMENAME VARCHAR(64) NOT NULL
-        );
-        """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS Player (
-            PLAYERID INTEGER PRIMARY KEY AUTOINCREMENT,
-            GAMEID INTEGER NOT NULL,
-            PLAYERNAME VARCHAR(64) NOT NULL,
-            FOREIGN KEY(GAMEID) REFERENCES Game(GAMEID)
-        );
-        """)
-
-        # Make sure to call close on your cursor and commit on your connection
-        self.db.commit()
-        cur.close()
-
-    def readTable(self, tableID):
-
-        cur = self.db.cursor()
-
-        # The table should have the standard holes and cushions, and have Balls
-        # whose BALLIDs are in the BallTable table with a TABLEID that  is one larger than
-        # (because we like to start numbering tableID at zero, but SQL likes to start
-        # numbering TABLEID at 1) the method’s argument.
-        newTableID = tableID+1
-
-        # The table’s time attribute should be retrieved from the TTable SQL table.
-        cur.execute(
-            """SELECT TIME FROM TTable WHERE TABLEID = ?""", (newTableID,))
-        tableTime = cur.fetchone()
-
-        # If TABLEID does not exist in the BallTable table, then the method should
-        # return None.
-        if tableTime is None:
-            self.db.commit()
-            cur.close()
-            return None
-
-        table = Table()
-        table.time = tableTime[0]
-
-        # Use a single SQL SELECT statement with a JOIN clause to retrieve all the balls for
-        # the given table in a single operation.
-        cur.execute("""
-            SELECT Ball.BALLID, Ball.BALLNO, Ball.XPOS, Ball.YPOS, Ball.XVEL, Ball.YVEL
-            FROM Ball
-            JOIN BallTable ON Ball.BALLID = BallTable.BALLID
-            WHERE BallTable.TABLEID = ?;
-            """, (newTableID,))
-
-        # Each ball’s attributes should be retrieved
-        # from the Ball table, and balls with no velocity should be instantiated as StillBalls, while
-        # balls with a velocity should have their acceleration set just like in A2 and be instantiated as
-        # RollingBalls.
-        balls = cur.fetchall()
-
-        for ball in balls:
-            ballID, ballNO, xpos, ypos, xvel, yvel = ball
-
-            if xvel is None and yvel is None:
-                stillBall = StillBall(ballNO, Coordinate(xpos, ypos))
-                table += stillBall
-
-            else:
-                rollingBallVel = Coordinate(float(xvel), float(yvel))
-                speedA = phylib.phylib_length(rollingBallVel)
-
-                AccX = 0.0
-                AccY = 0.0
-
-                if speedA > VEL_EPSILON:
-                    AccX = (-rollingBallVel.x / speedA) * DRAG
-                    AccY = (-rollingBallVel.y / speedA) * DRAG
-
-                acc = Coordinate(AccX, AccY)
-
-                if math.sqrt((float(xvel) * float(xvel)) + (float(yvel) * float(yvel))) > VEL_EPSILON:
-                    rollingBall = RollingBall(ballNO, Coordinate(
-                        float(xpos), float(ypos)), rollingBallVel, acc)
-
-                else:
-                    rollingBall = RollingBall(ballNO, Coordinate(
-                        float(xpos), float(ypos)), rollingBallVel, Coordinate(0.0, 0.0))
-
-                table += rollingBall
-
-        # Make sure to call close on your cursor and commit on your connection.
-        self.db.commit()
-        cur.close()
-
-        # This method should return a Table object (from A2).
-        return table
-
-    # This method stores the contents of the Table class object named table in the database, such
-    # that it can be perfectly reconstructed by readTable. You can test these two methods by creating a
-    # Table object (like in A3Test1.py) printing the table, writing the table, shutting down your
-    # program, then starting a new program (like in A3Test2.py) where you read and print the table
-    # and see if it is the same.
-    def writeTable(self, table):
-
-        cur = self.db.cursor()
-
-        cur.execute("INSERT INTO TTable (TIME) VALUES (?)", (table.time,))
-
-        # cur.execute("SELECT MAX(TABLEID) FROM TTable")
-        # tableSelected = cur.fetchone()
-        tableID = cur.lastrowid
-        # if tableSelected is not None:
-        #     tableID = tableSelected[0]
-
-        for ball in table:
-            if isinstance(ball, StillBall):
-                cur.execute("""INSERT INTO Ball (BALLNO, XPOS, YPOS)
-                            VALUES (?, ?, ?)""", (ball.obj.still_ball.number, ball.obj.still_ball.pos.x, ball.obj.still_ball.pos.y))
-
-            elif isinstance(ball, RollingBall):
-                cur.execute("""INSERT INTO Ball (BALLNO, XPOS, YPOS, XVEL, YVEL) VALUES (?, ?, ?, ?, ?)""", (ball.obj.rolling_ball.number,
-                            ball.obj.rolling_ball.pos.x, ball.obj.rolling_ball.pos.y, ball.obj.rolling_ball.vel.x, ball.obj.rolling_ball.vel.y))
-            else:
-                continue
-            # cur.execute("SELECT MAX(BALLID) FROM BALL")
-            # ballID = cur.fetchone()[0]
-
-            ballID = cur.lastrowid
-            if ballID is not None:
-
-                cur.execute("""
-                    INSERT INTO BallTable (BALLID, TABLEID) 
-                    VALUES (?, ?)
-                """, (ballID, tableID))
-
-        # Make sure to call close on your cursor and commit on your connection.
-        self.db.commit()
-        cur.close()
-
-        # This method will return the
-        # autoincremented TABLEID value minus 1 (because we like to start numbering tableID at zero,
-        # but SQL likes to start numbering TABLEID at 1).
-        return tableID - 1
-
-    def close(self):
-
-        # This method should call commit on the connection and call close on the connection.
-        self.db.commit()
-        self.db.close()
-
-    # I recommend writing a helper method (e.g. getGame) in the
-    # Database class. Player 1 shall be the player with the lower PLAYERID.
-    def getGame(self, gameID):
-
-        cur = self.db.cursor()
-
-        # retreive the values of gameName, player1Name, and
-        # player2Name from the Game and Player tables (use as few SELECT statements as possible and
-        # use a JOIN across tables).
-        cur.execute("""SELECT Game.GAMENAME, P1.PLAYERNAME as player1Name, P2.PLAYERNAME as player2Name 
-            FROM Game 
-            JOIN Player as P1 ON Game.GAMEID = P1.GAMEID 
-            JOIN Player as P2 ON Game.GAMEID = P2.GAMEID 
-            WHERE Game.GAMEID = ? AND P1.PLAYERID < P2.PLAYERID""", (gameID))
-        values = cur.fetchone()
-
-        self.db.commit()
-        cur.close()
-        if values is not None:
-            return values
-        else:
-            return None
-
-    def setGame(self, gameName, player1Name, player2Name):
-
-        cur = self.db.cursor()
-
-        # One new row shall be added to the Game table and two new rows to the Player table to record the
-        # gameName, the player1Name, and the player2Name. The player1Name shall be added to the
-        # Player table first (so that it gets the lower PLAYERID).
-        cur.execute("INSERT INTO Game (GAMENAME) VALUES (?)", (gameName,))
-        cur.execute("SELECT MAX(GAMEID) FROM Game")
-        gameID = cur.fetchone()[0]
-
-        cur.execute(
-            "INSERT INTO Player (GAMEID, PLAYERNAME) VALUES (?, ?)", (gameID, player1Name))
-        cur.execute("SELECT MAX(PLAYERID) FROM Player")
-        player1ID = cur.fetchone()[0]
-
-        cur.execute(
-            "INSERT INTO Player (GAMEID, PLAYERNAME) VALUES (?, ?)", (gameID, player2Name))
-        cur.execute("SELECT MAX(PLAYERID) FROM Player")
-        player2ID = cur.fetchone()[0]
-
-        self.db.commit()
-        cur.close()
-        return gameID
-
-    # I recommend writing a
-    # helper method (e.g. newShot) in the Database class. Make this method return the shotID;
-    # you’ll need it later.
-    def newShot(self, gameName, playerName):
-
-        cur = self.db.cursor()
-
-        cur.execute(
-            """SELECT PLAYERID FROM Player WHERE PLAYERNAME = ?""", (playerName,))
-        playerRecord = cur.fetchone()
-        if playerRecord is None:
-            return None
-        playerID = playerRecord[0]
-
-        cur.execute(
-            """SELECT GAMEID FROM Game WHERE GAMENAME = ?""", (gameName,))
-        gameRecord = cur.fetchone()
-        if gameRecord is None:
-            return None
-        gameID = gameRecord[0]
-
-        cur.execute(
-            """INSERT INTO Shot (PLAYERID, GAMEID) VALUES (?, ?)""", (playerID, gameID))
-        cur.execute("SELECT MAX(PLAYERID) FROM Shot")
-        shotIDRecord = cur.fetchone()
-
-        self.db.commit()
-        cur.close()
-
-        if shotIDRecord is None:
-            return None
-        shotID = shotIDRecord[0]
-
-        return shotID
-
-################################################################################
-
-
-class Game ():
-
-    # This class should represent a Game of billiards/pool/snooker. An object of class Game will have
-    # member variables called gameID, gameName, player1Name, and player2Name and table.
-    def __init__(self, gameID=None, gameName=None, player1Name=None, player2Name=None):
-
-        databaseInstance = Database()
-
-        # (i) with an integer gameID value, and all other arguments set to None, or
-        if gameID is not None and (gameName is None and player1Name is None and player2Name is None):
-
-            # For the first constructor version, add one to the gameID (because we number starting from 0,
-            # but SQL numbers starting from 1)
-            self.gameName, self.player1Name, self.player2Name = databaseInstance.getGame(
-                gameID + 1)
-
-        # (ii) with gameID=None, string values for all 3 Name arguments
-        elif gameID is None and (gameName is not None and player1Name is not None and player2Name is not None):
-
-            # For the second constructor, all 3 names shall be added as attributes to the object.
-            self.gameID = databaseInstance.setGame(
-                gameName, player1Name, player2Name)
-
-        else:
-
-            # Any other combination of arguments provided to the constructor shall raise a TypeError
-            # Python Exception.
-            raise TypeError("Invalid combination of arguments given.")
-
-        self.table = None
-
-    def shoot(self, gameName, playerName, table, xvel, yvel):
-
-        databaseInstance = Database()
-        tableInstance = Table()
-
-        # This method of the Game class should add a new entry to the Shot table for the current game
-        # and the given playerID (determined by looking up the playerName).
-        shotID = databaseInstance.newShot(gameName, playerName)
-
-        # Then, the shoot method should find the object representing the cue ball (number 0).
-        # cueBall = table.cueBall(xvel, yvel)
-
-        # It should retrieve the the x and y values of the cue ball’s position, and store them in temporary
-        # variables.
-
-        for ball in table:
-            if (isinstance(ball, StillBall)) and ball.obj.still_ball.number==0:
-
-                cueBall = ball
-
-                xpos = cueBall.obj.rolling_ball.pos.x
-                ypos = cueBall.obj.rolling_ball.pos.y
-
-                # Then it should set the type attribute of the cue ball to phylib.ROLLING_BALL.
-                cueBall.type = phylib.PHYLIB_ROLLING_BALL
-
-                # Then it should set all of the attributes of the cue ball. Hint: use the following syntax:
-                # cue_ball.obj.rolling_ball.pos.x = xpos;
-                # Set the position attributes to the values that you stored in the temporary variables, the
-                # velocity attributes to the parameters passed to the method, and recalculate the acceleration
-                # parameters (as in A1, and A2).
-                cueBall.obj.rolling_ball.pos.x = xpos
-                cueBall.obj.rolling_ball.pos.y = ypos
-                cueBall.obj.rolling_ball.vel.x = xvel
-                cueBall.obj.rolling_ball.vel.y = yvel
-
-                rollingBallVel = Coordinate(float(xvel), float(yvel))
-                speedA = phylib.phylib_length(rollingBallVel)
-
-                AccX = 0.0
-                AccY = 0.0
-
-                if speedA > VEL_EPSILON:
-                    AccX = (-rollingBallVel.x / speedA) * DRAG
-                    AccY = (-rollingBallVel.y / speedA) * DRAG
-
-                cueBall.obj.rolling_ball.acc.x = AccX
-                cueBall.obj.rolling_ball.acc.y = AccY
-
-                # Don’t forget to set the number of the cue ball to 0.
-                cueBall.obj.rolling_ball.number = 0
-
-                # segmentTable.object=RollingBall(0, Coordinate(
-                # float(xpos), float(ypos)), rollingBallVel, Coordinate(AccX, AccY))
-
-        # Next, you will repeatedly call the segment method from A2 until it returns None.
-        while True:
-            segmentStart = table.time
-
-            segmentTable = table.segment()
-            table=segmentTable
-            if segmentTable is None:
-                break
-            segmentEnd = segmentTable.time
-
-            # You will use
-            # the method to determine the length of the segment (in seconds) – subtract the time at the
-            # beginning of the segment from the time at the end of the segment. Divide that time by the
-            # FRAME_RATE above and round it down to the nearest integer.
-            segmentLength = math.floor((segmentEnd-segmentStart)/FRAME_RATE)
-            
-            print(segmentLength)
-
-            # Start a loop that loops over those integers. Inside the loop, multiply the integer by the
-            # FRAME_RATE and pass it to the roll method to create a new Table object for the next
-            # frame.
-            newTableObject = Table()
-            for i in range(segmentLength):
-                newTableObject = table.roll(i*FRAME_RATE)
-
-                # Set the time of the returned table to the time of the beginning of the segment plus the time
-                # that you passed to the roll method.
-                newTableObject.time = segmentStart+i*FRAME_RATE
-
-                # Save the table using writeTable to the database, and record it in the TableShot as well.
-                # Repeat the process for each segment
-                databaseInstance.writeTable(newTableObject)
-                cur = databaseInstance.db.cursor()
-                
-                cur.execute("""SELECT TABLEID FROM TTABLE WHERE TIME = ?""", (newTableObject.time,))
-                tableRecord = cur.fetchone()
-                if tableRecord is None:
-                    cur.close()
-                    return None
-                tableID = tableRecord[0]
-                # print(tableID)
-                # print(shotID)
-                cur.execute("""INSERT INTO TABLESHOT (TABLEID, SHOTID) VALUES (?, ?)""", (tableID, shotID))
-                databaseInstance.db.commit()
-                cur.close()
\ No newline at end of file
+import phylib
+import os
+import sqlite3
+import math
+import struct
+import time
+import array
+import ctypes
+import collections
+import itertools
+import concurrent.futures
+
+# NumPy is optional; Table.state can return NumPy arrays when it is installed
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+################################################################################
+# import constants from phylib to global varaibles
+BALL_RADIUS = phylib.PHYLIB_BALL_RADIUS
+BALL_DIAMETER = phylib.PHYLIB_BALL_DIAMETER
+HOLE_RADIUS = phylib.PHYLIB_HOLE_RADIUS
+TABLE_LENGTH = phylib.PHYLIB_TABLE_LENGTH
+TABLE_WIDTH = phylib.PHYLIB_TABLE_WIDTH
+SIM_RATE = phylib.PHYLIB_SIM_RATE
+VEL_EPSILON = phylib.PHYLIB_VEL_EPSILON
+DRAG = phylib.PHYLIB_DRAG
+MAX_TIME = phylib.PHYLIB_MAX_TIME
+MAX_OBJECTS = phylib.PHYLIB_MAX_OBJECTS
+FRAME_RATE = 0.01
+FRAME_FIELDS = phylib.PHYLIB_FRAME_FIELDS
+FIXED_OBJECTS = phylib.PHYLIB_FIXED_OBJECTS
+
+# the ways Table.segment can find the end of a segment
+SOLVER_STEP = phylib.PHYLIB_SOLVER_STEP
+SOLVER_EVENT = phylib.PHYLIB_SOLVER_EVENT
+
+# the reasons a segment can end (see Shot.reasons)
+REASON_NONE = phylib.PHYLIB_REASON_NONE
+REASON_STOPPED = phylib.PHYLIB_REASON_STOPPED
+REASON_CUSHION = phylib.PHYLIB_REASON_CUSHION
+REASON_HOLE = phylib.PHYLIB_REASON_HOLE
+REASON_BALL = phylib.PHYLIB_REASON_BALL
+REASON_TIMEOUT = phylib.PHYLIB_REASON_TIMEOUT
+
+HEADER = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN"
+"http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
+<svg width="700" height="1375" viewBox="-25 -25 1400 2750"
+xmlns="http://www.w3.org/2000/svg"
+xmlns:xlink="http://www.w3.org/1999/xlink">
+<rect width="1350" height="2700" x="0" y="0" fill="#C0D0C0" onmousemove="trackit(event);"/>"""
+FOOTER = """</svg>\n"""
+
+# the ball state arrays of a Table (see Table.state)
+TableState = collections.namedtuple(
+    "TableState", ["number", "type", "pos", "vel", "acc"])
+
+# what ended a segment (see phylib_event in phylib.h): the reason (one of the
+# REASON_ constants), the slots of the ball and of the object it touched (-1
+# if there is none), the ball's number, and the time and position of the ball
+Event = collections.namedtuple(
+    "Event", ["reason", "ball", "other", "number", "time", "x", "y"])
+
+# the broad-phase counts of the step solver (see phylib_broad_phase in
+# phylib.h): pairs given the exact distance test, and pairs ruled out without
+BroadPhase = collections.namedtuple("BroadPhase", ["tested", "avoided"])
+
+# one shot tried by the planner (see evaluate_shot): the cue velocity, the
+# numbers of the balls it pocketed, whether the cue ball went down, where the
+# cue ball stopped (None if it went down) and the shot's score
+ShotPlan = collections.namedtuple(
+    "ShotPlan", ["xvel", "yvel", "pocketed", "scratched", "cue", "score"])
+
+# what plan_shot found: the best ShotPlan, how many shots it simulated, how
+# long that took and the evaluations per second
+PlanResult = collections.namedtuple(
+    "PlanResult", ["best", "evaluations", "seconds", "rate"])
+
+# the counters of a FrameCache (see FrameCache.stats)
+CacheStats = collections.namedtuple(
+    "CacheStats", ["hits", "misses", "evictions", "entries", "size", "budget"])
+
+# the number of doubles phylib_export_balls stores per ball
+BALL_FIELDS = phylib.PHYLIB_BALL_FIELDS
+
+
+class BallState:
+    """
+    One ball of a Table as plain Python values: its number, its state (the
+    type of its phylib_object, phylib.PHYLIB_STILL_BALL or
+    phylib.PHYLIB_ROLLING_BALL), and its position, velocity and
+    acceleration, which are zero for a StillBall. A BallState does not refer
+    to the Table it came from and can not be changed, so it can be kept,
+    compared and hashed freely. Table.balls makes them and Table.add_balls
+    puts them back on a Table.
+    """
+
+    __slots__ = ("number", "state", "x", "y", "vx", "vy", "ax", "ay")
+
+    def __init__(self, number, state, x, y, vx=0.0, vy=0.0, ax=0.0, ay=0.0):
+        assign = object.__setattr__
+        assign(self, "number", number)
+        assign(self, "state", state)
+        assign(self, "x", x)
+        assign(self, "y", y)
+        assign(self, "vx", vx)
+        assign(self, "vy", vy)
+        assign(self, "ax", ax)
+        assign(self, "ay", ay)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BallState is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("BallState is immutable")
+
+    def astuple(self):
+        """
+        The BallState's fields, in the order of __slots__.
+        """
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, BallState):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash(self.astuple())
+
+    def __repr__(self):
+        return "BallState(%s)" % ", ".join(
+            "%s=%r" % (name, getattr(self, name)) for name in self.__slots__)
+
+################################################################################
+# the standard colours of pool balls
+# if you are curious check this out:
+# https://billiards.colostate.edu/faq/ball/colors/
+
+BALL_COLOURS = [
+    "WHITE",
+    "YELLOW",
+    "BLUE",
+    "RED",
+    "PURPLE",
+    "ORANGE",
+    "GREEN",
+    "BROWN",
+    "BLACK",
+    "LIGHTYELLOW",
+    "LIGHTBLUE",
+    "PINK",             # no LIGHTRED
+    "MEDIUMPURPLE",     # no LIGHTPURPLE
+    "LIGHTSALMON",      # no LIGHTORANGE
+    "LIGHTGREEN",
+    "SANDYBROWN",       # no LIGHTBROWN
+]
+
+# The SVG of each kind of object, with everything that never changes already
+# filled in. BALL_SVG[number] takes the ball's x and y, HOLE_SVG the hole's x
+# and y, and the cushion templates the cushion's y or x as drawn (see
+# cushion_offset).
+BALL_SVG = [""" <circle cx="%%d" cy="%%d" r="%d" fill="%s" id="%d" />\n""" %
+            (BALL_RADIUS, colour, number)
+            for number, colour in enumerate(BALL_COLOURS)]
+HOLE_SVG = """ <circle cx="%%d" cy="%%d" r="%d" fill="black" />\n""" % HOLE_RADIUS
+HCUSHION_SVG = """ <rect width="1400" height="25" x="-25" y="%d" fill="darkgreen" />\n"""
+VCUSHION_SVG = """ <rect width="25" height="2750" x="%d" y="-25" fill="darkgreen" />\n"""
+
+# The SVG of a ball in an animated shot (see Shot.svg_parts): BALL_PATH_SVG[number]
+# takes the ball's first x and y and its animations, made from PATH_SVG (the
+# attribute, its values, and when they start and how long they take) and
+# HIDE_SVG (when the ball goes into a hole).
+BALL_PATH_SVG = [""" <circle cx="%%d" cy="%%d" r="%d" fill="%s" id="%d">\n%%s </circle>\n""" %
+                 (BALL_RADIUS, colour, number)
+                 for number, colour in enumerate(BALL_COLOURS)]
+PATH_SVG = """  <animate attributeName="%s" values="%s" begin="%gs" dur="%gs" fill="freeze" />\n"""
+HIDE_SVG = """  <set attributeName="visibility" to="hidden" begin="%gs" fill="freeze" />\n"""
+
+# The frame stream format (see encode_frames). A stream is STREAM_HEADER (the
+# magic bytes, the version, the keyframe interval and the frame rate), then
+# every frame: FRAME_HEADER (KEYFRAME or DELTA and how many balls follow)
+# and that many STREAM_BALLs (slot, number, x and y in tenths of a mm). A
+# ball's slot is its place in the frame, so balls with the same number are
+# still told apart; a frame holds at most STREAM_BALLS balls. A keyframe
+# lists every ball; a delta lists only the slots that changed since the
+# frame before it, and a slot that the frame no longer has with x and y of
+# BALL_GONE. Everything is little-endian; frames.js decodes the same format.
+STREAM_MAGIC = b"PHYF"
+STREAM_VERSION = 2
+STREAM_SCALE = 10.0
+KEYFRAME_INTERVAL = 50
+KEYFRAME = 0
+DELTA = 1
+BALL_GONE = -2 ** 31
+STREAM_HEADER = struct.Struct("<4sBHd")
+FRAME_HEADER = struct.Struct("<BH")
+STREAM_BALL = struct.Struct("<HBii")
+STREAM_BALLS = 0xFFFF
+
+# how many decimals Shot.replay keeps
+REPLAY_DIGITS = 3
+
+# how many bytes of rendered tables frame_cache keeps
+FRAME_CACHE_BYTES = 16 * 1024 * 1024
+
+# How Database.writeTable stores the balls of a table: a Ball and a BallTable
+# row per ball (STORAGE_ROWS), or all of them packed into one TableBalls BLOB
+# (STORAGE_PACKED). A packed BLOB is PACKED_HEADER (PACKED_VERSION and its
+# flags) and then every ball: PACKED_BALL (number, type, x and y as doubles),
+# followed for a RollingBall by PACKED_VELOCITY (vx and vy) and, if the
+# PACKED_ACCELERATED flag is set, PACKED_ACCELERATION (ax and ay). With the
+# PACKED_QUANTIZED flag, they are PACKED_QUANTIZED_BALL and
+# PACKED_QUANTIZED_VELOCITY, in 1/PACKED_SCALE mm. With STORAGE_SPANS, a ball
+# that stays the same from one table to the next (a StillBall, mostly) only
+# has one Ball row for all of them, and a BallSpan row with the first and the
+# last TABLEID it is in. readTable reads them all.
+STORAGE_ROWS = "rows"
+STORAGE_PACKED = "packed"
+STORAGE_SPANS = "spans"
+PACKED_VERSION = 1
+PACKED_SCALE = 1000.0
+PACKED_QUANTIZED = 1
+PACKED_ACCELERATED = 2
+PACKED_HEADER = struct.Struct("<BB")
+PACKED_BALL = struct.Struct("<BBdd")
+PACKED_VELOCITY = struct.Struct("<dd")
+PACKED_ACCELERATION = struct.Struct("<dd")
+PACKED_QUANTIZED_BALL = struct.Struct("<BBii")
+PACKED_QUANTIZED_VELOCITY = struct.Struct("<ii")
+
+# The changes to the schema of phylib.db since createDB first made its tables,
+# in order. Database.migrate runs MIGRATIONS[i] to take a database from
+# version i (in PRAGMA user_version, 0 for a new database) to version i + 1,
+# so a change is made by adding a migration to the end, never by editing one.
+# Opening a Database does not migrate it: createDB does, after making any
+# missing tables, and server.py calls it at startup (as does migrate.py).
+MIGRATIONS = [
+    # indexes for readTable, newShot and looking tables up by TIME
+    ("CREATE INDEX IF NOT EXISTS BallTableTable ON BallTable (TABLEID)",
+     "CREATE INDEX IF NOT EXISTS PlayerName ON Player (PLAYERNAME)",
+     "CREATE INDEX IF NOT EXISTS GameName ON Game (GAMENAME)",
+     "CREATE INDEX IF NOT EXISTS TTableTime ON TTable (TIME)"),
+    # an index for shotTables (and so readFrame)
+    ("CREATE INDEX IF NOT EXISTS TableShotShot ON TableShot (SHOTID)",),
+    # an index for readTable on tables written with STORAGE_SPANS
+    ("CREATE INDEX IF NOT EXISTS BallSpanSlot ON BallSpan (SLOT, FIRSTTABLE)",),
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def cushion_offset(position):
+    """
+    Returns where the cushion at position is drawn: the cushions at 0 are
+    drawn 25 outside the table, so that they don't cover it.
+    """
+    return -25 if position == 0 else position
+
+
+# the static layer (see static_svg), by encoding and inline
+static_layer = {}
+
+
+def static_svg(encoding=None, inline=False):
+    """
+    Returns the part of every Table's SVG that never changes: HEADER and the
+    cushions and holes in the first FIXED_OBJECTS slots, which every Table
+    starts with (see phylib_new_sized_table) and nothing moves. If inline is
+    True, HEADER starts at its <svg> tag, without the XML declaration and
+    DOCTYPE of a standalone file, so that it can go straight into an HTML
+    page. It is rendered once and kept, as bytes if encoding is given.
+    """
+    if (encoding, inline) not in static_layer:
+        table = Table()
+        header = HEADER[HEADER.index("<svg"):] if inline else HEADER
+        text = header + "".join(table[index].svg()
+                                for index in range(FIXED_OBJECTS))
+        static_layer[encoding, inline] = text if encoding is None else text.encode(encoding)
+    return static_layer[encoding, inline]
+
+################################################################################
+
+
+class Coordinate(phylib.phylib_coord):
+    """
+    This creates a Coordinate subclass, that adds nothing new, but looks
+    more like a nice Python class.
+    """
+    pass
+
+################################################################################
+
+
+class StillBall(phylib.phylib_object):
+    """
+    Python StillBall class.
+    """
+
+    def __init__(self, number, pos):
+        """
+        Constructor function. Requires ball number and position (x,y) as
+        arguments.
+        """
+
+        # this creates a generic phylib_object
+        phylib.phylib_object.__init__(self,
+                                      phylib.PHYLIB_STILL_BALL,
+                                      number,
+                                      pos, None, None,
+                                      0.0, 0.0)
+
+        # this converts the phylib_object into a StillBall class
+        self.obj.still_ball.number = number
+        self.obj.still_ball.pos = pos
+        self.__class__ = StillBall
+
+    # StillBall:
+    def svg(self):
+        """
+        where cx and cy are the pos of the Ball, r is the BALL_RADIUS, and fill is the
+        appropriate value from BALL_COLOURS.
+        """
+        ball = self.obj.still_ball
+        return BALL_SVG[ball.number] % (ball.pos.x, ball.pos.y)
+
+################################################################################
+
+
+class RollingBall(phylib.phylib_object):
+    """
+    Python RollingBall class.
+    """
+
+    def __init__(self, number, pos, vel, acc):
+        """
+        Constructor function. Requires ball number and position (x,y) as
+        arguments.
+        """
+
+        # this creates a generic phylib_object
+        phylib.phylib_object.__init__(self,
+                                      phylib.PHYLIB_ROLLING_BALL,
+                                      number,
+                                      pos, vel, acc,
+                                      0.0, 0.0)
+
+        # this converts the phylib_object into a RollingBall class
+        self.obj.rolling_ball.number = number
+        self.obj.rolling_ball.pos = pos
+        self.obj.rolling_ball.vel = vel
+        self.obj.rolling_ball.acc = acc
+        self.__class__ = RollingBall
+
+    # RollingBall:
+    def svg(self):
+        """
+        where cx and cy are the pos of the Ball, r is the BALL_RADIUS, and fill is the
+        appropriate value from BALL_COLOURS.
+        """
+        ball = self.obj.rolling_ball
+        return BALL_SVG[ball.number] % (ball.pos.x, ball.pos.y)
+
+################################################################################
+
+
+class Hole(phylib.phylib_object):
+    """
+    Python Hole class.
+    """
+
+    def __init__(self, pos):
+        """
+        Constructor function. Requires ball number and position (x,y) as
+        arguments.
+        """
+
+        # this creates a generic phylib_object
+        phylib.phylib_object.__init__(self,
+                                      phylib.PHYLIB_HOLE,
+                                      0,
+                                      pos, None, None,
+                                      0.0, 0.0)
+
+        # this converts the phylib_object into a Hole class
+        self.obj.hole.pos = pos
+        self.__class__ = Hole
+
+    # Hole:
+    def svg(self):
+        """
+        where cx and cy are the pos of the Hole, and r is the HOLE_RADIUS.
+        """
+        return HOLE_SVG % (self.obj.hole.pos.x, self.obj.hole.pos.y)
+
+################################################################################
+
+
+class HCushion(phylib.phylib_object):
+    """
+    Python HCushion class.
+    """
+
+    def __init__(self, y):
+        """
+        Constructor function. Requires ball number and position (x,y) as
+        arguments.
+        """
+
+        # this creates a generic phylib_object
+        phylib.phylib_object.__init__(self,
+                                      phylib.PHYLIB_HCUSHION,
+                                      0,
+                                      None, None, None,
+                                      0.0, y)
+
+        # this converts the phylib_object into a HCushion class
+        self.obj.hcushion.y = y
+        self.__class__ = HCushion
+
+    # HCushion:
+    def svg(self):
+        """
+        where y is -25 if the cushion is at the top and y is 2700 if the cushion is at bottom.
+        """
+        return HCUSHION_SVG % cushion_offset(self.obj.hcushion.y)
+
+################################################################################
+
+
+class VCushion(phylib.phylib_object):
+    """
+    Python VCushion class.
+    """
+
+    def __init__(self, x):
+        """
+        Constructor function. Requires ball number and position (x,y) as
+        arguments.
+        """
+
+        # this creates a generic phylib_object
+        phylib.phylib_object.__init__(self,
+                                      phylib.PHYLIB_VCUSHION,
+                                      0,
+                                      None, None, None,
+                                      x, 0.0)
+
+        # this converts the phylib_object into a VCushion class
+        self.obj.vcushion.x = x
+        self.__class__ = VCushion
+
+    # VCushion:
+    def svg(self):
+        """
+        where x is -25 if the cushion is on the left and x is 1350 if the cushion is at the right.
+        """
+        return VCUSHION_SVG % cushion_offset(self.obj.vcushion.x)
+
+################################################################################
+
+# the Python class of every kind of phylib_object (see Table.__getitem__)
+OBJECT_CLASSES = {
+    phylib.PHYLIB_STILL_BALL: StillBall,
+    phylib.PHYLIB_ROLLING_BALL: RollingBall,
+    phylib.PHYLIB_HOLE: Hole,
+    phylib.PHYLIB_HCUSHION: HCushion,
+    phylib.PHYLIB_VCUSHION: VCushion,
+}
+
+################################################################################
+
+
+class Table(phylib.phylib_table):
+    """
+    Pool table class.
+    """
+
+    def __init__(self, capacity=MAX_OBJECTS):
+        """
+        Table constructor method.
+        This method call the phylib_table constructor. capacity is the number
+        of objects the table can hold, including the 4 cushions and 6 holes.
+        """
+        phylib.phylib_table.__init__(self, capacity)
+
+    def __iadd__(self, other):
+        """
+        += operator overloading method.
+        This method allows you to write "table+=object" to add another object
+        to the table.
+        """
+        self.add_object(other)
+        return self
+
+    def __iter__(self):
+        """
+        This method adds iterator support for the table.
+        This allows you to write "for object in table:" to loop over all
+        the objects in the table. Empty slots are skipped. Every loop gets
+        its own generator, so loops over the same table can be nested or
+        run in several threads at once.
+        """
+        for index, obj in self.slots():
+            yield obj
+
+    def slots(self):
+        """
+        Generates (index, object) for every occupied slot of the table. The
+        occupied slots and their types come from a single call to occupied
+        (see phylib.i). The objects are stored in the table, so each one
+        keeps the table alive for as long as it is in use.
+        """
+        for index, kind in self.occupied():
+            result = self.get_object(index)
+            result.__class__ = OBJECT_CLASSES[kind]
+            result.table = self
+            yield index, result
+
+    def __getitem__(self, index):
+        """
+        This method adds item retreivel support using square brackets [ ] .
+        It calls get_object (see phylib.i) to retreive a generic phylib_object
+        and then sets the __class__ attribute to make the class match
+        the object type. The object is stored in the table, so it keeps the
+        table alive for as long as it is in use.
+        """
+        result = self.get_object(index)
+        if result == None:
+            return None
+        result.__class__ = OBJECT_CLASSES[result.type]
+        result.table = self
+        return result
+
+    def __str__(self):
+        """
+        Returns a string representation of the table that matches
+        the phylib_print_table function from A1Test1.c.
+        """
+        result = ""    # create empty string
+        result += "time = %6.1f;\n" % self.time    # append time
+        for i in range(self.capacity):  # loop over all slots, empty or not
+            result += "  [%02d] = %s\n" % (i, self[i])  # append object description
+        return result  # return the string
+
+    def segment(self, solver=SOLVER_STEP):
+        """
+        Returns a new Table at the end of the segment that starts with this
+        Table (see phylib_segment in phylib.c), or None if nothing is
+        rolling. The new Table's event attribute is the Event that ended
+        the segment.
+        solver picks how the end of the segment is found: SOLVER_STEP steps
+        through time at SIM_RATE, SOLVER_EVENT jumps straight to the next
+        collision or stop.
+        """
+
+        if phylib.phylib_rolling(self) == 0:
+            return None
+        result = self.copy()
+        result.event = result.advance(solver)
+        return result
+
+    # add svg method here
+    def svg(self):
+        """
+        This method should create a string that consists of the concatenation of the HEADER + 
+        return values of the svg method called on every object in the Table + 
+        FOOTER
+        """
+        return "".join(self.svg_parts())
+
+    def svg_parts(self, inline=False):
+        """
+        Generates the SVG of the Table piece by piece: the static layer (see
+        static_svg), the SVG of every other object in slot order, and
+        FOOTER, the same text svg returns. Nothing on the Table is changed.
+        If inline is True, it is an <svg> element for an HTML page rather
+        than a standalone file.
+        """
+        yield static_svg(inline=inline)
+        yield from self.ball_svg_parts()
+        yield FOOTER
+
+    def ball_svg_parts(self):
+        """
+        Generates the SVG of the objects after the first FIXED_OBJECTS slots
+        (the balls, and any holes or cushions added to the Table), which is
+        all that changes from one frame to the next. The balls come from a
+        single call to balls.
+        """
+        balls = iter(self.balls())
+        for index, kind in self.occupied():
+            if kind == phylib.PHYLIB_STILL_BALL or kind == phylib.PHYLIB_ROLLING_BALL:
+                ball = next(balls)
+                yield BALL_SVG[ball.number] % (ball.x, ball.y)
+            elif index >= FIXED_OBJECTS:
+                yield self[index].svg()
+
+    def write_svg(self, fp, encoding=None, inline=False):
+        """
+        Writes the SVG of the Table (see svg_parts) to the file-like object
+        fp piece by piece, without building it as one string. If encoding is
+        given the pieces are encoded first, for a binary fp such as a socket
+        file or an io.BytesIO.
+        """
+        write_svg_parts(fp, self.svg_parts(inline), encoding, inline)
+
+    def copy(self):
+        """
+        Returns a new Table that is a copy of this one.
+        """
+        result = phylib.phylib_table.copy(self)
+        result.__class__ = Table
+        return result
+
+    def roll(self, t):
+        """
+        Returns a new Table in which every RollingBall has rolled for t
+        seconds (see phylib_roll_table in phylib.c).
+        """
+        result = phylib.phylib_table.roll(self, t)
+        result.__class__ = Table
+        return result
+
+    def simulate(self, solver=SOLVER_STEP):
+        """
+        Simulates the whole shot in a single call to phylib_simulate_shot in
+        phylib.c and returns it as a Shot: this Table followed by the Table at
+        the end of every segment.
+        """
+        result = phylib.phylib_table.simulate(self, solver)
+        result.__class__ = Shot
+        return result
+
+    def advance(self, solver=SOLVER_STEP):
+        """
+        Moves this Table forward in place to the end of its current segment,
+        without creating a new Table. Returns the Event that ended the
+        segment, or None if nothing was rolling.
+        """
+        event = make_event(phylib.phylib_table.advance(self, solver))
+        if event.reason == REASON_NONE:
+            return None
+        return event
+
+    def state(self, asarray=False):
+        """
+        Returns the Table's ball state arrays (see phylib_table in phylib.h)
+        as a TableState of memoryviews over the Table's own memory, without
+        copying anything. number and type have one entry per slot, and pos,
+        vel and acc have shape (capacity, 2). Slots without a ball have a
+        number, pos, vel and acc of zero, and empty slots have the type
+        phylib.PHYLIB_NO_OBJECT. If asarray is True they are NumPy arrays
+        instead. The arrays show the Table as it is when state is called, and
+        they keep the Table alive.
+        """
+        if asarray and numpy is None:
+            raise ImportError("Table.state(asarray=True) needs NumPy")
+
+        phylib.phylib_load_state(self)
+
+        capacity = self.capacity
+        arrays = [
+            (ctypes.c_ubyte * capacity).from_address(int(self.number)),
+            (ctypes.c_int * capacity).from_address(int(self.type)),
+        ]
+        for coord in (self.pos, self.vel, self.acc):
+            arrays.append((ctypes.c_double * (2 * capacity)
+                           ).from_address(int(coord.this)))
+
+        views = []
+        for array, code in zip(arrays, "Biddd"):
+            array.table = self  # the memory belongs to this Table
+            view = memoryview(array).cast("B")
+            if code == "d":
+                view = view.cast("d", (capacity, 2))
+            else:
+                view = view.cast(code)
+            views.append(numpy.asarray(view) if asarray else view)
+        return TableState(*views)
+
+    def balls(self):
+        """
+        Returns a list with a BallState for every ball on the Table, in slot
+        order. The balls are copied out in a single call to
+        phylib_export_balls in phylib.c, without a proxy object per ball.
+        """
+        buffer = array.array("d", bytes(8 * BALL_FIELDS * self.ball_count()))
+        self.export_balls(buffer)
+        values = buffer.tolist()
+        return [BallState(int(values[i]), int(values[i + 1]),
+                          *values[i + 2:i + BALL_FIELDS])
+                for i in range(0, len(values), BALL_FIELDS)]
+
+    def add_balls(self, balls):
+        """
+        Adds every BallState in balls to the Table in a single call to
+        phylib_import_balls in phylib.c. Raises ValueError if the Table is
+        too full to take them all or a BallState has a state that is not a
+        ball; the balls before that one have been added.
+        """
+        buffer = array.array("d")
+        for ball in balls:
+            buffer.extend(ball.astuple())
+        added = self.import_balls(buffer)
+        if added * BALL_FIELDS != len(buffer):
+            raise ValueError("could not add ball %d of %d" %
+                             (added + 1, len(buffer) // BALL_FIELDS))
+
+    def strike(self, xvel, yvel):
+        """
+        Makes the cue ball a RollingBall with velocity (xvel, yvel) and the
+        matching drag (see phylib_strike in phylib.c).
+        """
+        if phylib.phylib_table.strike(self, xvel, yvel) < 0:
+            raise ValueError("the table has no cue ball")
+
+    def simulate_many(self, velocities, solver=SOLVER_STEP):
+        """
+        Simulates one shot from this Table for every cue velocity (xvel,
+        yvel) in velocities, all together in a Batch, and returns the Batch.
+        This Table is not changed.
+        """
+        batch = Batch()
+        batch.add_strikes(self, velocities)
+        batch.run(solver)
+        return batch
+
+    def frames(self, end, rate=FRAME_RATE):
+        """
+        Returns the frames of the segment that starts with this Table and
+        ends with the Table end, one every rate seconds, as a memoryview of
+        shape (frames, balls, 3). Each ball is its number, x and y (as
+        floats), and frame i is this Table rolled for i*rate seconds. The
+        frames are filled in a single call to phylib_fill_frames in phylib.c,
+        without creating a Table per frame.
+        """
+        frames = self.frame_count(end, rate)
+        balls = self.ball_count()
+        if balls == 0:
+            frames = 0
+
+        # memoryview can not cast to a shape with a zero in it, so there is
+        # always room for one frame of one ball, and the view is cut down
+        shape = (max(frames, 1), max(balls, 1), FRAME_FIELDS)
+        buffer = bytearray(shape[0] * shape[1] * FRAME_FIELDS * 8)
+        self.fill_frames(end, rate, buffer)
+        return memoryview(buffer).cast("d", shape)[:frames]
+
+################################################################################
+
+
+def write_svg_parts(fp, parts, encoding=None, inline=False):
+    """
+    Writes every str in parts to fp, encoded if encoding is given. The
+    static layer (inline or not) is written from static_svg's cached copy.
+    """
+    static = static_svg(inline=inline)
+    for part in parts:
+        if encoding is None:
+            fp.write(part)
+        elif part is static:
+            fp.write(static_svg(encoding, inline))
+        else:
+            fp.write(part.encode(encoding))
+
+
+def frames_svg_parts(tables):
+    """
+    Generates one SVG that holds every Table in tables as a frame. The
+    static layer is drawn once, underneath all of them, and frame i is a
+    group with the id "frame-i" holding only what ball_svg_parts renders.
+    Every frame but the first is hidden; showing one at a time (by setting
+    its visibility attribute) plays them.
+    """
+    yield static_svg()
+    for i, table in enumerate(tables):
+        yield '<g id="frame-%d"%s>\n' % (i, ' visibility="hidden"' if i else "")
+        yield from table.ball_svg_parts()
+        yield "</g>\n"
+    yield FOOTER
+
+
+def write_frames_svg(fp, tables, encoding=None):
+    """
+    Writes the SVG of frames_svg_parts(tables) to fp (see Table.write_svg).
+    """
+    write_svg_parts(fp, frames_svg_parts(tables), encoding)
+
+################################################################################
+
+
+def encode_frames(frames, rate=FRAME_RATE, keyframe=KEYFRAME_INTERVAL):
+    """
+    Returns frames, a list of frames that are each a list of (number, x, y)
+    for every ball on the table (as Shot.all_frames returns them), encoded
+    as a frame stream (see STREAM_HEADER). Every keyframe'th frame is a
+    keyframe, and the ones between are deltas from the frame before. Balls
+    are told apart by their place in the frame (their slot), and positions
+    are rounded to 1/STREAM_SCALE of a mm. Raises ValueError if a frame
+    has more than STREAM_BALLS balls.
+    """
+    stream = bytearray(STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION,
+                                          keyframe, rate))
+    previous = []
+    for i, frame in enumerate(frames):
+        current = [(int(number), round(x * STREAM_SCALE), round(y * STREAM_SCALE))
+                   for number, x, y in frame]
+        if len(current) > STREAM_BALLS:
+            raise ValueError("a frame stream holds at most %d balls a frame" % STREAM_BALLS)
+        if i % keyframe == 0:
+            kind, balls = KEYFRAME, list(enumerate(current))
+        else:
+            kind = DELTA
+            balls = [(slot, ball) for slot, ball in enumerate(current)
+                     if slot >= len(previous) or previous[slot] != ball]
+            balls += [(slot, (0, BALL_GONE, BALL_GONE))
+                      for slot in range(len(current), len(previous))]
+        stream += FRAME_HEADER.pack(kind, len(balls))
+        for slot, (number, x, y) in balls:
+            stream += STREAM_BALL.pack(slot, number, x, y)
+        previous = current
+    return bytes(stream)
+
+
+def decode_frames(stream):
+    """
+    Decodes a frame stream made by encode_frames. Returns the frame rate and
+    the list of frames, each a list of (number, x, y) for every ball on the
+    table. Raises ValueError if stream is not a frame stream.
+    """
+    if len(stream) < STREAM_HEADER.size:
+        raise ValueError("not a frame stream")
+    magic, version, keyframe, rate = STREAM_HEADER.unpack_from(stream)
+    if magic != STREAM_MAGIC or version != STREAM_VERSION:
+        raise ValueError("not a frame stream")
+
+    frames = []
+    balls = {}
+    offset = STREAM_HEADER.size
+    while offset < len(stream):
+        kind, count = FRAME_HEADER.unpack_from(stream, offset)
+        offset += FRAME_HEADER.size
+        if kind == KEYFRAME:
+            balls = {}
+        end = offset + count * STREAM_BALL.size
+        for slot, number, x, y in STREAM_BALL.iter_unpack(stream[offset:end]):
+            if x == BALL_GONE:
+                balls.pop(slot, None)
+            else:
+                balls[slot] = (number, x / STREAM_SCALE, y / STREAM_SCALE)
+        offset = end
+        frames.append([balls[slot] for slot in sorted(balls)])
+    return rate, frames
+
+################################################################################
+
+
+def make_event(event):
+    """
+    Returns the phylib_event event (see phylib.i) as an Event.
+    """
+    return Event(event.reason, event.ball, event.other, event.number,
+                 event.time, event.pos.x, event.pos.y)
+
+################################################################################
+
+
+class Shot(phylib.phylib_shot):
+    """
+    Python Shot class. A Shot is returned by Table.simulate and holds the
+    Table the shot started from, followed by the Table at the end of every
+    segment.
+    """
+
+    def __len__(self):
+        """
+        The number of Tables in the shot (one more than the number of segments).
+        """
+        return self.count
+
+    def __getitem__(self, index):
+        """
+        Returns Table number index of the shot. The Table is stored in the
+        Shot, so it keeps the Shot alive for as long as it is in use.
+        """
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("shot index out of range")
+        result = self.get_table(index)
+        result.__class__ = Table
+        result.shot = self
+        return result
+
+    def times(self):
+        """
+        Returns the time at the end of every segment, starting with the time
+        the shot started.
+        """
+        return [self[i].time for i in range(self.count)]
+
+    def reasons(self):
+        """
+        Returns why every segment ended (one of the REASON_ constants),
+        starting with REASON_NONE for the table the shot started from.
+        """
+        return [self.get_reason(i) for i in range(self.count)]
+
+    def events(self):
+        """
+        Returns the Event that ended every segment, starting with an Event
+        with REASON_NONE for the table the shot started from.
+        """
+        return [make_event(self.get_event(i)) for i in range(self.count)]
+
+    def broad_phase(self):
+        """
+        Returns the broad-phase counts of the whole shot as a BroadPhase. Each
+        segment's counts are kept with the event that ended it, so shots
+        simulated at the same time in other threads do not mix in.
+        """
+        counts = [self.get_event(i).broad for i in range(self.count)]
+        return BroadPhase(sum(broad.tested for broad in counts),
+                          sum(broad.avoided for broad in counts))
+
+    def pocketed(self):
+        """
+        Returns the numbers of the balls that went into a hole, in order.
+        """
+        return [event.number for event in self.events()
+                if event.reason == REASON_HOLE]
+
+    def frames(self, segment, rate=FRAME_RATE):
+        """
+        Returns the frames of segment number segment (from 1 to len - 1),
+        one every rate seconds, as a memoryview (see Table.frames).
+        """
+        return self[segment - 1].frames(self[segment], rate)
+
+    def svg_parts(self, rate=FRAME_RATE, inline=False):
+        """
+        Generates the whole shot as one animated SVG: the static layer (see
+        static_svg), then every ball with an <animate> of its x and y through
+        all the frames of the shot, one every rate seconds (see frames),
+        ending on the last Table. A ball that goes into a hole is hidden
+        after its last frame. Each ball is only animated from the frame
+        before it first moves to the frame where it last moves, so a ball
+        that never moves is not animated at all. If inline is True, it is an
+        <svg> element for an HTML page, as in Table.svg_parts.
+        """
+        # the x and y of every ball in every frame, by (number, how many
+        # balls with that number come before it), as a table can have two
+        # balls with the same number
+        frames = self.all_frames(rate)
+        paths = collections.OrderedDict()
+        for frame in frames:
+            seen = collections.Counter()
+            for number, x, y in frame:
+                number = int(number)
+                xs, ys = paths.setdefault((number, seen[number]), ([], []))
+                seen[number] += 1
+                xs.append(x)
+                ys.append(y)
+
+        yield static_svg(inline=inline)
+        for (number, same), (xs, ys) in paths.items():
+            points = ["%d" % x for x in xs], ["%d" % y for y in ys]
+            moves = [i for i in range(1, len(xs))
+                     if points[0][i] != points[0][i - 1] or points[1][i] != points[1][i - 1]]
+            animations = []
+            if moves:
+                first, last = moves[0] - 1, moves[-1] + 1
+                for name, values in zip(("cx", "cy"), points):
+                    animations.append(PATH_SVG % (
+                        name, ";".join(values[first:last]),
+                        first * rate, (last - first - 1) * rate))
+            # a ball still on the table is in every frame
+            if len(xs) < len(frames):
+                animations.append(HIDE_SVG % (len(xs) * rate))
+            yield BALL_PATH_SVG[number] % (xs[0], ys[0], "".join(animations))
+        yield FOOTER
+
+    def all_frames(self, rate=FRAME_RATE):
+        """
+        Returns every frame of the shot, one every rate seconds: the frames
+        of each segment in turn (see frames), then the last Table. Each frame
+        is a list of [number, x, y] for every ball on the table.
+        """
+        frames = [frame for segment in range(1, len(self))
+                  for frame in self.frames(segment, rate).tolist()]
+        frames.append([[ball.number, ball.x, ball.y] for ball in self[-1].balls()])
+        return frames
+
+    def replay(self):
+        """
+        Returns the Tables of the shot as {"segments": [{"time": time,
+        "balls": balls, "gone": numbers}, ...]}, ready for json.dumps, so
+        that a client can make the frames itself (see replay.js). Each ball
+        is [number, x, y] if it is still, and [number, x, y, vx, vy, ax, ay]
+        if it is rolling; every ball moves with constant acceleration until
+        the next Table, so nothing else is needed. The first Table lists
+        every ball, and each one after it only the balls that are rolling or
+        changed since the Table before, and the numbers of the balls that
+        left the table. Ball values are rounded to REPLAY_DIGITS decimals;
+        times are not, so that a client finds the same frames.
+        """
+        segments = []
+        previous = {}
+        for table in self:
+            current = {}
+            for ball in table.balls():
+                values = ball.astuple()
+                if ball.state == phylib.PHYLIB_STILL_BALL:
+                    values = values[2:4]
+                else:
+                    values = values[2:]
+                current[ball.number] = [ball.number] + [
+                    round(value, REPLAY_DIGITS) for value in values]
+            segments.append({
+                "time": table.time,
+                "balls": [ball for number, ball in current.items()
+                          if len(ball) > 3 or previous.get(number) != ball],
+                "gone": [number for number in previous if number not in current],
+            })
+            previous = current
+        return {"segments": segments}
+
+    def frame_stream(self, rate=FRAME_RATE, keyframe=KEYFRAME_INTERVAL):
+        """
+        Returns every frame of the shot (see all_frames) as a frame stream
+        (see encode_frames).
+        """
+        return encode_frames(self.all_frames(rate), rate, keyframe)
+
+    def svg(self, rate=FRAME_RATE):
+        """
+        Returns the animated SVG of the shot (see svg_parts) as a string.
+        """
+        return "".join(self.svg_parts(rate))
+
+    def write_svg(self, fp, rate=FRAME_RATE, encoding=None, inline=False):
+        """
+        Writes the animated SVG of the shot (see svg_parts) to fp, as
+        Table.write_svg does.
+        """
+        write_svg_parts(fp, self.svg_parts(rate, inline), encoding, inline)
+
+################################################################################
+
+
+class Batch(phylib.phylib_batch):
+    """
+    Python Batch class. A Batch simulates many independent shots together
+    in lock step (see phylib_batch_run in phylib.c), and a shot drops out
+    once nothing on it is rolling. Each shot ends up exactly as
+    Table.simulate would leave it: every table and event is the same, to the
+    last bit.
+    """
+
+    def __init__(self, tables=()):
+        """
+        Batch constructor method. Starts one shot from a copy of each Table
+        in tables.
+        """
+        phylib.phylib_batch.__init__(self)
+        for table in tables:
+            self.add(table)
+
+    def add(self, table, xvel=None, yvel=None):
+        """
+        Starts a new shot from a copy of table and returns its index. If a
+        velocity is given, the cue ball of the copy is struck with it (see
+        Table.strike).
+        """
+        index = self.add_table(table)
+        if xvel is not None:
+            self[index][0].strike(xvel, yvel)
+        return index
+
+    def add_strikes(self, table, velocities):
+        """
+        Starts a new shot from a copy of table for every cue velocity (xvel,
+        yvel) in velocities, with the cue ball struck (see Table.strike), and
+        returns the index of the first. The copies are made and struck in C.
+        """
+        buffer = array.array("d", [v for velocity in velocities for v in velocity])
+        return phylib.phylib_batch.add_strikes(self, table, buffer)
+
+    def run(self, solver=SOLVER_STEP):
+        """
+        Simulates every shot to the end and returns the number of rounds.
+        """
+        return self.simulate(solver)
+
+    def __len__(self):
+        """
+        The number of shots in the batch.
+        """
+        return self.count
+
+    def __getitem__(self, index):
+        """
+        Returns shot number index as a Shot. The Shot is stored in the Batch,
+        so it keeps the Batch alive for as long as it is in use.
+        """
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("batch index out of range")
+        result = self.get_shot(index)
+        result.__class__ = Shot
+        result.batch = self
+        return result
+
+################################################################################
+
+
+def simulate_shots(jobs, workers=None, solver=SOLVER_STEP):
+    """
+    Simulates a shot for every (table, (xvel, yvel)) in jobs on a pool of
+    workers threads (the ThreadPoolExecutor default if workers is None) and
+    returns the Shots in the same order as jobs. Each shot starts from a copy
+    of its table with the cue ball struck (see Table.strike). The simulation
+    releases the GIL, so the threads run in parallel; the tables must not be
+    changed until simulate_shots returns.
+    """
+    def shoot(job):
+        table, (xvel, yvel) = job
+        start = table.copy()
+        start.strike(xvel, yvel)
+        return start.simulate(solver)
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(shoot, jobs))
+
+################################################################################
+
+
+def ball_positions(table):
+    """
+    Returns {number: (x, y)} for every ball on table.
+    """
+    state = table.state()
+    positions = state.pos.tolist()
+    return {state.number[i]: tuple(positions[i])
+            for i in range(table.capacity)
+            if state.type[i] in (phylib.PHYLIB_STILL_BALL, phylib.PHYLIB_ROLLING_BALL)}
+
+
+def evaluate_shot(table, xvel, yvel, solver=SOLVER_EVENT, cue_target=None):
+    """
+    Simulates the shot with cue velocity (xvel, yvel) from a copy of table
+    and scores it: one point for every ball pocketed, two points off if the
+    cue ball goes down, and up to half a point off for how far from
+    cue_target (the centre of the table by default) the cue ball stops.
+    Returns a ShotPlan.
+    """
+    if cue_target is None:
+        cue_target = (TABLE_WIDTH / 2.0, TABLE_LENGTH / 2.0)
+
+    start = table.copy()
+    start.strike(xvel, yvel)
+    before = ball_positions(start)
+    after = ball_positions(start.simulate(solver)[-1])
+
+    pocketed = sorted(number for number in before
+                      if number != 0 and number not in after)
+    cue = after.get(0)
+    score = len(pocketed)
+    if cue is None:
+        score -= 2.0
+    else:
+        distance = math.hypot(cue[0] - cue_target[0], cue[1] - cue_target[1])
+        score -= 0.5 * min(distance / TABLE_LENGTH, 1.0)
+
+    return ShotPlan(xvel, yvel, pocketed, cue is None, cue, score)
+
+
+# the table each planner process evaluates shots on (see plan_shot)
+planner = {}
+
+
+def planner_start(balls, solver, cue_target):
+    """
+    Sets up a planner process: builds its Table from (number, x, y) balls.
+    """
+    table = Table()
+    for number, x, y in balls:
+        table += StillBall(number, Coordinate(x, y))
+    planner.update(table=table, solver=solver, cue_target=cue_target)
+
+
+def planner_run(velocities):
+    """
+    Evaluates the shot for every (xvel, yvel) in velocities in a planner
+    process and returns their ShotPlans.
+    """
+    return [evaluate_shot(planner["table"], xvel, yvel,
+                          planner["solver"], planner["cue_target"])
+            for xvel, yvel in velocities]
+
+
+def plan_shot(table, angles=72, speeds=(1000.0, 2000.0, 3000.0, 4000.0, 5000.0),
+              refine=2, target=None, workers=None, solver=SOLVER_EVENT,
+              cue_target=None, chunk=32):
+    """
+    Searches for the best cue velocity for table (scored by evaluate_shot)
+    on a pool of workers processes. The search tries angles directions at
+    every one of speeds, and then refine more rounds, each trying a finer
+    grid of 5 x 5 shots around the best one so far. If target is given, the
+    search stops as soon as the best shot pockets at least target balls
+    without the cue ball going down. The balls are taken from where they are on the
+    table. Returns a PlanResult.
+    """
+    balls = [(number, x, y) for number, (x, y) in ball_positions(table).items()]
+    begin = time.perf_counter()
+    best = None
+    done = False
+    evaluations = 0
+
+    step = 2.0 * math.pi / angles
+    spread = 0.1
+    velocities = [(speed * math.cos(k * step), speed * math.sin(k * step))
+                  for k in range(angles) for speed in speeds]
+
+    with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=planner_start,
+            initargs=(balls, solver, cue_target)) as pool:
+        for search in range(refine + 1):
+            if search > 0:
+                # a finer grid around the best shot so far
+                step /= 2.0
+                angle = math.atan2(best.yvel, best.xvel)
+                speed = math.hypot(best.xvel, best.yvel)
+                velocities = [(speed * (1.0 + j * spread) * math.cos(angle + k * step),
+                               speed * (1.0 + j * spread) * math.sin(angle + k * step))
+                              for k in range(-2, 3) for j in range(-2, 3)]
+                spread /= 2.0
+
+            futures = [pool.submit(planner_run, velocities[i:i + chunk])
+                       for i in range(0, len(velocities), chunk)]
+            for future in concurrent.futures.as_completed(futures):
+                for plan in future.result():
+                    evaluations += 1
+                    if best is None or plan.score > best.score:
+                        best = plan
+                done = target is not None and not best.scratched and \
+                    len(best.pocketed) >= target
+                if done:
+                    for other in futures:
+                        other.cancel()
+                    break
+            if done:
+                break
+
+    seconds = time.perf_counter() - begin
+    return PlanResult(best, evaluations, seconds, evaluations / seconds)
+
+################################################################################
+
+
+def replay_chunks(shots, rate=FRAME_RATE, chunk=100):
+    """
+    Generates the frames of every Shot in shots (see Shot.all_frames), one
+    every rate seconds, in chunks of at most chunk frames that can be sent
+    to another process: (count, balls, data), where data is the bytes of
+    the count frames' (number, x, y) doubles and balls is how many balls
+    each frame has. Only one segment's frames are held at a time.
+    """
+    for shot in shots:
+        for segment in range(1, len(shot)):
+            frames = shot.frames(segment, rate)
+            for i in range(0, len(frames), chunk):
+                part = frames[i:i + chunk]
+                yield len(part), frames.shape[1], part.tobytes()
+        last = array.array("d")
+        for ball in shot[-1].balls():
+            last.extend((ball.number, ball.x, ball.y))
+        yield 1, len(last) // FRAME_FIELDS, last.tobytes()
+
+
+def render_frames(first, count, balls, data):
+    """
+    Returns the SVG of a chunk of frames from replay_chunks, numbered from
+    first, as frames_svg_parts draws them: a group with the id "frame-i"
+    for each frame, hidden unless it is the first, holding its balls.
+    """
+    values = memoryview(data).cast("d").tolist()
+    size = balls * FRAME_FIELDS
+    parts = []
+    for k in range(count):
+        index = first + k
+        parts.append('<g id="frame-%d"%s>\n' % (index, ' visibility="hidden"' if index else ""))
+        for j in range(k * size, (k + 1) * size, FRAME_FIELDS):
+            parts.append(BALL_SVG[int(values[j])] % (values[j + 1], values[j + 2]))
+        parts.append("</g>\n")
+    return "".join(parts)
+
+
+def export_replay(shots, path, rate=FRAME_RATE, workers=None, chunk=100):
+    """
+    Writes every frame of every Shot in shots, one every rate seconds, to
+    the file path as one SVG (see frames_svg_parts). The frames are rendered
+    chunk at a time on a pool of workers processes, which are sent plain
+    frame arrays (see replay_chunks), and written in order as they come
+    back. At most two chunks per worker are in flight at a time, so memory
+    stays bounded however long the replay is. Returns how many frames were
+    written.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = collections.deque()
+    frames = 0
+
+    with open(path, "w") as fp, \
+            concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        fp.write(static_svg())
+        for count, balls, data in replay_chunks(shots, rate, chunk):
+            if len(pending) >= 2 * workers:
+                fp.write(pending.popleft().result())
+            pending.append(pool.submit(render_frames, frames, count, balls, data))
+            frames += count
+        while pending:
+            fp.write(pending.popleft().result())
+        fp.write(FOOTER)
+
+    return frames
+
+################################################################################
+
+
+def drag_ball(number, x, y, vx, vy):
+    """
+    Returns the BallState of ball number at (x, y) moving with velocity
+    (vx, vy): a RollingBall slowed by DRAG, as readTable makes them (with
+    no acceleration if it is slower than VEL_EPSILON).
+    """
+    speed = math.hypot(vx, vy)
+    if speed > VEL_EPSILON:
+        return BallState(number, phylib.PHYLIB_ROLLING_BALL, x, y, vx, vy,
+                         -vx / speed * DRAG, -vy / speed * DRAG)
+    return BallState(number, phylib.PHYLIB_ROLLING_BALL, x, y, vx, vy)
+
+
+def pack_balls(balls, quantize=False, accelerations=False):
+    """
+    Returns the BallStates balls packed into a TableBalls BLOB (see
+    STORAGE_PACKED). Unless accelerations is set, accelerations are not
+    stored, and unpack_balls works them out from the velocities, as
+    readTable does; with it, the balls are unpacked exactly as they were.
+    Accelerations can't be quantized.
+    """
+    if quantize and accelerations:
+        raise ValueError("accelerations can't be quantized")
+    flags = (PACKED_QUANTIZED if quantize else 0) | (PACKED_ACCELERATED if accelerations else 0)
+    blob = bytearray(PACKED_HEADER.pack(PACKED_VERSION, flags))
+    for ball in balls:
+        rolling = ball.state != phylib.PHYLIB_STILL_BALL
+        if quantize:
+            blob += PACKED_QUANTIZED_BALL.pack(ball.number, ball.state,
+                                               round(ball.x * PACKED_SCALE),
+                                               round(ball.y * PACKED_SCALE))
+            if rolling:
+                blob += PACKED_QUANTIZED_VELOCITY.pack(round(ball.vx * PACKED_SCALE),
+                                                       round(ball.vy * PACKED_SCALE))
+        else:
+            blob += PACKED_BALL.pack(ball.number, ball.state, ball.x, ball.y)
+            if rolling:
+                blob += PACKED_VELOCITY.pack(ball.vx, ball.vy)
+            if rolling and accelerations:
+                blob += PACKED_ACCELERATION.pack(ball.ax, ball.ay)
+    return bytes(blob)
+
+
+def unpack_balls(blob):
+    """
+    Returns the BallStates packed into blob by pack_balls.
+    """
+    version, flags = PACKED_HEADER.unpack_from(blob)
+    if version != PACKED_VERSION:
+        raise ValueError("unknown TableBalls version %d" % version)
+
+    if flags & PACKED_QUANTIZED:
+        layout, velocity, scale = PACKED_QUANTIZED_BALL, PACKED_QUANTIZED_VELOCITY, PACKED_SCALE
+    else:
+        layout, velocity, scale = PACKED_BALL, PACKED_VELOCITY, 1.0
+
+    balls = []
+    offset = PACKED_HEADER.size
+    while offset < len(blob):
+        number, state, x, y = layout.unpack_from(blob, offset)
+        offset += layout.size
+        if state == phylib.PHYLIB_STILL_BALL:
+            balls.append(BallState(number, state, x / scale, y / scale))
+        else:
+            vx, vy = velocity.unpack_from(blob, offset)
+            offset += velocity.size
+            if flags & PACKED_ACCELERATED:
+                ax, ay = PACKED_ACCELERATION.unpack_from(blob, offset)
+                offset += PACKED_ACCELERATION.size
+                balls.append(BallState(number, state, x, y, vx, vy, ax, ay))
+            else:
+                balls.append(drag_ball(number, x / scale, y / scale, vx / scale, vy / scale))
+    return balls
+
+################################################################################
+
+
+class FrameCache:
+    """
+    A cache of rendered tables (bytes), keyed by anything hashable, that
+    keeps at most budget bytes and evicts the least recently used entries
+    to stay under it. Stored tables never change, so entries never need
+    invalidating, only dropping when the database is reset.
+    """
+
+    def __init__(self, budget=FRAME_CACHE_BYTES):
+        self.budget = budget
+        self.size = 0
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, render):
+        """
+        Returns the entry for key, calling render() to make it (and keeping
+        it, unless it is None or bigger than the whole budget) if it is not
+        in the cache.
+        """
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = render()
+        if result is None or len(result) > self.budget:
+            return result
+
+        self.entries[key] = result
+        self.size += len(result)
+        self.trim()
+        return result
+
+    def resize(self, budget):
+        """
+        Changes the budget to budget bytes, evicting entries if needed.
+        """
+        self.budget = budget
+        self.trim()
+
+    def trim(self):
+        """
+        Evicts the least recently used entries until the cache is within
+        its budget.
+        """
+        while self.size > self.budget:
+            key, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry. The counters are kept.
+        """
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Returns the cache's counters as a CacheStats.
+        """
+        return CacheStats(self.hits, self.misses, self.evictions,
+                          len(self.entries), self.size, self.budget)
+
+
+# the rendered tables of phylib.db, by (tableID, format), where tableID is numbered from 0 as
+# readTable numbers them (see Database.renderTable)
+frame_cache = FrameCache()
+
+################################################################################
+
+
+class Database ():
+
+    def __init__(self, reset=False, storage=STORAGE_ROWS, quantize=False, segments=False):
+
+        # If reset is set to True, it should first delete the file “ phylib.db”
+        # so that a fresh database is created upon connection
+        if reset == True and os.path.exists('phylib.db'):
+            os.remove('phylib.db')
+            frame_cache.clear()
+
+        # how writeTable stores balls (see STORAGE_ROWS, STORAGE_PACKED and STORAGE_SPANS), and
+        # whether packed balls are quantized
+        if storage not in (STORAGE_ROWS, STORAGE_PACKED, STORAGE_SPANS):
+            raise ValueError("unknown storage %r" % storage)
+        self.storage = storage
+        self.quantize = quantize
+
+        # whether Game.shoot stores just the Tables at the segment boundaries of a shot, and
+        # leaves the frames in between to readFrame (see writeSegments)
+        self.segments = segments
+
+        # This constructor should create/open a database connection to a file
+        # in the local directory called “phylib.db” and store it as a class attribute.
+        conn = sqlite3.connect('phylib.db')
+        # connection=sqlite3
+
+        self.db = conn
+
+    def createDB(self, version=SCHEMA_VERSION):
+
+        cur = self.db.cursor()
+
+        # Create the database tables described above.
+        # If any of the tables already exist,
+        # it should leave them alone and not re-create them.
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Ball (
+            BALLID INTEGER PRIMARY KEY AUTOINCREMENT,
+            BALLNO INTEGER NOT NULL,
+            XPOS FLOAT NOT NULL,
+            YPOS FLOAT NOT NULL,
+            XVEL FLOAT,
+            YVEL FLOAT
+        );
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS TTable(
+            TABLEID INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+            TIME FLOAT NOT NULL
+        );
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS BallTable (
+            BALLID INTEGER NOT NULL,
+            TABLEID INTEGER NOT NULL, 
+            FOREIGN KEY(BALLID) REFERENCES Ball (BALLID),
+            FOREIGN KEY(TABLEID) REFERENCES TTable (TABLEID)
+        );
+        """)
+
+        # The Balls written with STORAGE_SPANS: the ball is in every table from FIRSTTABLE to
+        # LASTTABLE, as the SLOTth ball of the table
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS BallSpan (
+            BALLID INTEGER PRIMARY KEY NOT NULL,
+            FIRSTTABLE INTEGER NOT NULL,
+            LASTTABLE INTEGER NOT NULL,
+            SLOT INTEGER NOT NULL,
+            FOREIGN KEY(BALLID) REFERENCES Ball (BALLID),
+            FOREIGN KEY(FIRSTTABLE) REFERENCES TTable (TABLEID),
+            FOREIGN KEY(LASTTABLE) REFERENCES TTable (TABLEID)
+        );
+        """)
+
+        # The balls of a table written with STORAGE_PACKED, all in one BLOB (see pack_balls)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS TableBalls (
+            TABLEID INTEGER PRIMARY KEY NOT NULL,
+            BALLS BLOB NOT NULL,
+            FOREIGN KEY(TABLEID) REFERENCES TTable(TABLEID)
+        );
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Shot (
+            SHOTID INTEGER PRIMARY KEY AUTOINCREMENT,
+            PLAYERID INTEGER NOT NULL,
+            GAMEID INTEGER NOT NULL,
+            FOREIGN KEY(PLAYERID) REFERENCES Player(PLAYERID),
+            FOREIGN KEY(GAMEID) REFERENCES Game(GAMEID)
+        );
+        """)
+
+        # A shot written with writeSegments: its TableShot tables are only the segment
+        # boundaries, and its FRAMES frames, one every RATE seconds, are rolled from them
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS SegmentShot (
+            SHOTID INTEGER PRIMARY KEY NOT NULL,
+            RATE FLOAT NOT NULL,
+            FRAMES INTEGER NOT NULL,
+            FOREIGN KEY(SHOTID) REFERENCES Shot(SHOTID)
+        );
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS TableShot (
+            TABLEID INTEGER NOT NULL,
+            SHOTID INTEGER NOT NULL,
+            PRIMARY KEY (TABLEID, SHOTID),
+            FOREIGN KEY(TABLEID) REFERENCES TTable(TABLEID),
+            FOREIGN KEY(SHOTID) REFERENCES Shot(SHOTID)
+        );
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Game (
+            GAMEID INTEGER PRIMARY KEY AUTOINCREMENT,
+            GAMENAME VARCHAR(64) NOT NULL
+        );
+        """)
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS Player (
+            PLAYERID INTEGER PRIMARY KEY AUTOINCREMENT,
+            GAMEID INTEGER NOT NULL,
+            PLAYERNAME VARCHAR(64) NOT NULL,
+            FOREIGN KEY(GAMEID) REFERENCES Game(GAMEID)
+        );
+        """)
+
+        # Make sure to call close on your cursor and commit on your connection
+        self.db.commit()
+        cur.close()
+
+        # Then bring the schema up to version (see MIGRATIONS)
+        self.migrate(version)
+
+    def schemaVersion(self):
+        """
+        Returns the version of the schema of the database (see MIGRATIONS).
+        """
+        cur = self.db.cursor()
+        cur.execute("PRAGMA user_version")
+        version = cur.fetchone()[0]
+        cur.close()
+        return version
+
+    def migrate(self, version=SCHEMA_VERSION):
+        """
+        Runs the MIGRATIONS that take the database from its schemaVersion to
+        version, each in its own transaction along with the new user_version,
+        so a database is never left part way through one. A database that is
+        already at version or later is left alone. Returns the version the
+        database is at.
+        """
+        if version > SCHEMA_VERSION:
+            raise ValueError("unknown schema version %d" % version)
+
+        current = self.schemaVersion()
+        cur = self.db.cursor()
+        while current < version:
+            self.db.commit()
+            cur.execute("BEGIN")
+            try:
+                for statement in MIGRATIONS[current]:
+                    cur.execute(statement)
+                cur.execute("PRAGMA user_version = %d" % (current + 1))
+            except sqlite3.Error:
+                self.db.rollback()
+                cur.close()
+                raise
+            self.db.commit()
+            current += 1
+        cur.close()
+        return current
+
+    def renderTable(self, tableID, format="svg"):
+        """
+        Returns table tableID (see readTable) rendered as bytes in format:
+        "svg" for its SVG, or "stream" for a frame stream of just that table
+        (see encode_frames). Returns None if there is no such table. The
+        result comes from frame_cache when it can, so showing a stored table
+        again doesn't read or render it again.
+        """
+        if format not in ("svg", "stream"):
+            raise ValueError("unknown format %r" % format)
+
+        def render():
+            table = self.readTable(tableID)
+            if table is None:
+                return None
+            if format == "svg":
+                return table.svg().encode("utf-8")
+            return encode_frames([[(ball.number, ball.x, ball.y)
+                                   for ball in table.balls()]])
+
+        return frame_cache.get((tableID, format), render)
+
+    def readTable(self, tableID):
+
+        cur = self.db.cursor()
+
+        # The table should have the standard holes and cushions, and have Balls
+        # whose BALLIDs are in the BallTable table with a TABLEID that  is one larger than
+        # (because we like to start numbering tableID at zero, but SQL likes to start
+        # numbering TABLEID at 1) the method’s argument.
+        newTableID = tableID+1
+
+        # The table’s time attribute should be retrieved from the TTable SQL table.
+        cur.execute(
+            """SELECT TIME FROM TTable WHERE TABLEID = ?""", (newTableID,))
+        tableTime = cur.fetchone()
+
+        # If TABLEID does not exist in the BallTable table, then the method should
+        # return None.
+        if tableTime is None:
+            self.db.commit()
+            cur.close()
+            return None
+
+        table = Table()
+        table.time = tableTime[0]
+
+        # A table written with STORAGE_PACKED has its balls in one TableBalls BLOB
+        cur.execute("""SELECT BALLS FROM TableBalls WHERE TABLEID = ?""", (newTableID,))
+        packed = cur.fetchone()
+        if packed is not None:
+            table.add_balls(unpack_balls(packed[0]))
+            self.db.commit()
+            cur.close()
+            return table
+
+        # Use a single SQL SELECT statement with a JOIN clause to retrieve all the balls for
+        # the given table in a single operation.
+        cur.execute("""
+            SELECT Ball.BALLID, Ball.BALLNO, Ball.XPOS, Ball.YPOS, Ball.XVEL, Ball.YVEL
+            FROM Ball
+            JOIN BallTable ON Ball.BALLID = BallTable.BALLID
+            WHERE BallTable.TABLEID = ?;
+            """, (newTableID,))
+
+        # Each ball’s attributes should be retrieved
+        # from the Ball table, and balls with no velocity should be instantiated as StillBalls, while
+        # balls with a velocity should have their acceleration set just like in A2 and be instantiated as
+        # RollingBalls.
+        balls = cur.fetchall()
+
+        # A table written with STORAGE_SPANS has its balls in the spans that it is in. The
+        # spans of a slot never overlap, so the one the table is in, if any, is the last one
+        # to start at or before it, which BallSpanSlot finds without a scan; the table's
+        # balls are in slots 0, 1, ... up to the first slot with no span that it is in.
+        if not balls:
+            cur.execute("""
+                WITH RECURSIVE Span (SLOT, BALLID) AS (
+                    SELECT 0, (SELECT BALLID FROM BallSpan
+                               WHERE SLOT = 0 AND FIRSTTABLE <= :table
+                               ORDER BY FIRSTTABLE DESC LIMIT 1)
+                    UNION ALL
+                    SELECT Span.SLOT + 1, (SELECT BALLID FROM BallSpan
+                                           WHERE SLOT = Span.SLOT + 1 AND FIRSTTABLE <= :table
+                                           ORDER BY FIRSTTABLE DESC LIMIT 1)
+                    FROM Span
+                    JOIN BallSpan ON Span.BALLID = BallSpan.BALLID
+                    WHERE BallSpan.LASTTABLE >= :table
+                )
+                SELECT Ball.BALLID, Ball.BALLNO, Ball.XPOS, Ball.YPOS, Ball.XVEL, Ball.YVEL
+                FROM Span
+                JOIN BallSpan ON Span.BALLID = BallSpan.BALLID
+                JOIN Ball ON Ball.BALLID = BallSpan.BALLID
+                WHERE BallSpan.LASTTABLE >= :table
+                ORDER BY Span.SLOT;
+                """, {"table": newTableID})
+            balls = cur.fetchall()
+
+        for ball in balls:
+            ballID, ballNO, xpos, ypos, xvel, yvel = ball
+
+            if xvel is None and yvel is None:
+                stillBall = StillBall(ballNO, Coordinate(xpos, ypos))
+                table += stillBall
+
+            else:
+                rollingBallVel = Coordinate(float(xvel), float(yvel))
+                speedA = phylib.phylib_length(rollingBallVel)
+
+                AccX = 0.0
+                AccY = 0.0
+
+                if speedA > VEL_EPSILON:
+                    AccX = (-rollingBallVel.x / speedA) * DRAG
+                    AccY = (-rollingBallVel.y / speedA) * DRAG
+
+                acc = Coordinate(AccX, AccY)
+
+                if math.sqrt((float(xvel) * float(xvel)) + (float(yvel) * float(yvel))) > VEL_EPSILON:
+                    rollingBall = RollingBall(ballNO, Coordinate(
+                        float(xpos), float(ypos)), rollingBallVel, acc)
+
+                else:
+                    rollingBall = RollingBall(ballNO, Coordinate(
+                        float(xpos), float(ypos)), rollingBallVel, Coordinate(0.0, 0.0))
+
+                table += rollingBall
+
+        # Make sure to call close on your cursor and commit on your connection.
+        self.db.commit()
+        cur.close()
+
+        # This method should return a Table object (from A2).
+        return table
+
+    # This method stores the contents of the Table class object named table in the database, such
+    # that it can be perfectly reconstructed by readTable. You can test these two methods by creating a
+    # Table object (like in A3Test1.py) printing the table, writing the table, shutting down your
+    # program, then starting a new program (like in A3Test2.py) where you read and print the table
+    # and see if it is the same.
+    def writeTable(self, table):
+
+        # This method will return the
+        # autoincremented TABLEID value minus 1 (because we like to start numbering tableID at zero,
+        # but SQL likes to start numbering TABLEID at 1).
+        return self.writeTables([table])[0]
+
+    def writeTables(self, tables, shotID=None, accelerations=False):
+        """
+        Writes every Table in tables, as writeTable does, in a single
+        transaction, and records them in TableShot under shotID if it is
+        given. The TABLEIDs come from lastrowid and the BALLIDs are numbered
+        on from the largest one so far, read once the transaction holds the
+        write lock, so nothing has to be looked up again, and the Ball, BallTable (or, with STORAGE_PACKED, TableBalls,
+        and with STORAGE_SPANS, BallSpan) and TableShot rows are each
+        inserted with one executemany. With STORAGE_SPANS, a ball that is
+        the same as in the table before it only makes its span longer. With
+        accelerations, every table is packed along with the accelerations
+        of its balls (see pack_balls), whatever the storage, so that
+        readTable gives back exactly the same Tables. Returns the tables'
+        TABLEIDs minus 1.
+        """
+        cur = self.db.cursor()
+
+        # Take the write lock before reading MAX(BALLID), so that no other writer can number its
+        # balls on from the same one (a transaction that has already written holds it already)
+        if not self.db.in_transaction:
+            cur.execute("BEGIN IMMEDIATE")
+        cur.execute("SELECT MAX(BALLID) FROM Ball")
+        ballID = cur.fetchone()[0] or 0
+
+        tableIDs = []
+        balls = []
+        ballTables = []
+        packed = []
+
+        # with STORAGE_SPANS, the span each ball of the last table is in, by its place in the
+        # table, as [BALLID, FIRSTTABLE, LASTTABLE, SLOT, the Ball row's values]
+        spans = {}
+        ballSpans = []
+
+        for table in tables:
+            cur.execute("INSERT INTO TTable (TIME) VALUES (?)", (table.time,))
+            tableID = cur.lastrowid
+            tableIDs.append(tableID)
+
+            if accelerations:
+                packed.append((tableID, pack_balls(table.balls(), accelerations=True)))
+                continue
+            if self.storage == STORAGE_PACKED:
+                packed.append((tableID, pack_balls(table.balls(), self.quantize)))
+                continue
+
+            # StillBalls have no velocity
+            current = {}
+            for slot, ball in enumerate(table.balls()):
+                if ball.state == phylib.PHYLIB_STILL_BALL:
+                    values = (ball.number, ball.x, ball.y, None, None)
+                else:
+                    values = (ball.number, ball.x, ball.y, ball.vx, ball.vy)
+
+                if self.storage == STORAGE_SPANS:
+                    span = spans.pop(slot, None)
+                    if span is not None and span[4] == values and span[2] == tableID - 1:
+                        span[2] = tableID
+                        current[slot] = span
+                        continue
+                    if span is not None:
+                        ballSpans.append(tuple(span[:4]))
+
+                ballID += 1
+                balls.append((ballID,) + values)
+                if self.storage == STORAGE_SPANS:
+                    current[slot] = [ballID, tableID, tableID, slot, values]
+                else:
+                    ballTables.append((ballID, tableID))
+
+            # the balls that are not in this table any more end their spans
+            ballSpans.extend(tuple(span[:4]) for span in spans.values())
+            spans = current
+
+        ballSpans.extend(tuple(span[:4]) for span in spans.values())
+
+        cur.executemany("""INSERT INTO Ball (BALLID, BALLNO, XPOS, YPOS, XVEL, YVEL)
+                        VALUES (?, ?, ?, ?, ?, ?)""", balls)
+        cur.executemany("""INSERT INTO BallTable (BALLID, TABLEID)
+                        VALUES (?, ?)""", ballTables)
+        cur.executemany("""INSERT INTO BallSpan (BALLID, FIRSTTABLE, LASTTABLE, SLOT)
+                        VALUES (?, ?, ?, ?)""", ballSpans)
+        cur.executemany("""INSERT INTO TableBalls (TABLEID, BALLS) VALUES (?, ?)""", packed)
+        if shotID is not None:
+            cur.executemany("""INSERT INTO TableShot (TABLEID, SHOTID) VALUES (?, ?)""",
+                            [(tableID, shotID) for tableID in tableIDs])
+
+        # Make sure to call close on your cursor and commit on your connection.
+        self.db.commit()
+        cur.close()
+
+        return [tableID - 1 for tableID in tableIDs]
+
+    def writeSegments(self, shot, shotID, rate=FRAME_RATE):
+        """
+        Writes shot, a Shot from Table.simulate, for shotID: only the Table
+        the shot started from and the Table at the end of every segment go
+        into TTable and TableShot (with writeTables, in one transaction, and
+        their accelerations, so that they are read back exactly), and
+        SegmentShot records the frame rate and how many frames Game.shoot
+        would have written. readFrame rolls any of those frames from its
+        segment's first Table when it is asked for, so it is the same frame
+        Game.shoot made. Returns the Tables' TABLEIDs minus 1.
+        """
+        times = shot.times()
+        frames = sum(math.floor((end - begin) / rate) for begin, end in zip(times, times[1:]))
+
+        cur = self.db.cursor()
+        cur.execute("""INSERT INTO SegmentShot (SHOTID, RATE, FRAMES) VALUES (?, ?, ?)""",
+                    (shotID, rate, frames))
+        cur.close()
+        return self.writeTables(shot, shotID, accelerations=True)
+
+    def shotTables(self, shotID):
+        """
+        Returns the (TABLEID minus 1, TIME) of every table recorded in
+        TableShot for shotID, in the order they were written.
+        """
+        cur = self.db.cursor()
+        cur.execute("""
+            SELECT TTable.TABLEID, TTable.TIME
+            FROM TTable
+            JOIN TableShot ON TTable.TABLEID = TableShot.TABLEID
+            WHERE TableShot.SHOTID = ?
+            ORDER BY TTable.TABLEID;
+            """, (shotID,))
+        tables = [(tableID - 1, time) for tableID, time in cur.fetchall()]
+        self.db.commit()
+        cur.close()
+        return tables
+
+    def frameCount(self, shotID):
+        """
+        Returns how many frames Game.shoot stored for shotID, whether it
+        wrote every frame or only the segments (see writeSegments).
+        """
+        cur = self.db.cursor()
+        cur.execute("""SELECT FRAMES FROM SegmentShot WHERE SHOTID = ?""", (shotID,))
+        segments = cur.fetchone()
+        self.db.commit()
+        cur.close()
+        if segments is not None:
+            return segments[0]
+        return len(self.shotTables(shotID))
+
+    def readFrame(self, shotID, frame):
+        """
+        Returns frame number frame (from 0 to frameCount - 1) of shotID as
+        a Table, or None if there is no such frame. If the shot was written
+        with writeSegments the frame is made the same way Game.shoot makes
+        it: the first Table of its segment (see readTable) rolled to the
+        frame's time.
+        """
+        cur = self.db.cursor()
+        cur.execute("""SELECT RATE FROM SegmentShot WHERE SHOTID = ?""", (shotID,))
+        segments = cur.fetchone()
+        self.db.commit()
+        cur.close()
+
+        tables = self.shotTables(shotID)
+        if frame < 0:
+            return None
+        if segments is None:
+            if frame >= len(tables):
+                return None
+            return self.readTable(tables[frame][0])
+
+        rate = segments[0]
+        for (tableID, begin), (_, end) in zip(tables, tables[1:]):
+            count = math.floor((end - begin) / rate)
+            if frame < count:
+                table = self.readTable(tableID).roll(frame * rate)
+                table.time = begin + frame * rate
+                return table
+            frame -= count
+        return None
+
+    def packTables(self, quantize=False):
+        """
+        Moves the balls of every table stored as Ball and BallTable rows into
+        a TableBalls BLOB (see STORAGE_PACKED), in one transaction, and then
+        VACUUMs the database to give the space back. Returns how many tables
+        were packed.
+        """
+        cur = self.db.cursor()
+        cur.execute("""
+            SELECT BallTable.TABLEID, Ball.BALLNO, Ball.XPOS, Ball.YPOS, Ball.XVEL, Ball.YVEL
+            FROM Ball
+            JOIN BallTable ON Ball.BALLID = BallTable.BALLID
+            ORDER BY BallTable.TABLEID, Ball.BALLID;
+            """)
+
+        packed = []
+        for tableID, rows in itertools.groupby(cur.fetchall(), key=lambda row: row[0]):
+            balls = []
+            for tableID, number, x, y, vx, vy in rows:
+                if vx is None and vy is None:
+                    balls.append(BallState(number, phylib.PHYLIB_STILL_BALL, x, y))
+                else:
+                    balls.append(drag_ball(number, x, y, vx, vy))
+            packed.append((tableID, pack_balls(balls, quantize)))
+
+        cur.executemany("""INSERT INTO TableBalls (TABLEID, BALLS) VALUES (?, ?)""", packed)
+        cur.execute("""DELETE FROM Ball WHERE BALLID IN (SELECT BALLID FROM BallTable)""")
+        cur.execute("""DELETE FROM BallTable""")
+        self.db.commit()
+        cur.execute("VACUUM")
+        cur.close()
+        return len(packed)
+
+    def close(self):
+
+        # This method should call commit on the connection and call close on the connection.
+        self.db.commit()
+        self.db.close()
+
+    # I recommend writing a helper method (e.g. getGame) in the
+    # Database class. Player 1 shall be the player with the lower PLAYERID.
+    def getGame(self, gameID):
+
+        cur = self.db.cursor()
+
+        # retreive the values of gameName, player1Name, and
+        # player2Name from the Game and Player tables (use as few SELECT statements as possible and
+        # use a JOIN across tables).
+        cur.execute("""SELECT Game.GAMENAME, P1.PLAYERNAME as player1Name, P2.PLAYERNAME as player2Name 
+            FROM Game 
+            JOIN Player as P1 ON Game.GAMEID = P1.GAMEID 
+            JOIN Player as P2 ON Game.GAMEID = P2.GAMEID 
+            WHERE Game.GAMEID = ? AND P1.PLAYERID < P2.PLAYERID""", (gameID))
+        values = cur.fetchone()
+
+        self.db.commit()
+        cur.close()
+        if values is not None:
+            return values
+        else:
+            return None
+
+    def setGame(self, gameName, player1Name, player2Name):
+
+        cur = self.db.cursor()
+
+        # One new row shall be added to the Game table and two new rows to the Player table to record the
+        # gameName, the player1Name, and the player2Name. The player1Name shall be added to the
+        # Player table first (so that it gets the lower PLAYERID).
+        cur.execute("INSERT INTO Game (GAMENAME) VALUES (?)", (gameName,))
+        cur.execute("SELECT MAX(GAMEID) FROM Game")
+        gameID = cur.fetchone()[0]
+
+        cur.execute(
+            "INSERT INTO Player (GAMEID, PLAYERNAME) VALUES (?, ?)", (gameID, player1Name))
+        cur.execute("SELECT MAX(PLAYERID) FROM Player")
+        player1ID = cur.fetchone()[0]
+
+        cur.execute(
+            "INSERT INTO Player (GAMEID, PLAYERNAME) VALUES (?, ?)", (gameID, player2Name))
+        cur.execute("SELECT MAX(PLAYERID) FROM Player")
+        player2ID = cur.fetchone()[0]
+
+        self.db.commit()
+        cur.close()
+        return gameID
+
+    # I recommend writing a
+    # helper method (e.g. newShot) in the Database class. Make this method return the shotID;
+    # you’ll need it later.
+    def newShot(self, gameName, playerName):
+
+        cur = self.db.cursor()
+
+        cur.execute(
+            """SELECT PLAYERID FROM Player WHERE PLAYERNAME = ?""", (playerName,))
+        playerRecord = cur.fetchone()
+        if playerRecord is None:
+            return None
+        playerID = playerRecord[0]
+
+        cur.execute(
+            """SELECT GAMEID FROM Game WHERE GAMENAME = ?""", (gameName,))
+        gameRecord = cur.fetchone()
+        if gameRecord is None:
+            return None
+        gameID = gameRecord[0]
+
+        cur.execute(
+            """INSERT INTO Shot (PLAYERID, GAMEID) VALUES (?, ?)""", (playerID, gameID))
+        shotID = cur.lastrowid
+
+        self.db.commit()
+        cur.close()
+
+        return shotID
+
+################################################################################
+
+
+class Game ():
+
+    # This class should represent a Game of billiards/pool/snooker. An object of class Game will have
+    # member variables called gameID, gameName, player1Name, and player2Name and table.
+    def __init__(self, gameID=None, gameName=None, player1Name=None, player2Name=None):
+
+        databaseInstance = Database()
+
+        # (i) with an integer gameID value, and all other arguments set to None, or
+        if gameID is not None and (gameName is None and player1Name is None and player2Name is None):
+
+            # For the first constructor version, add one to the gameID (because we number starting from 0,
+            # but SQL numbers starting from 1)
+            self.gameName, self.player1Name, self.player2Name = databaseInstance.getGame(
+                gameID + 1)
+
+        # (ii) with gameID=None, string values for all 3 Name arguments
+        elif gameID is None and (gameName is not None and player1Name is not None and player2Name is not None):
+
+            # For the second constructor, all 3 names shall be added as attributes to the object.
+            self.gameID = databaseInstance.setGame(
+                gameName, player1Name, player2Name)
+
+        else:
+
+            # Any other combination of arguments provided to the constructor shall raise a TypeError
+            # Python Exception.
+            raise TypeError("Invalid combination of arguments given.")
+
+        self.table = None
+
+    def shoot(self, gameName, playerName, table, xvel, yvel, database=None):
+
+        # database is the Database to store the shot in (see Database.segments); by default, a
+        # new Database() writing every frame
+        databaseInstance = Database() if database is None else database
+        tableInstance = Table()
+
+        # This method of the Game class should add a new entry to the Shot table for the current game
+        # and the given playerID (determined by looking up the playerName).
+        shotID = databaseInstance.newShot(gameName, playerName)
+
+        # Then, the shoot method should find the object representing the cue ball (number 0).
+        # cueBall = table.cueBall(xvel, yvel)
+
+        # It should retrieve the the x and y values of the cue ball’s position, and store them in temporary
+        # variables.
+
+        for ball in table:
+            if (isinstance(ball, StillBall)) and ball.obj.still_ball.number==0:
+
+                cueBall = ball
+
+                xpos = cueBall.obj.rolling_ball.pos.x
+                ypos = cueBall.obj.rolling_ball.pos.y
+
+                # Then it should set the type attribute of the cue ball to phylib.ROLLING_BALL.
+                cueBall.type = phylib.PHYLIB_ROLLING_BALL
+
+                # Then it should set all of the attributes of the cue ball. Hint: use the following syntax:
+                # cue_ball.obj.rolling_ball.pos.x = xpos;
+                # Set the position attributes to the values that you stored in the temporary variables, the
+                # velocity attributes to the parameters passed to the method, and recalculate the acceleration
+                # parameters (as in A1, and A2).
+                cueBall.obj.rolling_ball.pos.x = xpos
+                cueBall.obj.rolling_ball.pos.y = ypos
+                cueBall.obj.rolling_ball.vel.x = xvel
+                cueBall.obj.rolling_ball.vel.y = yvel
+
+                rollingBallVel = Coordinate(float(xvel), float(yvel))
+                speedA = phylib.phylib_length(rollingBallVel)
+
+                AccX = 0.0
+                AccY = 0.0
+
+                if speedA > VEL_EPSILON:
+                    AccX = (-rollingBallVel.x / speedA) * DRAG
+                    AccY = (-rollingBallVel.y / speedA) * DRAG
+
+                cueBall.obj.rolling_ball.acc.x = AccX
+                cueBall.obj.rolling_ball.acc.y = AccY
+
+                # Don’t forget to set the number of the cue ball to 0.
+                cueBall.obj.rolling_ball.number = 0
+
+                # segmentTable.object=RollingBall(0, Coordinate(
+                # float(xpos), float(ypos)), rollingBallVel, Coordinate(AccX, AccY))
+
+        # Next, you will simulate the whole shot, which gives the table at the start of the shot
+        # followed by the table at the end of every segment.
+        shot = table.simulate()
+
+        def frames():
+            for segment in range(1, len(shot)):
+                table = shot[segment - 1]
+                segmentStart = table.time
+                segmentEnd = shot[segment].time
+
+                # You will use
+                # the method to determine the length of the segment (in seconds) – subtract the time at the
+                # beginning of the segment from the time at the end of the segment. Divide that time by the
+                # FRAME_RATE above and round it down to the nearest integer.
+                segmentLength = math.floor((segmentEnd-segmentStart)/FRAME_RATE)
+
+                # Start a loop that loops over those integers. Inside the loop, multiply the integer by the
+                # FRAME_RATE and pass it to the roll method (of the table at the start of the segment)
+                # to create a new Table object for the next frame.
+                for i in range(segmentLength):
+                    newTableObject = table.roll(i*FRAME_RATE)
+
+                    # Set the time of the returned table to the time of the beginning of the segment plus the time
+                    # that you passed to the roll method.
+                    newTableObject.time = segmentStart+i*FRAME_RATE
+                    yield newTableObject
+
+        # Save the tables to the database, and record them in the TableShot as well. They are all
+        # written in one transaction (see writeTables), with their TABLEIDs taken as they are
+        # inserted rather than looked up by TIME afterwards. A Database with segments set only
+        # keeps the segments, and makes the frames when they are read (see readFrame).
+        if databaseInstance.segments:
+            databaseInstance.writeSegments(shot, shotID)
+        else:
+            databaseInstance.writeTables(frames(), shotID)
\ No newline at end of file
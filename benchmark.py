@@ -0,0 +1,657 @@
+import io
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+import Physics
+
+################################################################################
+# Benchmarks for the simulation and storage code. Run them all with
+# "python3 benchmark.py", or some of them with "python3 benchmark.py threads".
+
+# the balls of a new game, as server.py sets them up
+RACK = [
+    (0, 675, 675),
+    (1, 675, 400.0),
+    (2, 645, 350.0),
+    (3, 705, 350.0),
+    (4, 675, 300.0),
+    (5, 615, 300.0),
+    (6, 735, 300.0),
+    (7, 645, 250.0),
+    (8, 705, 250.0),
+    (9, 585, 250.0),
+    (10, 765, 250.0),
+    (11, 675, 200.0),
+    (12, 615, 200.0),
+    (13, 735, 200.0),
+    (14, 555, 200.0),
+    (15, 795, 200.0),
+]
+
+
+def rack():
+    """
+    Returns a Table with the balls of a new game.
+    """
+    table = Physics.Table()
+    for number, x, y in RACK:
+        table += Physics.StillBall(number, Physics.Coordinate(x, y))
+    return table
+
+
+def velocities(count, seed=0):
+    """
+    Returns count random cue velocities, all aimed up the table at the rack.
+    """
+    generator = random.Random(seed)
+    return [(generator.uniform(-1500.0, 1500.0), generator.uniform(-4000.0, -500.0))
+            for i in range(count)]
+
+################################################################################
+
+
+def bench_threads(count=400, solver=Physics.SOLVER_STEP):
+    """
+    Simulates count break shots with Physics.simulate_shots on 1, 2, 4, ...
+    threads, up to the number of cores, and prints the shots per second.
+    """
+    table = rack()
+    jobs = [(table, velocity) for velocity in velocities(count)]
+    cores = os.cpu_count() or 1
+
+    print("threads: %d shots, %d cores" % (count, cores))
+    workers = 1
+    while True:
+        start = time.perf_counter()
+        Physics.simulate_shots(jobs, workers, solver)
+        elapsed = time.perf_counter() - start
+        print("  %2d threads: %8.1f shots/s" % (workers, count / elapsed))
+        if workers >= cores:
+            break
+        workers = min(2 * workers, cores)
+
+################################################################################
+
+
+def bench_batch(count=200):
+    """
+    Simulates count break shots with a Python loop over Table.segment and
+    then with Table.simulate_many (see phylib_batch_run in phylib.c), and
+    prints how much faster the batch is. The batch must give the same tables
+    to the last bit, so any difference is reported.
+    """
+    table = rack()
+    shots = velocities(count)
+
+    print("batch: %d shots" % count)
+    for name, solver in (("step", Physics.SOLVER_STEP), ("event", Physics.SOLVER_EVENT)):
+        start = time.perf_counter()
+        looped = []
+        for xvel, yvel in shots:
+            current = table.copy()
+            current.strike(xvel, yvel)
+            segments = [current]
+            while current is not None:
+                current = current.segment(solver)
+                segments.append(current)
+            looped.append(segments[:-1])
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = table.simulate_many(shots, solver)
+        batched = time.perf_counter() - start
+
+        differ = sum(len(segments) != len(batch[i]) or
+                     any(segment.balls() != other.balls() or segment.time != other.time
+                         for segment, other in zip(segments, batch[i]))
+                     for i, segments in enumerate(looped))
+        print("  %s: loop %.3f s, batch %.3f s, %.1fx faster, %d shots differ" %
+              (name, loop, batched, loop / batched, differ))
+
+################################################################################
+
+
+def bench_fixed(count=200):
+    """
+    Rolls a ball over a Hole added in the middle of the table, away from
+    every edge, count times with each solver and with a Batch, and prints
+    the time each takes. Every one must pocket the ball when it first
+    comes within a HOLE_RADIUS of the hole (when the broad phase for the
+    holes and cushions only looked near the edges, the step solver rolled
+    straight over it), so any shot that does not is reported.
+    """
+    hole = Physics.Coordinate(675.0, 1350.0)
+    table = Physics.Table()
+    table += Physics.Hole(hole)
+    table += Physics.RollingBall(0, Physics.Coordinate(675.0, 2000.0),
+                                 Physics.Coordinate(0.0, -1000.0),
+                                 Physics.Coordinate(0.0, Physics.DRAG))
+
+    # 1000 t - (DRAG / 2) t^2 = 2000 - 1350 - HOLE_RADIUS
+    gap = 2000.0 - hole.y - Physics.HOLE_RADIUS
+    pocketed = (1000.0 - (1000.0 ** 2 - 2.0 * Physics.DRAG * gap) ** 0.5) / Physics.DRAG
+
+    def missed(shot):
+        events = list(shot.events())[1:]
+        return (not events or events[0].reason != Physics.REASON_HOLE or
+                abs(events[0].time - pocketed) > Physics.SIM_RATE)
+
+    print("fixed: %d shots over a hole at (%.0f, %.0f), pocketed at %.4f s" %
+          (count, hole.x, hole.y, pocketed))
+    for name, solver in (("step", Physics.SOLVER_STEP), ("event", Physics.SOLVER_EVENT)):
+        start = time.perf_counter()
+        shots = [table.copy().simulate(solver) for i in range(count)]
+        elapsed = time.perf_counter() - start
+        print("  %-5s %8.1f us/shot  %d shots miss the hole" %
+              (name, 1e6 * elapsed / count, sum(map(missed, shots))))
+
+    start = time.perf_counter()
+    batch = Physics.Batch([table.copy() for i in range(count)])
+    batch.run()
+    elapsed = time.perf_counter() - start
+    print("  batch %8.1f us/shot  %d shots miss the hole" %
+          (1e6 * elapsed / count, sum(missed(batch[i]) for i in range(count))))
+
+################################################################################
+
+
+def bench_planner(angles=360):
+    """
+    Plans a break shot with Physics.plan_shot on 1, 2, 4, ... processes, up
+    to the number of cores, and prints the evaluations per second.
+    """
+    table = rack()
+    cores = os.cpu_count() or 1
+
+    print("planner: %d angles, %d cores" % (angles, cores))
+    workers = 1
+    while True:
+        result = Physics.plan_shot(table, angles, workers=workers)
+        print("  %2d processes: %8.1f evaluations/s (best %.2f)" %
+              (workers, result.rate, result.best.score))
+        if workers >= cores:
+            break
+        workers = min(2 * workers, cores)
+
+################################################################################
+
+
+def bench_memory(frames=1000):
+    """
+    Holds frames frames of a 16-ball break as Tables and as lists of
+    Physics.BallState, and prints the memory each takes, and what the frames
+    would take packed as Table.frames returns them.
+    """
+    table = rack()
+    table.strike(0.0, -2000.0)
+    shot = table.simulate()
+    rolling = shot[0]
+    times = [i * Physics.FRAME_RATE for i in range(frames)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tables = [rolling.roll(t) for t in times]
+    proxies = tracemalloc.get_traced_memory()[0] - before
+    # phylib mallocs the tables themselves, where tracemalloc can't see them;
+    # each one is a block of the shot's stride
+    blocks = shot.stride * len(tables)
+
+    before = tracemalloc.get_traced_memory()[0]
+    states = [table.balls() for table in tables]
+    balls = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print("memory: %d frames of %d balls" % (frames, len(states[0])))
+    print("  Tables:     %10d bytes (%d in phylib, %d in proxies)" %
+          (blocks + proxies, blocks, proxies))
+    print("  BallStates: %10d bytes" % balls)
+    print("  packed:     %10d bytes" %
+          (frames * len(states[0]) * Physics.FRAME_FIELDS * 8))
+
+################################################################################
+
+
+def bench_svg(frames=300):
+    """
+    Renders frames frames of a 16-ball break as one SVG per frame and as a
+    single Physics.write_frames_svg document, and prints the time and bytes
+    per frame of each.
+    """
+    table = rack()
+    table.strike(0.0, -2000.0)
+    rolling = table.simulate()[0]
+    tables = [rolling.roll(i * Physics.FRAME_RATE) for i in range(frames)]
+
+    start = time.perf_counter()
+    size = sum(len(table.svg()) for table in tables)
+    elapsed = time.perf_counter() - start
+    print("svg: %d frames of %d balls" % (frames, len(RACK)))
+    print("  one SVG per frame: %8.1f us/frame %8.1f bytes/frame" %
+          (1e6 * elapsed / frames, size / frames))
+
+    start = time.perf_counter()
+    document = io.StringIO()
+    Physics.write_frames_svg(document, tables)
+    elapsed = time.perf_counter() - start
+    print("  shared static:     %8.1f us/frame %8.1f bytes/frame" %
+          (1e6 * elapsed / frames, len(document.getvalue()) / frames))
+
+################################################################################
+
+
+def bench_stream(shots=20):
+    """
+    Encodes shots break shots as one SVG per frame, as one animated SVG
+    (Shot.svg) and as a frame stream (Shot.frame_stream), and prints the
+    time and bytes per shot of each, and the time to decode the streams.
+    Checks that the streams decode to the frames they were made from, and
+    so do the frames of a table with more than 255 balls and of one with
+    two balls that have the same number.
+    """
+    table = rack()
+    shots = [table.simulate_many([velocity])[0]
+             for velocity in velocities(shots)]
+    frames = sum(len(shot.all_frames()) for shot in shots)
+    print("stream: %d shots, %d frames" % (len(shots), frames))
+
+    def report(name, encode):
+        start = time.perf_counter()
+        size = sum(len(encode(shot)) for shot in shots)
+        elapsed = time.perf_counter() - start
+        print("  %-16s %8.2f ms/shot %10.1f bytes/shot" %
+              (name, 1e3 * elapsed / len(shots), size / len(shots)))
+
+    def frame_svgs(shot):
+        # what server.py used to write: a whole SVG for every frame
+        tables = [shot[segment - 1].roll(i * Physics.FRAME_RATE)
+                  for segment in range(1, len(shot))
+                  for i in range(shot[segment - 1].frame_count(shot[segment],
+                                                               Physics.FRAME_RATE))]
+        tables.append(shot[-1])
+        return "".join(table.svg() for table in tables)
+
+    report("SVG per frame", frame_svgs)
+    report("animated SVG", Physics.Shot.svg)
+    report("frame stream", Physics.Shot.frame_stream)
+
+    streams = [shot.frame_stream() for shot in shots]
+    start = time.perf_counter()
+    for stream in streams:
+        Physics.decode_frames(stream)
+    elapsed = time.perf_counter() - start
+    print("  %-16s %8.2f ms/shot" % ("decode stream", 1e3 * elapsed / len(shots)))
+
+    def same(frames):
+        rate, decoded = Physics.decode_frames(Physics.encode_frames(frames))
+        return decoded == [[(int(number), round(x * Physics.STREAM_SCALE) / Physics.STREAM_SCALE,
+                             round(y * Physics.STREAM_SCALE) / Physics.STREAM_SCALE)
+                            for number, x, y in frame] for frame in frames]
+
+    many = Physics.Table(300 + 10)
+    for i in range(300):
+        many += Physics.StillBall(i % 16, Physics.Coordinate(60.0 + 60.0 * (i % 20),
+                                                             60.0 + 60.0 * (i // 20)))
+    many.strike(0.0, 1000.0)
+    twins = Physics.Table()
+    twins += Physics.StillBall(0, Physics.Coordinate(400.0, 1000.0))
+    twins += Physics.RollingBall(0, Physics.Coordinate(900.0, 2000.0),
+                                 Physics.Coordinate(0.0, -500.0),
+                                 Physics.Coordinate(0.0, Physics.DRAG))
+    print("  frame streams decode to the same frames: %s" %
+          all(same(frames) for frames in [shot.all_frames() for shot in shots] +
+              [many.simulate().all_frames(), twins.simulate().all_frames()]))
+
+################################################################################
+
+
+def bench_export(shots=20, path="replay-benchmark.svg"):
+    """
+    Exports every frame of shots break shots to path with
+    Physics.export_replay on 1, 2, 4, ... processes, up to the number of
+    cores, and prints the frames per second, against rendering the same
+    frames one Table at a time with Table.ball_svg_parts.
+    """
+    table = rack()
+    shots = [table.simulate_many([velocity])[0]
+             for velocity in velocities(shots)]
+    cores = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    frames = 0
+    with open(path, "w") as fp:
+        fp.write(Physics.static_svg())
+        for shot in shots:
+            for segment in range(1, len(shot)):
+                begin = shot[segment - 1]
+                for i in range(begin.frame_count(shot[segment], Physics.FRAME_RATE)):
+                    fp.writelines(begin.roll(i * Physics.FRAME_RATE).ball_svg_parts())
+                    frames += 1
+            fp.writelines(shot[-1].ball_svg_parts())
+            frames += 1
+        fp.write(Physics.FOOTER)
+    elapsed = time.perf_counter() - start
+    print("export: %d shots, %d frames, %d cores" % (len(shots), frames, cores))
+    print("  one Table at a time: %8.1f frames/s" % (frames / elapsed))
+
+    workers = 1
+    while True:
+        start = time.perf_counter()
+        frames = Physics.export_replay(shots, path, workers=workers)
+        elapsed = time.perf_counter() - start
+        print("  %2d processes:        %8.1f frames/s" % (workers, frames / elapsed))
+        if workers >= cores:
+            break
+        workers = min(2 * workers, cores)
+    os.remove(path)
+
+################################################################################
+
+
+def persist_per_frame(database, tables, shotID):
+    """
+    Stores tables the way Game.shoot used to: an INSERT per ball and a commit
+    for every table, then a SELECT of its TABLEID by TIME and another commit.
+    """
+    for table in tables:
+        cur = database.db.cursor()
+        cur.execute("INSERT INTO TTable (TIME) VALUES (?)", (table.time,))
+        tableID = cur.lastrowid
+        for ball in table.balls():
+            if ball.state == Physics.phylib.PHYLIB_STILL_BALL:
+                cur.execute("INSERT INTO Ball (BALLNO, XPOS, YPOS) VALUES (?, ?, ?)",
+                            (ball.number, ball.x, ball.y))
+            else:
+                cur.execute("""INSERT INTO Ball (BALLNO, XPOS, YPOS, XVEL, YVEL)
+                            VALUES (?, ?, ?, ?, ?)""",
+                            (ball.number, ball.x, ball.y, ball.vx, ball.vy))
+            cur.execute("INSERT INTO BallTable (BALLID, TABLEID) VALUES (?, ?)",
+                        (cur.lastrowid, tableID))
+        database.db.commit()
+        cur.execute("SELECT TABLEID FROM TTABLE WHERE TIME = ?", (table.time,))
+        cur.execute("INSERT INTO TABLESHOT (TABLEID, SHOTID) VALUES (?, ?)",
+                    (cur.fetchone()[0], shotID))
+        database.db.commit()
+        cur.close()
+
+
+def shot_frames(shot):
+    """
+    Returns every frame of shot as a Table, with its time, as Game.shoot
+    makes them.
+    """
+    frames = []
+    for segment in range(1, len(shot)):
+        begin = shot[segment - 1]
+        for i in range(begin.frame_count(shot[segment], Physics.FRAME_RATE)):
+            frame = begin.roll(i * Physics.FRAME_RATE)
+            frame.time = begin.time + i * Physics.FRAME_RATE
+            frames.append(frame)
+    return frames
+
+
+def bench_persist(shots=3):
+    """
+    Stores every frame of shots break shots in a fresh phylib.db (in a
+    temporary directory) a frame at a time, as Game.shoot used to, and with
+    Database.writeTables, and prints the time per shot of each.
+    """
+    table = rack()
+    frames = [shot_frames(table.simulate_many([velocity])[0])
+              for velocity in velocities(shots)]
+    print("persist: %d shots, %d frames" % (shots, sum(map(len, frames))))
+
+    here = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name, persist in (("frame at a time", persist_per_frame),
+                                  ("writeTables", Physics.Database.writeTables)):
+                database = Physics.Database(reset=True)
+                database.createDB()
+                start = time.perf_counter()
+                for shotID, tables in enumerate(frames):
+                    persist(database, tables, shotID + 1)
+                elapsed = time.perf_counter() - start
+                database.close()
+                print("  %-16s %8.1f ms/shot" % (name, 1e3 * elapsed / shots))
+        finally:
+            os.chdir(here)
+
+################################################################################
+
+
+def bench_storage(shots=3):
+    """
+    Stores every frame of shots break shots in a fresh phylib.db (in a
+    temporary directory) with each kind of Database storage, and prints the
+    time to write them, the size of the database and the time to read them
+    all back with readTable; then migrates the row storage with packTables.
+    """
+    table = rack()
+    frames = [shot_frames(table.simulate_many([velocity])[0])
+              for velocity in velocities(shots)]
+    count = sum(map(len, frames))
+    print("storage: %d shots, %d frames" % (shots, count))
+
+    here = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name, storage, quantize in (("rows", Physics.STORAGE_ROWS, False),
+                                            ("packed", Physics.STORAGE_PACKED, False),
+                                            ("packed quantized", Physics.STORAGE_PACKED, True)):
+                database = Physics.Database(True, storage, quantize)
+                database.createDB()
+                start = time.perf_counter()
+                for shotID, tables in enumerate(frames):
+                    database.writeTables(tables, shotID + 1)
+                written = time.perf_counter() - start
+                start = time.perf_counter()
+                for tableID in range(count):
+                    database.readTable(tableID)
+                read = time.perf_counter() - start
+                database.close()
+                print("  %-16s write %7.1f ms/shot  read %6.1f us/table  %9d bytes" %
+                      (name, 1e3 * written / shots, 1e6 * read / count,
+                       os.path.getsize("phylib.db")))
+
+            database = Physics.Database(True)
+            database.createDB()
+            for shotID, tables in enumerate(frames):
+                database.writeTables(tables, shotID + 1)
+            start = time.perf_counter()
+            database.packTables()
+            elapsed = time.perf_counter() - start
+            database.close()
+            print("  packTables: %.1f ms, %d bytes after" %
+                  (1e3 * elapsed, os.path.getsize("phylib.db")))
+        finally:
+            os.chdir(here)
+
+
+def row_count(database):
+    """
+    Returns how many rows there are in all the tables that hold tables and
+    balls in database.
+    """
+    cur = database.db.cursor()
+    count = 0
+    for name in ("TTable", "Ball", "BallTable", "BallSpan", "TableBalls", "TableShot",
+                 "SegmentShot"):
+        cur.execute("SELECT COUNT(*) FROM %s" % name)
+        count += cur.fetchone()[0]
+    cur.close()
+    return count
+
+
+def bench_segments(shots=3):
+    """
+    Stores shots break shots in a fresh phylib.db (in a temporary directory)
+    frame by frame, as Game.shoot does, and with Database.writeSegments, and
+    prints the time to write them, the rows and bytes written, and the time
+    to read every frame back with readFrame. Checks that the frames read
+    back from the segments are exactly the ones Game.shoot makes.
+    """
+    table = rack()
+    simulated = [table.simulate_many([velocity])[0] for velocity in velocities(shots)]
+    frames = [frame for shot in simulated for frame in shot_frames(shot)]
+    print("segments: %d shots, %d segments, %d frames" %
+          (shots, sum(len(shot) - 1 for shot in simulated), len(frames)))
+
+    here = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name in ("frames", "segments"):
+                database = Physics.Database(reset=True, segments=name == "segments")
+                database.createDB()
+                start = time.perf_counter()
+                for shotID, shot in enumerate(simulated):
+                    if database.segments:
+                        database.writeSegments(shot, shotID + 1)
+                    else:
+                        database.writeTables(shot_frames(shot), shotID + 1)
+                written = time.perf_counter() - start
+
+                start = time.perf_counter()
+                read = [database.readFrame(shotID + 1, frame)
+                        for shotID in range(shots)
+                        for frame in range(database.frameCount(shotID + 1))]
+                elapsed = time.perf_counter() - start
+                rows = row_count(database)
+                database.close()
+                print("  %-8s write %7.1f ms/shot  %7d rows  %9d bytes  read %6.1f us/frame" %
+                      (name, 1e3 * written / shots, rows, os.path.getsize("phylib.db"),
+                       1e6 * elapsed / len(read)))
+
+            same = len(read) == len(frames) and all(
+                a.time == b.time and a.balls() == b.balls() for a, b in zip(read, frames))
+            print("  segments give the same frames as Game.shoot: %s" % same)
+        finally:
+            os.chdir(here)
+
+
+def bench_spans(shots=3):
+    """
+    Stores every frame of shots break shots in a fresh phylib.db (in a
+    temporary directory) with STORAGE_ROWS and with STORAGE_SPANS, and
+    prints the ball rows written for each (Ball and BallTable, or Ball and
+    BallSpan), the time to write them, the size of the database and the
+    time to read them all back with readTable. Checks that readTable gives
+    the same Tables from both.
+    """
+    table = rack()
+    frames = [shot_frames(table.simulate_many([velocity])[0])
+              for velocity in velocities(shots)]
+    count = sum(map(len, frames))
+    print("spans: %d shots, %d frames" % (shots, count))
+
+    here = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            read = {}
+            for storage in (Physics.STORAGE_ROWS, Physics.STORAGE_SPANS):
+                database = Physics.Database(True, storage)
+                database.createDB()
+                start = time.perf_counter()
+                for shotID, tables in enumerate(frames):
+                    database.writeTables(tables, shotID + 1)
+                written = time.perf_counter() - start
+                start = time.perf_counter()
+                read[storage] = [database.readTable(tableID) for tableID in range(count)]
+                elapsed = time.perf_counter() - start
+
+                cur = database.db.cursor()
+                rows = 0
+                for name in ("Ball", "BallTable", "BallSpan"):
+                    cur.execute("SELECT COUNT(*) FROM %s" % name)
+                    rows += cur.fetchone()[0]
+                cur.close()
+                database.close()
+                print("  %-5s write %7.1f ms/shot  %7d ball rows  %9d bytes  read %6.1f us/table" %
+                      (storage, 1e3 * written / shots, rows, os.path.getsize("phylib.db"),
+                       1e6 * elapsed / count))
+
+            same = all(a.time == b.time and a.balls() == b.balls()
+                       for a, b in zip(read[Physics.STORAGE_ROWS], read[Physics.STORAGE_SPANS]))
+            print("  readTable gives the same tables: %s" % same)
+        finally:
+            os.chdir(here)
+
+
+def bench_indexes(sizes=(1, 4, 16), samples=200, games=100):
+    """
+    Fills a fresh phylib.db (in a temporary directory) with size copies of
+    the frames of a break shot and size * games games, for each size in
+    sizes and each of STORAGE_ROWS and STORAGE_SPANS, once at schema
+    version 0 (no indexes) and once migrated to SCHEMA_VERSION, and prints
+    the time readTable and newShot take on samples random tables and
+    players.
+    """
+    table = rack()
+    frames = shot_frames(table.simulate_many(velocities(1))[0])
+    print("indexes: %d frames a copy, %d games a copy" % (len(frames), games))
+
+    here = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for size in sizes:
+                for storage in (Physics.STORAGE_ROWS, Physics.STORAGE_SPANS):
+                    for version in (0, Physics.SCHEMA_VERSION):
+                        database = Physics.Database(True, storage)
+                        database.createDB(version)
+                        for copy in range(size):
+                            database.writeTables(frames, copy + 1)
+                        for game in range(size * games):
+                            database.setGame("game %d" % game, "player %d" % (2 * game),
+                                             "player %d" % (2 * game + 1))
+
+                        generator = random.Random(size)
+                        tableIDs = [generator.randrange(size * len(frames))
+                                    for i in range(samples)]
+                        players = [generator.randrange(size * games) for i in range(samples)]
+
+                        start = time.perf_counter()
+                        for tableID in tableIDs:
+                            database.readTable(tableID)
+                        read = time.perf_counter() - start
+                        start = time.perf_counter()
+                        for game in players:
+                            database.newShot("game %d" % game, "player %d" % (2 * game))
+                        shot = time.perf_counter() - start
+                        database.close()
+                        print("  %6d tables  %-5s  version %d  readTable %8.1f us  "
+                              "newShot %8.1f us" %
+                              (size * len(frames), storage, version, 1e6 * read / samples,
+                               1e6 * shot / samples))
+        finally:
+            os.chdir(here)
+
+################################################################################
+
+
+BENCHMARKS = {
+    "threads": bench_threads,
+    "batch": bench_batch,
+    "fixed": bench_fixed,
+    "planner": bench_planner,
+    "memory": bench_memory,
+    "svg": bench_svg,
+    "stream": bench_stream,
+    "export": bench_export,
+    "persist": bench_persist,
+    "storage": bench_storage,
+    "segments": bench_segments,
+    "spans": bench_spans,
+    "indexes": bench_indexes,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -0,0 +1,62 @@
+// Decoder for the frame streams made by Physics.encode_frames (see STREAM_HEADER in
+// Physics.py for the format). decodeFrames takes the stream as an ArrayBuffer, e.g. from
+// fetch(...).then(response => response.arrayBuffer()), and returns
+// { rate: seconds per frame, frames: [ [ [number, x, y], ... ], ... ] }.
+
+var STREAM_MAGIC = "PHYF";
+var STREAM_VERSION = 2;
+var STREAM_SCALE = 10.0;
+var KEYFRAME = 0;
+var BALL_GONE = -2147483648;
+var STREAM_HEADER_SIZE = 15;
+var FRAME_HEADER_SIZE = 3;
+var STREAM_BALL_SIZE = 11;
+
+function decodeFrames( buffer )
+{
+    var view = new DataView( buffer );
+    var magic = String.fromCharCode( view.getUint8( 0 ), view.getUint8( 1 ),
+                                     view.getUint8( 2 ), view.getUint8( 3 ) );
+    if ( magic != STREAM_MAGIC || view.getUint8( 4 ) != STREAM_VERSION )
+    {
+        throw new Error( "not a frame stream" );
+    }
+    var rate = view.getFloat64( 7, true );
+
+    var frames = [];
+    // the balls of the frame, by slot (their place in the frame)
+    var balls = [];
+    var offset = STREAM_HEADER_SIZE;
+    while ( offset < view.byteLength )
+    {
+        var kind = view.getUint8( offset );
+        var count = view.getUint16( offset + 1, true );
+        offset += FRAME_HEADER_SIZE;
+        if ( kind == KEYFRAME )
+        {
+            balls = [];
+        }
+        for ( var i = 0; i < count; i++, offset += STREAM_BALL_SIZE )
+        {
+            var slot = view.getUint16( offset, true );
+            var number = view.getUint8( offset + 2 );
+            var x = view.getInt32( offset + 3, true );
+            var y = view.getInt32( offset + 7, true );
+            if ( x == BALL_GONE )
+            {
+                delete balls[slot];
+            }
+            else
+            {
+                balls[slot] = [ number, x / STREAM_SCALE, y / STREAM_SCALE ];
+            }
+        }
+        var frame = [];
+        balls.forEach( function( ball )
+        {
+            frame.push( ball );
+        } );
+        frames.push( frame );
+    }
+    return { rate: rate, frames: frames };
+}
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+import Physics
+
+################################################################################
+# Brings the schema of phylib.db up to Physics.SCHEMA_VERSION (see
+# Physics.MIGRATIONS), then moves its tables from Ball and BallTable rows into
+# packed TableBalls BLOBs (see Physics.STORAGE_PACKED). Run it with
+# "python3 migrate.py", or "python3 migrate.py --quantize" to store positions
+# and velocities to the nearest 1/Physics.PACKED_SCALE mm. server.py brings
+# the schema up to date when it starts, but only migrate.py packs tables.
+
+
+def main(arguments):
+    quantize = "--quantize" in arguments
+    if not os.path.exists("phylib.db"):
+        print("migrate: there is no phylib.db here")
+        return 1
+
+    before = os.path.getsize("phylib.db")
+    start = time.perf_counter()
+    database = Physics.Database()
+    version = database.schemaVersion()
+    database.createDB()
+    tables = database.packTables(quantize)
+    database.close()
+    elapsed = time.perf_counter() - start
+    after = os.path.getsize("phylib.db")
+
+    print("migrate: schema version %d -> %d" % (version, Physics.SCHEMA_VERSION))
+    print("migrate: packed %d tables in %.2f s%s" %
+          (tables, elapsed, " (quantized)" if quantize else ""))
+    print("  phylib.db: %d bytes -> %d bytes" % (before, after))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
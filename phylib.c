@@ -1,676 +1,2430 @@
-#include "phylib.h"
-#include <stdlib.h>
-#include <stdio.h>
-#include <string.h>
-#include <math.h>
-
-/**
- * This function will allocate memory for a new phylib_object,
- * set its type and transfer information.
- * It will return a pointer to the phylib_object or NULL
- */
-phylib_object *phylib_new_still_ball(unsigned char number, phylib_coord *pos)
-{
-
-    phylib_object *object = malloc(sizeof(phylib_object));
-
-    if (object == NULL)
-    {
-        return NULL;
-    }
-    if (pos == NULL)
-    {
-        free(object);
-        return NULL;
-    }
-    object->type = PHYLIB_STILL_BALL;
-    object->obj.still_ball.number = number;
-    object->obj.still_ball.pos = *pos;
-    return object;
-}
-
-/**
- * This function will allocate memory for a new phylib_object,
- * set its type and transfer information.
- * It will return a pointer to the phylib_object or NULL
- */
-phylib_object *phylib_new_rolling_ball(unsigned char number,
-                                       phylib_coord *pos,
-                                       phylib_coord *vel,
-                                       phylib_coord *acc)
-{
-
-    phylib_object *object = malloc(sizeof(phylib_object));
-
-    if (object == NULL)
-    {
-        return NULL;
-    }
-
-    if (pos == NULL || vel == NULL || acc == NULL)
-    {
-        free(object);
-        return NULL;
-    }
-
-    object->type = PHYLIB_ROLLING_BALL;
-    object->obj.rolling_ball.number = number;
-    object->obj.rolling_ball.pos = *pos;
-    object->obj.rolling_ball.vel = *vel;
-    object->obj.rolling_ball.acc = *acc;
-    return object;
-}
-
-/**
- * This function will allocate memory for a new phylib_object,
- * set its type and transfer information.
- * It will return a pointer to the phylib_object or NULL
- */
-phylib_object *phylib_new_hole(phylib_coord *pos)
-{
-
-    phylib_object *object = malloc(sizeof(phylib_object));
-
-    if (object == NULL)
-    {
-        return NULL;
-    }
-    if (pos == NULL)
-    {
-        free(object);
-        return NULL;
-    }
-
-    object->type = PHYLIB_HOLE;
-    object->obj.hole.pos = *pos;
-    return object;
-}
-
-/**
- * This function will allocate memory for a new phylib_object,
- * set its type and transfer information.
- * It will return a pointer to the phylib_object or NULL
- */
-phylib_object *phylib_new_hcushion(double y)
-{
-
-    phylib_object *object = malloc(sizeof(phylib_object));
-
-    if (object == NULL)
-    {
-        return NULL;
-    }
-
-    object->type = PHYLIB_HCUSHION;
-    object->obj.hcushion.y = y;
-    return object;
-}
-
-/**
- * This function will allocate memory for a new phylib_object,
- * set its type and transfer information.
- * It will return a pointer to the phylib_object or NULL
- */
-phylib_object *phylib_new_vcushion(double x)
-{
-
-    phylib_object *object = malloc(sizeof(phylib_object));
-
-    if (object == NULL)
-    {
-        return NULL;
-    }
-
-    object->type = PHYLIB_VCUSHION;
-    object->obj.vcushion.x = x;
-    return object;
-}
-
-/**
- * This function will allocate memory for a table. It will then assign the values of
- * its array elements to pointers to new objects created by the phylib_new_* functions.
- */
-phylib_table *phylib_new_table(void)
-{
-
-    phylib_table *table = malloc(sizeof(phylib_table));
-
-    if (table == NULL)
-    {
-        return NULL;
-    }
-
-    table->time = 0.0;
-
-    // 1) a horizontal cushion at y=0.0;
-    table->object[0] = phylib_new_hcushion(0.0);
-
-    // 2) a horizontal cushion at y=PHYLIB_TABLE_LENGTH;
-    table->object[1] = phylib_new_hcushion(PHYLIB_TABLE_LENGTH);
-
-    // 3) a vertical cushion at x=0.0;
-    table->object[2] = phylib_new_vcushion(0.0);
-
-    // 4) a vertical cushion at x=PHYLIB_TABLE_WIDTH;
-    table->object[3] = phylib_new_vcushion(PHYLIB_TABLE_WIDTH);
-
-    // 5) 6 holes: positioned in the four corners where the cushions meet
-    // and two more midway between the top holes and bottom holes.
-    phylib_coord coord = phylib_new_coord(0.0, 0.0);
-    table->object[4] = phylib_new_hole(&coord);
-    phylib_coord coord2 = phylib_new_coord(0.0, PHYLIB_TABLE_LENGTH / 2);
-    table->object[5] = phylib_new_hole(&coord2);
-    phylib_coord coord3 = phylib_new_coord(0.0, PHYLIB_TABLE_LENGTH);
-    table->object[6] = phylib_new_hole(&coord3);
-    phylib_coord coord4 = phylib_new_coord(PHYLIB_TABLE_WIDTH, 0.0);
-    table->object[7] = phylib_new_hole(&coord4);
-    phylib_coord coord5 = phylib_new_coord(PHYLIB_TABLE_WIDTH, PHYLIB_TABLE_LENGTH / 2);
-    table->object[8] = phylib_new_hole(&coord5);
-    phylib_coord coord6 = phylib_new_coord(PHYLIB_TABLE_WIDTH, PHYLIB_TABLE_LENGTH);
-    table->object[9] = phylib_new_hole(&coord6);
-
-    // The remaining pointers will all be set to NULL
-    for (int i = 10; i < PHYLIB_MAX_OBJECTS; i++)
-    {
-        table->object[i] = NULL;
-    }
-
-    return table;
-}
-
-/**
- * This function will allocate memory for a new phylib_coord and transfer the information
- * provided in the function parameters into the structure. It will return a phylib_coord.
- */
-phylib_coord phylib_new_coord(double x, double y)
-{
-    phylib_coord coord;
-    coord.x = x;
-    coord.y = y;
-    return coord;
-}
-
-/**
- * This function should allocate new memory for a phylib_object. Save the address of that
- * object at the location pointed to by dest, and copy over the contents of the object from the
- * location pointed to by src.
- */
-void phylib_copy_object(phylib_object **dest, phylib_object **src)
-{
-
-    if (dest == NULL)
-    {
-        return;
-    }
-
-    if (src == NULL || *src == NULL)
-    {
-        *dest = NULL;
-        return;
-    }
-
-    *dest = malloc(sizeof(phylib_object));
-    if (*dest != NULL)
-    {
-        memcpy(*dest, *src, sizeof(phylib_object));
-    }
-    return;
-}
-
-/**
- * This function should allocate memory for a new phylib_table, returning NULL if the malloc
- * fails. Then the contents pointed to by table should be copied to the new memory location and
- * the address returned.
- */
-phylib_table *phylib_copy_table(phylib_table *table)
-{
-
-    if (table == NULL)
-    {
-        return NULL;
-    }
-
-    phylib_table *copiedTable = malloc(sizeof(phylib_table));
-
-    if (copiedTable == NULL)
-    {
-        return NULL;
-    }
-
-    copiedTable->time = table->time;
-
-    for (int i = 0; i < PHYLIB_MAX_OBJECTS; ++i)
-    {
-        phylib_copy_object(&(copiedTable->object[i]), &(table->object[i]));
-    }
-
-    return copiedTable;
-}
-
-/**
- * This function should iterate over the object array in the table until it finds a NULL pointer. It
- * should then assign that pointer to be equal to the address of object. If there are no NULL
- * pointers in the array, the function should do nothing.
- */
-void phylib_add_object(phylib_table *table, phylib_object *object)
-{
-
-    for (int i = 0; i < PHYLIB_MAX_OBJECTS; i++)
-    {
-        if (table->object[i] == NULL)
-        {
-            table->object[i] = object;
-            break;
-        }
-    }
-    return;
-}
-
-/**
- * This function should free every non- NULL pointer in the object array of table. It should then
- * also free table as well.
- */
-void phylib_free_table(phylib_table *table)
-{
-    for (int i = 0; i < PHYLIB_MAX_OBJECTS; i++)
-    {
-        free(table->object[i]);
-        table->object[i] = NULL;
-    }
-    free(table);
-    return;
-}
-
-/**
- * This function should return the difference between c1 and c2. That is the result’s x value
- * should be c1.x-c2.x and similarly for y.
- */
-phylib_coord phylib_sub(phylib_coord c1, phylib_coord c2)
-{
-    phylib_coord coord;
-    coord.x = c1.x - c2.x;
-    coord.y = c1.y - c2.y;
-    return coord;
-}
-
-/**
- * This function should return the length of the vector/coordinate c. You can calculate this length
- * by using Pythagorean theorem.
- */
-double phylib_length(phylib_coord c)
-{
-    if (c.x * c.x + c.y * c.y >= 0)
-    {
-        return sqrt(c.x * c.x + c.y * c.y);
-    }
-    return 0;
-}
-
-/**
- * This function should compute the dot-product between two vectors. Hint: the dot product is
- * equal to the sum of: the product of the x-values and the product of the y-values.
- */
-double phylib_dot_product(phylib_coord a, phylib_coord b)
-{
-    return a.x * b.x + a.y * b.y;
-}
-
-/**
- * This function should calculate the distance between two objects, obj1 and obj2. obj1 must be
- * a PHYLIB_ROLLING_BALL.
- */
-double phylib_distance(phylib_object *obj1, phylib_object *obj2)
-{
-
-    if (obj1->type != PHYLIB_ROLLING_BALL)
-    {
-        return -1.0;
-    }
-
-    double distance;
-    phylib_coord coord;
-
-    switch (obj2->type)
-    {
-
-        // 1) If obj2 is another BALL ( ROLLING or STILL), then compute the distance between the
-        // centres of the two balls and subtract two radii (i.e. one PHYLIB_BALL_DIAMETER)
-    case PHYLIB_STILL_BALL:
-        coord = phylib_sub(obj1->obj.rolling_ball.pos, obj2->obj.still_ball.pos);
-        distance = phylib_length(coord);
-        distance -= PHYLIB_BALL_DIAMETER;
-        break;
-    case PHYLIB_ROLLING_BALL:
-        coord = phylib_sub(obj1->obj.rolling_ball.pos, obj2->obj.rolling_ball.pos);
-        distance = phylib_length(coord);
-        distance -= PHYLIB_BALL_DIAMETER;
-        break;
-
-        // 2) If obj2 is a HOLE, then compute the distance between the centre of the ball and the
-        // hole and subtract the HOLE_RADIUS.
-    case PHYLIB_HOLE:
-        coord = phylib_sub(obj1->obj.rolling_ball.pos, obj2->obj.hole.pos);
-        distance = phylib_length(coord);
-        distance -= PHYLIB_HOLE_RADIUS;
-        break;
-
-        // If obj2 is a CUSHION calculate the distance between the centre of the ball and the
-        // CUSION and subtract the BALL_RADIUS. Hint: use fabs since the ball might be left/above
-        // or right/below to CUSHION.
-    case PHYLIB_HCUSHION:
-        
-        distance = fabs(obj1->obj.rolling_ball.pos.y-obj2->obj.hcushion.y);
-        distance -= PHYLIB_BALL_RADIUS;
-        break;
-    case PHYLIB_VCUSHION:
- 
-        distance = fabs(obj1->obj.rolling_ball.pos.x-obj2->obj.vcushion.x);
-        distance -= PHYLIB_BALL_RADIUS;
-        break;
-
-    default:
-        return -1.0;
-    }
-    return distance;
-}
-
-/**
- * This function updates a new phylib_object that represents the old phylib_object after it
- * has rolled for a period of time
- */
-void phylib_roll(phylib_object *new, phylib_object *old, double time)
-{
-
-    // If new and old are not PHYLIB_ROLLING_BALLs, then the function should do nothing.
-    if (new->type == PHYLIB_ROLLING_BALL && old->type == PHYLIB_ROLLING_BALL)
-    {
-
-        // p = p1 + v1t + (1/2)(a1t^2)
-        new->obj.rolling_ball.pos.x = old->obj.rolling_ball.pos.x + old->obj.rolling_ball.vel.x *time +
-                                      0.5 * old->obj.rolling_ball.acc.x *time *time;
-        new->obj.rolling_ball.pos.y = old->obj.rolling_ball.pos.y + old->obj.rolling_ball.vel.y *time +
-                                      0.5 * old->obj.rolling_ball.acc.y *time *time;
-
-        // v = v1 + a1t
-        new->obj.rolling_ball.vel.x = old->obj.rolling_ball.vel.x + old->obj.rolling_ball.acc.x *time;
-        new->obj.rolling_ball.vel.y = old->obj.rolling_ball.vel.y + old->obj.rolling_ball.acc.y *time;
-
-        // If either velocity changes sign, then that velocity and its corresponding acc
-        //( x, or y) must be set to zero (if both vel.s change sign,
-        // then both vel.s and both acc.s must be set to zero).
-        if ((old->obj.rolling_ball.vel.x < 0) != (new->obj.rolling_ball.vel.x < 0))
-        {
-            new->obj.rolling_ball.vel.x = 0;
-            new->obj.rolling_ball.acc.x = 0;
-        }
-        if ((old->obj.rolling_ball.vel.y < 0) != (new->obj.rolling_ball.vel.y < 0))
-        {
-            new->obj.rolling_ball.vel.y = 0;
-            new->obj.rolling_ball.acc.y = 0;
-        }
-    }
-
-    return;
-}
-
-/**
- * This function will check whether a ROLLING_BALL has stopped, and if it has, will convert it to a
- * STILL_BALL. You may assume that object is a ROLLING_BALL.
- */
-unsigned char phylib_stopped(phylib_object *object)
-{
-
-    if (object == NULL)
-    {
-        return 0;
-    }
-
-    // For the purposes of this simulation a ball is considered to have stopped if its speed
-    // (which is the length of its velocity) is less than PHYLIB_VEL_EPSILON.
-    if (phylib_length(object->obj.rolling_ball.vel) < PHYLIB_VEL_EPSILON)
-    {
-
-        // Do not assume that the number, and x and y positions of the rolling ball will be automatically
-        // transferred to the still ball.
-        object->type = PHYLIB_STILL_BALL;
-        object->obj.still_ball.number = object->obj.rolling_ball.number;
-        object->obj.still_ball.pos = object->obj.rolling_ball.pos;
-        return 1;
-    }
-
-    return 0;
-}
-
-/**
- * This is the most complicated function in the assignment but it can be handled by divide and
- * conquer based on the type of object b. You may assume that object a is a ROLLING_BALL.
- * Note that the two arguments to this function are double pointers. That is, they are pointers to
- * pointers to phylib_objectss.
- */
-void phylib_bounce(phylib_object **a, phylib_object **b)
-{
-
-    phylib_coord r_ab;
-
-    switch ((*b)->type)
-    {
-
-        // In this case the y velocity and y acceleration of a are reversed (negated). This is the
-        // physical principle of angle of incidence equals angle of reflection.
-    case PHYLIB_HCUSHION:
-        (*a)->obj.rolling_ball.vel.y = -1 * (*a)->obj.rolling_ball.vel.y;
-        (*a)->obj.rolling_ball.acc.y = -1 * (*a)->obj.rolling_ball.acc.y;
-        break;
-
-        // In this case the x velocity and x acceleration of a are reversed (negated). This is the
-        // physical principle of angle of incidence equals angle of reflection.
-    case PHYLIB_VCUSHION:
-        (*a)->obj.rolling_ball.vel.x = -1 * (*a)->obj.rolling_ball.vel.x;
-        (*a)->obj.rolling_ball.acc.x = -1 * (*a)->obj.rolling_ball.acc.x;
-        break;
-
-        // In this case, free the memory of a and set it to NULL. This represents the ball falling off
-        // the table.
-    case PHYLIB_HOLE:
-        free(*a);
-        *a = NULL;
-        break;
-
-        // In this case, “upgrade” the STILL_BALL to a ROLLING BALL and proceed directly to CASE
-        // 5 (do not collect $200). HINT: if you leave out the break statement at the end of a case
-        // condition, the code will continue with the next case.
-    case PHYLIB_STILL_BALL:
-        (*b)->type = PHYLIB_ROLLING_BALL;
-        (*b)->obj.rolling_ball.vel.x = 0;
-        (*b)->obj.rolling_ball.vel.y = 0;
-        (*b)->obj.rolling_ball.acc.x = 0;
-        (*b)->obj.rolling_ball.acc.y = 0;
-        (*b)->obj.rolling_ball.number = (*b)->obj.still_ball.number;
-        (*b)->obj.rolling_ball.pos = (*b)->obj.still_ball.pos;
-
-        // This one is a little bit tricky and will require us to calculate a few intermediate values
-        // before we can know the speeds and directions of the two balls after they collide.
-    case PHYLIB_ROLLING_BALL:
-
-        // Compute the position of a with respect to b: subtract the position of b from a
-        r_ab = phylib_sub((*a)->obj.rolling_ball.pos, (*b)->obj.rolling_ball.pos);
-
-        // Compute the relative velocity of a with respect to b: subtract the velocity of b from a
-        phylib_coord v_rel = phylib_sub((*a)->obj.rolling_ball.vel, (*b)->obj.rolling_ball.vel);
-
-        // Divide the x and y components of r_ab by the length of r_ab
-        double nx = r_ab.x / phylib_length(r_ab);
-        double ny = r_ab.y / phylib_length(r_ab);
-        phylib_coord n = phylib_new_coord(nx, ny);
-
-        // Calculate the ratio of the relative velocity, v_rel, in the direction of ball a by computing
-        // the dot_product of v_rel with respect to n
-        double v_rel_n = phylib_dot_product(v_rel, n);
-
-        // Update the x (and then y) velocity of ball a by subtracting v_rel_n multipied by the x (and then y) component of
-        // vector n
-        (*a)->obj.rolling_ball.vel.x -= v_rel_n * n.x;
-        (*a)->obj.rolling_ball.vel.y -= v_rel_n * n.y;
-
-        // Update the x and y velocities of ball b by adding the product of v_rel_n and vector n.
-        (*b)->obj.rolling_ball.vel.x += v_rel_n * n.x;
-        (*b)->obj.rolling_ball.vel.y += v_rel_n * n.y;
-
-        // Compute the speed of a and b as the lengths of their velocities
-        double speedA = phylib_length((*a)->obj.rolling_ball.vel);
-        double speedB = phylib_length((*b)->obj.rolling_ball.vel);
-
-        if (speedA > PHYLIB_VEL_EPSILON)
-        {
-            (*a)->obj.rolling_ball.acc.x = (-1 * ((*a)->obj.rolling_ball.vel.x) / speedA) * PHYLIB_DRAG;
-            (*a)->obj.rolling_ball.acc.y = (-1 * ((*a)->obj.rolling_ball.vel.y) / speedA) * PHYLIB_DRAG;
-        }
-
-        if (speedB > PHYLIB_VEL_EPSILON)
-        {
-            (*b)->obj.rolling_ball.acc.x = (-1 * ((*b)->obj.rolling_ball.vel.x) / speedB) * PHYLIB_DRAG;
-            (*b)->obj.rolling_ball.acc.y = (-1 * ((*b)->obj.rolling_ball.vel.y) / speedB) * PHYLIB_DRAG;
-        }
-        break;
-    default:
-        return;
-    }
-    return;
-}
-
-/**
- * This function should return the number of ROLLING_BALLS on the table.
- */
-unsigned char phylib_rolling(phylib_table *t)
-{
-    int rollingBallCount = 0;
-    if (t != NULL)
-    {
-        for (int i = 0; i < PHYLIB_MAX_OBJECTS; i++)
-        {
-            if (t->object[i] != NULL && t->object[i]->type == PHYLIB_ROLLING_BALL)
-            {
-                rollingBallCount++;
-            }
-        }
-    }
-
-    return rollingBallCount;
-}
-
-/**
- * This function should return a segment of a pool shot, as follows.
- */
-phylib_table *phylib_segment(phylib_table *table)
-{
-
-    if (phylib_rolling(table) == 0)
-    {
-        return NULL;
-    }
-
-    phylib_table *copiedTable = phylib_copy_table(table);
-
-    // The loop over the time should end if: 1) PHYLIB_MAX_TIME is reached
-    double time = PHYLIB_SIM_RATE;
-    
-    while (time <= PHYLIB_MAX_TIME) 
-            {
-                time += PHYLIB_SIM_RATE;
-
-        for (int i = 0; i < PHYLIB_MAX_OBJECTS; i++)
-        {
-
-            if (copiedTable->object[i] != NULL && copiedTable->object[i]->type == PHYLIB_ROLLING_BALL)
-            {
-
-                phylib_roll(copiedTable->object[i], table->object[i], time);
-            }
-        }
-
-        for (int i = 0; i < PHYLIB_MAX_OBJECTS; i++)
-        {
-
-            if (copiedTable->object[i] != NULL && copiedTable->object[i]->type == PHYLIB_ROLLING_BALL)
-            {
-
-                // 3) A ROLLING_BALL has stopped.
-                if (phylib_stopped(copiedTable->object[i]))
-                {
-                    copiedTable->time=table->time+time;
-                    return copiedTable;
-                }
-                for (int j = 0; j < PHYLIB_MAX_OBJECTS; j++)
-                {
-                    if (j != i)
-                    {
-
-                        phylib_object *obj2 = copiedTable->object[j];
-
-                        if (obj2 != NULL)
-                        {
-                            // 2) The phylib_distance between the ball and another phylib_object is less than 0.0.
-                            if (phylib_distance(copiedTable->object[i], obj2) < 0.0)
-                            {
-                                copiedTable->time=table->time+time;
-                                phylib_bounce(&(copiedTable->object[i]), &obj2);
-                                return copiedTable;
-                            }
-                            // printf("\n\n\n%lf\n%lf\n",time,phylib_distance(copiedTable->object[i], obj2));
-                        }
-                    }
-                }
-            }
-        }
-        
-    }
-    return copiedTable;
-}
-
-char *phylib_object_string(phylib_object *object)
-{
-    static char string[80];
-    if (object == NULL)
-    {
-        snprintf(string, 80, "NULL;");
-        return string;
-    }
-    switch (object->type)
-    {
-    case PHYLIB_STILL_BALL:
-        snprintf(string, 80,
-                 "STILL_BALL (%d,%6.1lf,%6.1lf)",
-                 object->obj.still_ball.number,
-                 object->obj.still_ball.pos.x,
-                 object->obj.still_ball.pos.y);
-        break;
-    case PHYLIB_ROLLING_BALL:
-        snprintf(string, 80,
-                 "ROLLING_BALL (%d,%6.1lf,%6.1lf,%6.1lf,%6.1lf,%6.1lf,%6.1lf)",
-                 object->obj.rolling_ball.number,
-                 object->obj.rolling_ball.pos.x,
-                 object->obj.rolling_ball.pos.y,
-                 object->obj.rolling_ball.vel.x,
-                 object->obj.rolling_ball.vel.y,
-                 object->obj.rolling_ball.acc.x,
-                 object->obj.rolling_ball.acc.y);
-        break;
-    case PHYLIB_HOLE:
-        snprintf(string, 80,
-                 "HOLE (%6.1lf,%6.1lf)",
-                 object->obj.hole.pos.x,
-                 object->obj.hole.pos.y);
-        break;
-    case PHYLIB_HCUSHION:
-        snprintf(string, 80,
-                 "HCUSHION (%6.1lf)",
-                 object->obj.hcushion.y);
-        break;
-    case PHYLIB_VCUSHION:
-        snprintf(string, 80,
-                 "VCUSHION (%6.1lf)",
-                 object->obj.vcushion.x);
-        break;
-    }
-    return string;
-}
+#include "phylib.h"
+#include <stdlib.h>
+#include <stdio.h>
+#include <string.h>
+#include <math.h>
+
+/**
+ * This function will allocate memory for a new phylib_object,
+ * set its type and transfer information.
+ * It will return a pointer to the phylib_object or NULL
+ */
+phylib_object *phylib_new_still_ball(unsigned char number, phylib_coord *pos)
+{
+
+    phylib_object *object = malloc(sizeof(phylib_object));
+
+    if (object == NULL)
+    {
+        return NULL;
+    }
+    if (pos == NULL)
+    {
+        free(object);
+        return NULL;
+    }
+    object->type = PHYLIB_STILL_BALL;
+    object->obj.still_ball.number = number;
+    object->obj.still_ball.pos = *pos;
+    return object;
+}
+
+/**
+ * This function will allocate memory for a new phylib_object,
+ * set its type and transfer information.
+ * It will return a pointer to the phylib_object or NULL
+ */
+phylib_object *phylib_new_rolling_ball(unsigned char number,
+                                       phylib_coord *pos,
+                                       phylib_coord *vel,
+                                       phylib_coord *acc)
+{
+
+    phylib_object *object = malloc(sizeof(phylib_object));
+
+    if (object == NULL)
+    {
+        return NULL;
+    }
+
+    if (pos == NULL || vel == NULL || acc == NULL)
+    {
+        free(object);
+        return NULL;
+    }
+
+    object->type = PHYLIB_ROLLING_BALL;
+    object->obj.rolling_ball.number = number;
+    object->obj.rolling_ball.pos = *pos;
+    object->obj.rolling_ball.vel = *vel;
+    object->obj.rolling_ball.acc = *acc;
+    return object;
+}
+
+/**
+ * This function will allocate memory for a new phylib_object,
+ * set its type and transfer information.
+ * It will return a pointer to the phylib_object or NULL
+ */
+phylib_object *phylib_new_hole(phylib_coord *pos)
+{
+
+    phylib_object *object = malloc(sizeof(phylib_object));
+
+    if (object == NULL)
+    {
+        return NULL;
+    }
+    if (pos == NULL)
+    {
+        free(object);
+        return NULL;
+    }
+
+    object->type = PHYLIB_HOLE;
+    object->obj.hole.pos = *pos;
+    return object;
+}
+
+/**
+ * This function will allocate memory for a new phylib_object,
+ * set its type and transfer information.
+ * It will return a pointer to the phylib_object or NULL
+ */
+phylib_object *phylib_new_hcushion(double y)
+{
+
+    phylib_object *object = malloc(sizeof(phylib_object));
+
+    if (object == NULL)
+    {
+        return NULL;
+    }
+
+    object->type = PHYLIB_HCUSHION;
+    object->obj.hcushion.y = y;
+    return object;
+}
+
+/**
+ * This function will allocate memory for a new phylib_object,
+ * set its type and transfer information.
+ * It will return a pointer to the phylib_object or NULL
+ */
+phylib_object *phylib_new_vcushion(double x)
+{
+
+    phylib_object *object = malloc(sizeof(phylib_object));
+
+    if (object == NULL)
+    {
+        return NULL;
+    }
+
+    object->type = PHYLIB_VCUSHION;
+    object->obj.vcushion.x = x;
+    return object;
+}
+
+/**
+ * This function returns the size of the single block that holds a table with room for capacity
+ * objects: the phylib_table itself, followed by its ball state arrays, the storage for its
+ * objects and its object pointers. The arrays of doubles come first so that every array in the
+ * block is aligned.
+ */
+static size_t phylib_table_size(unsigned int capacity)
+{
+    return sizeof(phylib_table) +
+           capacity * (3 * sizeof(phylib_coord) + sizeof(phylib_object) +
+                       sizeof(phylib_object *) + sizeof(phylib_obj) + sizeof(unsigned char));
+}
+
+/**
+ * This function points the arrays of a table at their places in the table's block.
+ */
+static void phylib_layout_table(phylib_table *table)
+{
+    unsigned int capacity = table->capacity;
+
+    table->pos = (phylib_coord *)(table + 1);
+    table->vel = table->pos + capacity;
+    table->acc = table->vel + capacity;
+    table->slot = (phylib_object *)(table->acc + capacity);
+    table->object = (phylib_object **)(table->slot + capacity);
+    table->type = (phylib_obj *)(table->object + capacity);
+    table->number = (unsigned char *)(table->type + capacity);
+}
+
+/**
+ * This function will allocate a table with room for capacity objects in a single block (see
+ * phylib_table_size). All of the object pointers are set to NULL.
+ */
+static phylib_table *phylib_alloc_table(unsigned int capacity)
+{
+
+    size_t size = phylib_table_size(capacity);
+    phylib_table *table = malloc(size);
+
+    if (table == NULL)
+    {
+        return NULL;
+    }
+
+    table->time = 0.0;
+    table->capacity = capacity;
+    phylib_layout_table(table);
+
+    memset(table->pos, 0, size - sizeof(phylib_table));
+    for (unsigned int i = 0; i < capacity; i++)
+    {
+        table->object[i] = NULL;
+        table->type[i] = PHYLIB_NO_OBJECT;
+    }
+
+    return table;
+}
+
+/**
+ * This function will allocate memory for a standard table of PHYLIB_MAX_OBJECTS objects.
+ */
+phylib_table *phylib_new_table(void)
+{
+    return phylib_new_sized_table(PHYLIB_MAX_OBJECTS);
+}
+
+/**
+ * This function will allocate memory for a table that can hold capacity objects. It will then
+ * assign the values of its first PHYLIB_FIXED_OBJECTS array elements to pointers to new objects
+ * created by the phylib_new_* functions. It returns NULL if capacity is too small to hold them.
+ */
+phylib_table *phylib_new_sized_table(unsigned int capacity)
+{
+
+    if (capacity < PHYLIB_FIXED_OBJECTS)
+    {
+        return NULL;
+    }
+
+    phylib_table *table = phylib_alloc_table(capacity);
+
+    if (table == NULL)
+    {
+        return NULL;
+    }
+
+    // The fixed objects are written straight into the table's own storage.
+    phylib_object object;
+
+    // 1) a horizontal cushion at y=0.0;
+    object.type = PHYLIB_HCUSHION;
+    object.obj.hcushion.y = 0.0;
+    phylib_place_object(table, &object);
+
+    // 2) a horizontal cushion at y=PHYLIB_TABLE_LENGTH;
+    object.obj.hcushion.y = PHYLIB_TABLE_LENGTH;
+    phylib_place_object(table, &object);
+
+    // 3) a vertical cushion at x=0.0;
+    object.type = PHYLIB_VCUSHION;
+    object.obj.vcushion.x = 0.0;
+    phylib_place_object(table, &object);
+
+    // 4) a vertical cushion at x=PHYLIB_TABLE_WIDTH;
+    object.obj.vcushion.x = PHYLIB_TABLE_WIDTH;
+    phylib_place_object(table, &object);
+
+    // 5) 6 holes: positioned in the four corners where the cushions meet
+    // and two more midway between the top holes and bottom holes.
+    object.type = PHYLIB_HOLE;
+    for (int i = 0; i < 6; i++)
+    {
+        object.obj.hole.pos = phylib_new_coord((i < 3) ? 0.0 : PHYLIB_TABLE_WIDTH,
+                                               (i % 3) * PHYLIB_TABLE_LENGTH / 2);
+        phylib_place_object(table, &object);
+    }
+
+    // The remaining pointers were all set to NULL by phylib_alloc_table
+    phylib_load_state(table);
+
+    return table;
+}
+
+/**
+ * This function will allocate memory for a new phylib_coord and transfer the information
+ * provided in the function parameters into the structure. It will return a phylib_coord.
+ */
+phylib_coord phylib_new_coord(double x, double y)
+{
+    phylib_coord coord;
+    coord.x = x;
+    coord.y = y;
+    return coord;
+}
+
+/**
+ * This function should allocate new memory for a phylib_object. Save the address of that
+ * object at the location pointed to by dest, and copy over the contents of the object from the
+ * location pointed to by src.
+ */
+void phylib_copy_object(phylib_object **dest, phylib_object **src)
+{
+
+    if (dest == NULL)
+    {
+        return;
+    }
+
+    if (src == NULL || *src == NULL)
+    {
+        *dest = NULL;
+        return;
+    }
+
+    *dest = malloc(sizeof(phylib_object));
+    if (*dest != NULL)
+    {
+        memcpy(*dest, *src, sizeof(phylib_object));
+    }
+    return;
+}
+
+/**
+ * This function should allocate memory for a new phylib_table, returning NULL if the malloc
+ * fails. Then the contents pointed to by table should be copied to the new memory location and
+ * the address returned. The objects live inside the table's block, so this is one malloc and
+ * one memcpy.
+ */
+phylib_table *phylib_copy_table(phylib_table *table)
+{
+
+    if (table == NULL)
+    {
+        return NULL;
+    }
+
+    phylib_table *copiedTable = malloc(phylib_table_size(table->capacity));
+
+    if (copiedTable == NULL)
+    {
+        return NULL;
+    }
+
+    phylib_copy_table_into(copiedTable, table);
+
+    return copiedTable;
+}
+
+/**
+ * This function copies the contents of table into dest, which must have the same capacity, and
+ * points dest's objects at its own storage.
+ */
+void phylib_copy_table_into(phylib_table *dest, phylib_table *table)
+{
+    memcpy(dest, table, phylib_table_size(table->capacity));
+    phylib_layout_table(dest);
+
+    for (unsigned int i = 0; i < dest->capacity; ++i)
+    {
+        if (table->object[i] != NULL)
+        {
+            dest->object[i] = &dest->slot[i];
+        }
+    }
+}
+
+/**
+ * This function should iterate over the object array in the table until it finds a NULL pointer. It
+ * should then copy object into the table's storage for that slot and free object, since the table
+ * takes over the object. If there are no NULL pointers in the array, the function should do
+ * nothing (and the object is not freed).
+ */
+void phylib_add_object(phylib_table *table, phylib_object *object)
+{
+
+    if (object != NULL && phylib_place_object(table, object) >= 0)
+    {
+        free(object);
+    }
+    return;
+}
+
+/**
+ * This function copies object into the first empty slot of the table and returns the slot's
+ * index, or -1 if the table is full. The caller keeps ownership of object.
+ */
+int phylib_place_object(phylib_table *table, const phylib_object *object)
+{
+
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        if (table->object[i] == NULL)
+        {
+            table->slot[i] = *object;
+            table->object[i] = &table->slot[i];
+            return i;
+        }
+    }
+    return -1;
+}
+
+/**
+ * This function should free the table. Its objects are stored inside the table's block, so they
+ * go with it.
+ */
+void phylib_free_table(phylib_table *table)
+{
+    free(table);
+    return;
+}
+
+/**
+ * This function copies the type, number, position, velocity and acceleration of every ball on
+ * the table from its phylib_object into the table's ball state arrays. Slots that hold something
+ * other than a ball only have their type recorded (PHYLIB_NO_OBJECT if they are empty), and
+ * their number, position, velocity and acceleration are zero.
+ */
+void phylib_load_state(phylib_table *table)
+{
+    phylib_coord zero = phylib_new_coord(0.0, 0.0);
+
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        phylib_object *object = table->object[i];
+
+        table->type[i] = object == NULL ? PHYLIB_NO_OBJECT : object->type;
+        table->number[i] = 0;
+        table->pos[i] = zero;
+        table->vel[i] = zero;
+        table->acc[i] = zero;
+
+        switch (table->type[i])
+        {
+        case PHYLIB_STILL_BALL:
+            table->number[i] = object->obj.still_ball.number;
+            table->pos[i] = object->obj.still_ball.pos;
+            break;
+        case PHYLIB_ROLLING_BALL:
+            table->number[i] = object->obj.rolling_ball.number;
+            table->pos[i] = object->obj.rolling_ball.pos;
+            table->vel[i] = object->obj.rolling_ball.vel;
+            table->acc[i] = object->obj.rolling_ball.acc;
+            break;
+        default:
+            break;
+        }
+    }
+}
+
+/**
+ * This function copies the positions of the balls, and the velocities and accelerations of the
+ * ROLLING_BALLs, from the table's ball state arrays back into their phylib_objects.
+ */
+void phylib_store_state(phylib_table *table)
+{
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        phylib_object *object = table->object[i];
+        if (object == NULL)
+        {
+            continue;
+        }
+
+        switch (object->type)
+        {
+        case PHYLIB_STILL_BALL:
+            object->obj.still_ball.pos = table->pos[i];
+            break;
+        case PHYLIB_ROLLING_BALL:
+            object->obj.rolling_ball.pos = table->pos[i];
+            object->obj.rolling_ball.vel = table->vel[i];
+            object->obj.rolling_ball.acc = table->acc[i];
+            break;
+        default:
+            break;
+        }
+    }
+}
+
+/**
+ * This function should return the difference between c1 and c2. That is the result’s x value
+ * should be c1.x-c2.x and similarly for y.
+ */
+phylib_coord phylib_sub(phylib_coord c1, phylib_coord c2)
+{
+    phylib_coord coord;
+    coord.x = c1.x - c2.x;
+    coord.y = c1.y - c2.y;
+    return coord;
+}
+
+/**
+ * This function should return the length of the vector/coordinate c. You can calculate this length
+ * by using Pythagorean theorem.
+ */
+double phylib_length(phylib_coord c)
+{
+    if (c.x * c.x + c.y * c.y >= 0)
+    {
+        return sqrt(c.x * c.x + c.y * c.y);
+    }
+    return 0;
+}
+
+/**
+ * This function should compute the dot-product between two vectors. Hint: the dot product is
+ * equal to the sum of: the product of the x-values and the product of the y-values.
+ */
+double phylib_dot_product(phylib_coord a, phylib_coord b)
+{
+    return a.x * b.x + a.y * b.y;
+}
+
+/**
+ * This function should calculate the distance between two objects, obj1 and obj2. obj1 must be
+ * a PHYLIB_ROLLING_BALL.
+ */
+double phylib_distance(phylib_object *obj1, phylib_object *obj2)
+{
+
+    if (obj1->type != PHYLIB_ROLLING_BALL)
+    {
+        return -1.0;
+    }
+
+    double distance;
+    phylib_coord coord;
+
+    switch (obj2->type)
+    {
+
+        // 1) If obj2 is another BALL ( ROLLING or STILL), then compute the distance between the
+        // centres of the two balls and subtract two radii (i.e. one PHYLIB_BALL_DIAMETER)
+    case PHYLIB_STILL_BALL:
+        coord = phylib_sub(obj1->obj.rolling_ball.pos, obj2->obj.still_ball.pos);
+        distance = phylib_length(coord);
+        distance -= PHYLIB_BALL_DIAMETER;
+        break;
+    case PHYLIB_ROLLING_BALL:
+        coord = phylib_sub(obj1->obj.rolling_ball.pos, obj2->obj.rolling_ball.pos);
+        distance = phylib_length(coord);
+        distance -= PHYLIB_BALL_DIAMETER;
+        break;
+
+        // 2) If obj2 is a HOLE, then compute the distance between the centre of the ball and the
+        // hole and subtract the HOLE_RADIUS.
+    case PHYLIB_HOLE:
+        coord = phylib_sub(obj1->obj.rolling_ball.pos, obj2->obj.hole.pos);
+        distance = phylib_length(coord);
+        distance -= PHYLIB_HOLE_RADIUS;
+        break;
+
+        // If obj2 is a CUSHION calculate the distance between the centre of the ball and the
+        // CUSION and subtract the BALL_RADIUS. Hint: use fabs since the ball might be left/above
+        // or right/below to CUSHION.
+    case PHYLIB_HCUSHION:
+        
+        distance = fabs(obj1->obj.rolling_ball.pos.y-obj2->obj.hcushion.y);
+        distance -= PHYLIB_BALL_RADIUS;
+        break;
+    case PHYLIB_VCUSHION:
+ 
+        distance = fabs(obj1->obj.rolling_ball.pos.x-obj2->obj.vcushion.x);
+        distance -= PHYLIB_BALL_RADIUS;
+        break;
+
+    default:
+        return -1.0;
+    }
+    return distance;
+}
+
+/**
+ * This function computes the position, velocity and acceleration of a rolling ball that started
+ * with position p1, velocity v1 and acceleration a1 and has rolled for a period of time. It is
+ * shared by phylib_roll and the simulation, which keeps its balls in the table's state arrays.
+ */
+static void phylib_roll_state(phylib_coord *pos, phylib_coord *vel, phylib_coord *acc,
+                              phylib_coord p1, phylib_coord v1, phylib_coord a1, double time)
+{
+
+    // p = p1 + v1t + (1/2)(a1t^2)
+    pos->x = p1.x + v1.x *time + 0.5 * a1.x *time *time;
+    pos->y = p1.y + v1.y *time + 0.5 * a1.y *time *time;
+
+    // v = v1 + a1t
+    vel->x = v1.x + a1.x *time;
+    vel->y = v1.y + a1.y *time;
+
+    // If either velocity changes sign, then that velocity and its corresponding acc
+    //( x, or y) must be set to zero (if both vel.s change sign,
+    // then both vel.s and both acc.s must be set to zero).
+    if ((v1.x < 0) != (vel->x < 0))
+    {
+        vel->x = 0;
+        acc->x = 0;
+    }
+    if ((v1.y < 0) != (vel->y < 0))
+    {
+        vel->y = 0;
+        acc->y = 0;
+    }
+}
+
+/**
+ * This function updates a new phylib_object that represents the old phylib_object after it
+ * has rolled for a period of time
+ */
+void phylib_roll(phylib_object *new, phylib_object *old, double time)
+{
+
+    // If new and old are not PHYLIB_ROLLING_BALLs, then the function should do nothing.
+    if (new->type == PHYLIB_ROLLING_BALL && old->type == PHYLIB_ROLLING_BALL)
+    {
+        phylib_roll_state(&new->obj.rolling_ball.pos,
+                          &new->obj.rolling_ball.vel,
+                          &new->obj.rolling_ball.acc,
+                          old->obj.rolling_ball.pos,
+                          old->obj.rolling_ball.vel,
+                          old->obj.rolling_ball.acc,
+                          time);
+    }
+
+    return;
+}
+
+/**
+ * This function will check whether a ROLLING_BALL has stopped, and if it has, will convert it to a
+ * STILL_BALL. You may assume that object is a ROLLING_BALL.
+ */
+unsigned char phylib_stopped(phylib_object *object)
+{
+
+    if (object == NULL)
+    {
+        return 0;
+    }
+
+    // For the purposes of this simulation a ball is considered to have stopped if its speed
+    // (which is the length of its velocity) is less than PHYLIB_VEL_EPSILON.
+    if (phylib_length(object->obj.rolling_ball.vel) < PHYLIB_VEL_EPSILON)
+    {
+
+        // Do not assume that the number, and x and y positions of the rolling ball will be automatically
+        // transferred to the still ball.
+        object->type = PHYLIB_STILL_BALL;
+        object->obj.still_ball.number = object->obj.rolling_ball.number;
+        object->obj.still_ball.pos = object->obj.rolling_ball.pos;
+        return 1;
+    }
+
+    return 0;
+}
+
+/**
+ * This is the most complicated function in the assignment but it can be handled by divide and
+ * conquer based on the type of object b. You may assume that object a is a ROLLING_BALL.
+ * Note that the two arguments to this function are double pointers. That is, they are pointers to
+ * pointers to phylib_objectss.
+ */
+void phylib_bounce(phylib_object **a, phylib_object **b)
+{
+
+    phylib_coord r_ab;
+
+    switch ((*b)->type)
+    {
+
+        // In this case the y velocity and y acceleration of a are reversed (negated). This is the
+        // physical principle of angle of incidence equals angle of reflection.
+    case PHYLIB_HCUSHION:
+        (*a)->obj.rolling_ball.vel.y = -1 * (*a)->obj.rolling_ball.vel.y;
+        (*a)->obj.rolling_ball.acc.y = -1 * (*a)->obj.rolling_ball.acc.y;
+        break;
+
+        // In this case the x velocity and x acceleration of a are reversed (negated). This is the
+        // physical principle of angle of incidence equals angle of reflection.
+    case PHYLIB_VCUSHION:
+        (*a)->obj.rolling_ball.vel.x = -1 * (*a)->obj.rolling_ball.vel.x;
+        (*a)->obj.rolling_ball.acc.x = -1 * (*a)->obj.rolling_ball.acc.x;
+        break;
+
+        // In this case, set a to NULL. This represents the ball falling off the table. The ball's
+        // memory belongs to the table it was on, so it is not freed here.
+    case PHYLIB_HOLE:
+        *a = NULL;
+        break;
+
+        // In this case, “upgrade” the STILL_BALL to a ROLLING BALL and proceed directly to CASE
+        // 5 (do not collect $200). HINT: if you leave out the break statement at the end of a case
+        // condition, the code will continue with the next case.
+    case PHYLIB_STILL_BALL:
+        (*b)->type = PHYLIB_ROLLING_BALL;
+        (*b)->obj.rolling_ball.vel.x = 0;
+        (*b)->obj.rolling_ball.vel.y = 0;
+        (*b)->obj.rolling_ball.acc.x = 0;
+        (*b)->obj.rolling_ball.acc.y = 0;
+        (*b)->obj.rolling_ball.number = (*b)->obj.still_ball.number;
+        (*b)->obj.rolling_ball.pos = (*b)->obj.still_ball.pos;
+
+        // This one is a little bit tricky and will require us to calculate a few intermediate values
+        // before we can know the speeds and directions of the two balls after they collide.
+    case PHYLIB_ROLLING_BALL:
+
+        // Compute the position of a with respect to b: subtract the position of b from a
+        r_ab = phylib_sub((*a)->obj.rolling_ball.pos, (*b)->obj.rolling_ball.pos);
+
+        // Compute the relative velocity of a with respect to b: subtract the velocity of b from a
+        phylib_coord v_rel = phylib_sub((*a)->obj.rolling_ball.vel, (*b)->obj.rolling_ball.vel);
+
+        // Divide the x and y components of r_ab by the length of r_ab
+        double nx = r_ab.x / phylib_length(r_ab);
+        double ny = r_ab.y / phylib_length(r_ab);
+        phylib_coord n = phylib_new_coord(nx, ny);
+
+        // Calculate the ratio of the relative velocity, v_rel, in the direction of ball a by computing
+        // the dot_product of v_rel with respect to n
+        double v_rel_n = phylib_dot_product(v_rel, n);
+
+        // Update the x (and then y) velocity of ball a by subtracting v_rel_n multipied by the x (and then y) component of
+        // vector n
+        (*a)->obj.rolling_ball.vel.x -= v_rel_n * n.x;
+        (*a)->obj.rolling_ball.vel.y -= v_rel_n * n.y;
+
+        // Update the x and y velocities of ball b by adding the product of v_rel_n and vector n.
+        (*b)->obj.rolling_ball.vel.x += v_rel_n * n.x;
+        (*b)->obj.rolling_ball.vel.y += v_rel_n * n.y;
+
+        // Compute the speed of a and b as the lengths of their velocities
+        double speedA = phylib_length((*a)->obj.rolling_ball.vel);
+        double speedB = phylib_length((*b)->obj.rolling_ball.vel);
+
+        if (speedA > PHYLIB_VEL_EPSILON)
+        {
+            (*a)->obj.rolling_ball.acc.x = (-1 * ((*a)->obj.rolling_ball.vel.x) / speedA) * PHYLIB_DRAG;
+            (*a)->obj.rolling_ball.acc.y = (-1 * ((*a)->obj.rolling_ball.vel.y) / speedA) * PHYLIB_DRAG;
+        }
+
+        if (speedB > PHYLIB_VEL_EPSILON)
+        {
+            (*b)->obj.rolling_ball.acc.x = (-1 * ((*b)->obj.rolling_ball.vel.x) / speedB) * PHYLIB_DRAG;
+            (*b)->obj.rolling_ball.acc.y = (-1 * ((*b)->obj.rolling_ball.vel.y) / speedB) * PHYLIB_DRAG;
+        }
+        break;
+    default:
+        return;
+    }
+    return;
+}
+
+/**
+ * This function should return the number of ROLLING_BALLS on the table.
+ */
+unsigned int phylib_rolling(phylib_table *t)
+{
+    unsigned int rollingBallCount = 0;
+    if (t != NULL)
+    {
+        for (unsigned int i = 0; i < t->capacity; i++)
+        {
+            if (t->object[i] != NULL && t->object[i]->type == PHYLIB_ROLLING_BALL)
+            {
+                rollingBallCount++;
+            }
+        }
+    }
+
+    return rollingBallCount;
+}
+
+/**
+ * This function returns phylib_distance between a ball at pos and the HOLE or CUSHION b.
+ */
+static double phylib_fixed_distance(phylib_coord pos, phylib_object *b)
+{
+    switch (b->type)
+    {
+    case PHYLIB_HOLE:
+        return phylib_length(phylib_sub(pos, b->obj.hole.pos)) - PHYLIB_HOLE_RADIUS;
+    case PHYLIB_HCUSHION:
+        return fabs(pos.y - b->obj.hcushion.y) - PHYLIB_BALL_RADIUS;
+    case PHYLIB_VCUSHION:
+        return fabs(pos.x - b->obj.vcushion.x) - PHYLIB_BALL_RADIUS;
+    default:
+        return -1.0;
+    }
+}
+
+/**
+ * This function is the broad phase for the stationary objects: it returns 1 if a ball at pos is
+ * close enough to the HOLE or CUSHION b that phylib_distance could be negative, using only
+ * comparisons against an axis-aligned box around b.
+ */
+static unsigned char phylib_near_fixed(phylib_coord pos, phylib_object *b)
+{
+    switch (b->type)
+    {
+    case PHYLIB_HOLE:
+        return fabs(pos.x - b->obj.hole.pos.x) < PHYLIB_HOLE_RADIUS &&
+               fabs(pos.y - b->obj.hole.pos.y) < PHYLIB_HOLE_RADIUS;
+    case PHYLIB_HCUSHION:
+        return fabs(pos.y - b->obj.hcushion.y) < PHYLIB_BALL_RADIUS;
+    case PHYLIB_VCUSHION:
+        return fabs(pos.x - b->obj.vcushion.x) < PHYLIB_BALL_RADIUS;
+    default:
+        return 1;
+    }
+}
+
+/**
+ * This function returns 1 if the HOLE or CUSHION b lies on the edge of the table, so that
+ * phylib_near_fixed is 0 for it for every ball at least a HOLE_RADIUS inside every edge.
+ */
+static unsigned char phylib_on_edge(phylib_object *b)
+{
+    switch (b->type)
+    {
+    case PHYLIB_HOLE:
+        return b->obj.hole.pos.x <= 0.0 || b->obj.hole.pos.x >= PHYLIB_TABLE_WIDTH ||
+               b->obj.hole.pos.y <= 0.0 || b->obj.hole.pos.y >= PHYLIB_TABLE_LENGTH;
+    case PHYLIB_HCUSHION:
+        return b->obj.hcushion.y <= PHYLIB_HOLE_RADIUS - PHYLIB_BALL_RADIUS ||
+               b->obj.hcushion.y >= PHYLIB_TABLE_LENGTH - PHYLIB_HOLE_RADIUS + PHYLIB_BALL_RADIUS;
+    case PHYLIB_VCUSHION:
+        return b->obj.vcushion.x <= PHYLIB_HOLE_RADIUS - PHYLIB_BALL_RADIUS ||
+               b->obj.vcushion.x >= PHYLIB_TABLE_WIDTH - PHYLIB_HOLE_RADIUS + PHYLIB_BALL_RADIUS;
+    default:
+        return 0;
+    }
+}
+
+/**
+ * This function returns 1 if slot i of the table holds a ROLLING_BALL.
+ */
+static unsigned char phylib_is_rolling(phylib_table *table, unsigned int i)
+{
+    return table->object[i] != NULL && table->object[i]->type == PHYLIB_ROLLING_BALL;
+}
+
+/**
+ * This function records in event that the segment of the table ended for reason, which happened
+ * to the ball in slot ball (or to no ball, if ball is -1) and involved the object in slot other
+ * (or nothing, if other is -1), and returns reason. It must be called before the ball bounces.
+ */
+static phylib_reason phylib_record_event(phylib_event *event, phylib_table *table,
+                                         phylib_reason reason, int ball, int other)
+{
+    event->reason = reason;
+    event->ball = ball;
+    event->other = other;
+    event->number = ball < 0 ? 0 : table->number[ball];
+    event->time = table->time;
+    event->pos = ball < 0 ? phylib_new_coord(0.0, 0.0) : table->pos[ball];
+    event->broad.tested = 0;
+    event->broad.avoided = 0;
+    return reason;
+}
+
+/**
+ * This function returns the reason a segment ends when a ball touches the object b.
+ */
+static phylib_reason phylib_contact_reason(phylib_object *b)
+{
+    switch (b->type)
+    {
+    case PHYLIB_HOLE:
+        return PHYLIB_REASON_HOLE;
+    case PHYLIB_HCUSHION:
+    case PHYLIB_VCUSHION:
+        return PHYLIB_REASON_CUSHION;
+    default:
+        return PHYLIB_REASON_BALL;
+    }
+}
+
+/**
+ * The scratch space of the step solver for one segment: the state of the balls at the start of
+ * the segment (p1, v1 and a1), which every step rolls from, the slots of the stationary objects
+ * (fixed) and of the balls sorted by y (balls), each ball's place in that order (rank), and
+ * whether every stationary object lies on the edge of the table (onEdge; see phylib_on_edge).
+ */
+typedef struct
+{
+    phylib_coord *p1;
+    phylib_coord *v1;
+    phylib_coord *a1;
+    unsigned int *fixed;
+    unsigned int *balls;
+    unsigned int *rank;
+    unsigned int fixedCount;
+    unsigned int ballCount;
+    unsigned char onEdge;
+} phylib_step_state;
+
+/**
+ * This function returns the number of bytes of scratch space the step solver needs for a table
+ * of the given capacity.
+ */
+static size_t phylib_step_size(unsigned int capacity)
+{
+    return capacity * (3 * sizeof(phylib_coord) + 3 * sizeof(unsigned int));
+}
+
+/**
+ * This function points the arrays of state into block, which holds phylib_step_size(capacity)
+ * bytes.
+ */
+static void phylib_layout_step(phylib_step_state *state, char *block, unsigned int capacity)
+{
+    state->p1 = (phylib_coord *)block;
+    state->v1 = state->p1 + capacity;
+    state->a1 = state->v1 + capacity;
+    state->fixed = (unsigned int *)(state->a1 + capacity);
+    state->balls = state->fixed + capacity;
+    state->rank = state->balls + capacity;
+}
+
+/**
+ * This function starts a segment of the table for the step solver: it loads the table's state
+ * arrays, keeps the state of the balls in state and splits the objects into the stationary ones
+ * (cushions and holes) and the balls.
+ */
+static void phylib_start_step(phylib_table *table, phylib_step_state *state)
+{
+    unsigned int n = table->capacity;
+
+    phylib_load_state(table);
+    memcpy(state->p1, table->pos, n * sizeof(phylib_coord));
+    memcpy(state->v1, table->vel, n * sizeof(phylib_coord));
+    memcpy(state->a1, table->acc, n * sizeof(phylib_coord));
+
+    // The balls are kept sorted by y (sweep and prune along the length of the table), so a
+    // rolling ball only gets the exact distance test against balls within one diameter of it in y.
+    state->fixedCount = 0;
+    state->ballCount = 0;
+    state->onEdge = 1;
+    for (unsigned int i = 0; i < n; i++)
+    {
+        if (table->object[i] == NULL)
+        {
+            continue;
+        }
+        if (table->type[i] == PHYLIB_STILL_BALL || table->type[i] == PHYLIB_ROLLING_BALL)
+        {
+            state->balls[state->ballCount++] = i;
+        }
+        else
+        {
+            state->fixed[state->fixedCount++] = i;
+            state->onEdge = state->onEdge && phylib_on_edge(table->object[i]);
+        }
+    }
+}
+
+/**
+ * This function rolls every ROLLING_BALL of the table, in its state arrays, to time seconds into
+ * the segment kept in state.
+ */
+static void phylib_roll_step(phylib_table *table, const phylib_step_state *state, double time)
+{
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        if (phylib_is_rolling(table, i))
+        {
+            phylib_roll_state(&table->pos[i], &table->vel[i], &table->acc[i],
+                              state->p1[i], state->v1[i], state->a1[i], time);
+        }
+    }
+}
+
+/**
+ * This function is one step of the step solver, time seconds into the segment that started at
+ * start: it rolls the balls and looks for the end of the segment, as described in
+ * phylib_segment. If the segment has ended, the balls are written back to their objects, the
+ * ball stops or bounces, and the reason is recorded in event and returned; otherwise it returns
+ * PHYLIB_REASON_NONE. The broad-phase counts of the step are added to counted.
+ */
+static phylib_reason phylib_check_step(phylib_table *table, phylib_step_state *state,
+                                       double start, double time, phylib_event *event,
+                                       phylib_broad_phase *counted)
+{
+    unsigned int n = table->capacity;
+    unsigned int *fixed = state->fixed;
+    unsigned int *balls = state->balls;
+    unsigned int *rank = state->rank;
+    unsigned int fixedCount = state->fixedCount;
+    unsigned int ballCount = state->ballCount;
+
+    phylib_roll_step(table, state, time);
+
+    // The balls barely move between steps, so an insertion sort is nearly linear here.
+    for (unsigned int k = 1; k < ballCount; k++)
+    {
+        unsigned int ball = balls[k];
+        double y = table->pos[ball].y;
+        unsigned int m = k;
+        while (m > 0 && table->pos[balls[m - 1]].y > y)
+        {
+            balls[m] = balls[m - 1];
+            m--;
+        }
+        balls[m] = ball;
+    }
+    for (unsigned int k = 0; k < ballCount; k++)
+    {
+        rank[balls[k]] = k;
+    }
+
+    for (unsigned int i = 0; i < n; i++)
+    {
+        if (!phylib_is_rolling(table, i))
+        {
+            continue;
+        }
+
+        // 3) A ROLLING_BALL has stopped.
+        if (phylib_length(table->vel[i]) < PHYLIB_VEL_EPSILON)
+        {
+            phylib_store_state(table);
+            phylib_stopped(table->object[i]);
+            table->time = start + time;
+            return phylib_record_event(event, table, PHYLIB_REASON_STOPPED, i, -1);
+        }
+
+        // 2) The phylib_distance between the ball and another phylib_object is less than 0.0.
+        // Of all the objects it overlaps, the ball bounces off the one with the lowest index.
+        phylib_coord pos = table->pos[i];
+        unsigned long checked = 0;
+        unsigned int hit = n;
+
+        // When the holes and cushions all lie on the edge of the table, as they do on the
+        // standard table, a ball further than a HOLE_RADIUS from every edge cannot touch any.
+        if (!state->onEdge || pos.x < PHYLIB_HOLE_RADIUS || pos.x > PHYLIB_TABLE_WIDTH - PHYLIB_HOLE_RADIUS ||
+            pos.y < PHYLIB_HOLE_RADIUS || pos.y > PHYLIB_TABLE_LENGTH - PHYLIB_HOLE_RADIUS)
+        {
+            for (unsigned int k = 0; k < fixedCount; k++)
+            {
+                phylib_object *obj2 = table->object[fixed[k]];
+                if (fixed[k] < hit && phylib_near_fixed(pos, obj2))
+                {
+                    checked++;
+                    if (phylib_fixed_distance(pos, obj2) < 0.0)
+                    {
+                        hit = fixed[k];
+                    }
+                }
+            }
+        }
+
+        // Walk outwards from the ball in y order until the gap in y is a diameter or more.
+        for (unsigned int k = rank[i]; k-- > 0;)
+        {
+            phylib_coord pos2 = table->pos[balls[k]];
+            if (pos.y - pos2.y >= PHYLIB_BALL_DIAMETER)
+            {
+                break;
+            }
+            if (balls[k] < hit && fabs(pos.x - pos2.x) < PHYLIB_BALL_DIAMETER)
+            {
+                checked++;
+                if (phylib_length(phylib_sub(pos, pos2)) - PHYLIB_BALL_DIAMETER < 0.0)
+                {
+                    hit = balls[k];
+                }
+            }
+        }
+        for (unsigned int k = rank[i] + 1; k < ballCount; k++)
+        {
+            phylib_coord pos2 = table->pos[balls[k]];
+            if (pos2.y - pos.y >= PHYLIB_BALL_DIAMETER)
+            {
+                break;
+            }
+            if (balls[k] < hit && fabs(pos.x - pos2.x) < PHYLIB_BALL_DIAMETER)
+            {
+                checked++;
+                if (phylib_length(phylib_sub(pos, pos2)) - PHYLIB_BALL_DIAMETER < 0.0)
+                {
+                    hit = balls[k];
+                }
+            }
+        }
+
+        counted->tested += checked;
+        counted->avoided += fixedCount + ballCount - 1 - checked;
+
+        if (hit < n)
+        {
+            phylib_object *obj2 = table->object[hit];
+            phylib_store_state(table);
+            table->time = start + time;
+            phylib_record_event(event, table, phylib_contact_reason(obj2), i, hit);
+            phylib_bounce(&(table->object[i]), &obj2);
+            return event->reason;
+        }
+    }
+    return PHYLIB_REASON_NONE;
+}
+
+/**
+ * This function advances the table in place to the end of its current segment by stepping time
+ * forward in PHYLIB_SIM_RATE increments, as described in phylib_segment, records what ended the
+ * segment in event and returns the reason. The balls are rolled in the table's state arrays and
+ * only written back to their objects when the segment ends. The scratch space it needs is sized
+ * by the table's capacity, so it is allocated on the heap, once for the whole segment; if that
+ * fails, the table is left as it was and the reason is PHYLIB_REASON_NONE.
+ */
+static phylib_reason phylib_step_table(phylib_table *table, phylib_event *event)
+{
+    char *block = malloc(phylib_step_size(table->capacity));
+
+    if (block == NULL)
+    {
+        return phylib_record_event(event, table, PHYLIB_REASON_NONE, -1, -1);
+    }
+
+    phylib_step_state state;
+    phylib_layout_step(&state, block, table->capacity);
+    phylib_start_step(table, &state);
+
+    double start = table->time;
+    phylib_broad_phase counted = {0, 0};
+    phylib_reason reason = PHYLIB_REASON_NONE;
+
+    // The loop over the time should end if: 1) PHYLIB_MAX_TIME is reached
+    double time = PHYLIB_SIM_RATE;
+
+    while (time <= PHYLIB_MAX_TIME && reason == PHYLIB_REASON_NONE)
+    {
+        time += PHYLIB_SIM_RATE;
+        reason = phylib_check_step(table, &state, start, time, event, &counted);
+    }
+
+    if (reason == PHYLIB_REASON_NONE)
+    {
+        phylib_store_state(table);
+        reason = phylib_record_event(event, table, PHYLIB_REASON_TIMEOUT, -1, -1);
+    }
+    event->broad = counted;
+    free(block);
+    return reason;
+}
+
+/**
+ * This function should return a segment of a pool shot, as follows.
+ */
+phylib_table *phylib_segment(phylib_table *table)
+{
+
+    if (phylib_rolling(table) == 0)
+    {
+        return NULL;
+    }
+
+    phylib_table *copiedTable = phylib_copy_table(table);
+
+    if (copiedTable != NULL)
+    {
+        phylib_advance(copiedTable, PHYLIB_SOLVER_STEP, NULL);
+    }
+    return copiedTable;
+}
+
+/**
+ * The functions below implement the PHYLIB_SOLVER_EVENT solver. Within a segment every ball
+ * moves along p = p1 + v1t + (1/2)(a1t^2), so the gap between a rolling ball and anything it
+ * can hit is a polynomial in t of degree 4 or less. Instead of stepping time forward, the
+ * solver finds the first time each of those polynomials becomes negative and jumps there.
+ */
+
+#define PHYLIB_POLY_DEGREE (4)
+
+/**
+ * This function evaluates the polynomial c[0] + c[1]t + ... + c[degree]t^degree at time t.
+ */
+static double phylib_poly_eval(const double *c, int degree, double t)
+{
+    double value = c[degree];
+    for (int k = degree - 1; k >= 0; k--)
+    {
+        value = value * t + c[k];
+    }
+    return value;
+}
+
+/**
+ * This function stores the roots of the polynomial c that lie strictly between lo and hi in
+ * roots, in increasing order, and returns how many there are. The roots of the derivative
+ * split [lo, hi] into pieces on which c is monotone, and each sign change is bisected.
+ */
+static int phylib_poly_roots(const double *c, int degree, double lo, double hi, double *roots)
+{
+    while (degree > 0 && c[degree] == 0.0)
+    {
+        degree--;
+    }
+    if (degree == 0)
+    {
+        return 0;
+    }
+    if (degree == 1)
+    {
+        double root = -c[0] / c[1];
+        if (root > lo && root < hi)
+        {
+            roots[0] = root;
+            return 1;
+        }
+        return 0;
+    }
+
+    double derivative[PHYLIB_POLY_DEGREE] = {0.0};
+    double critical[PHYLIB_POLY_DEGREE];
+    for (int k = 1; k <= degree; k++)
+    {
+        derivative[k - 1] = k * c[k];
+    }
+    int criticalCount = phylib_poly_roots(derivative, degree - 1, lo, hi, critical);
+
+    int count = 0;
+    double a = lo;
+    double fa = phylib_poly_eval(c, degree, a);
+    for (int i = 0; i <= criticalCount; i++)
+    {
+        double b = (i < criticalCount) ? critical[i] : hi;
+        double fb = phylib_poly_eval(c, degree, b);
+        if ((fa < 0.0) != (fb < 0.0))
+        {
+            double left = a, right = b;
+            double fleft = fa;
+            double mid = 0.5 * (left + right);
+            while (mid > left && mid < right)
+            {
+                if ((phylib_poly_eval(c, degree, mid) < 0.0) == (fleft < 0.0))
+                {
+                    left = mid;
+                }
+                else
+                {
+                    right = mid;
+                }
+                mid = 0.5 * (left + right);
+            }
+            // report the end of the bracket on which the polynomial is negative
+            roots[count++] = (fleft < 0.0) ? left : right;
+        }
+        a = b;
+        fa = fb;
+    }
+    return count;
+}
+
+/**
+ * This function returns the first time in [lo, hi] at which the polynomial c is negative, or
+ * -1.0 if there is none. If skip is set and c is already negative at lo, that first stretch
+ * is ignored and only a later return below zero counts.
+ */
+static double phylib_poly_first_negative(const double *c, int degree, double lo, double hi,
+                                         unsigned char skip)
+{
+    if (phylib_poly_eval(c, degree, lo) < 0.0 && !skip)
+    {
+        return lo;
+    }
+
+    double roots[PHYLIB_POLY_DEGREE];
+    int count = phylib_poly_roots(c, degree, lo, hi, roots);
+    for (int i = 0; i < count; i++)
+    {
+        // the roots alternate between entering and leaving the negative region, so an
+        // entering root is one where the polynomial is still non-negative just before it
+        double before = (i > 0) ? 0.5 * (roots[i - 1] + roots[i]) : lo;
+        if (phylib_poly_eval(c, degree, before) >= 0.0)
+        {
+            return roots[i];
+        }
+    }
+    return -1.0;
+}
+
+/**
+ * This function stores the coefficients of q(t)^2 in c, where q(t) = q0 + q1t + q2t^2.
+ */
+static void phylib_poly_square(double *c, double q0, double q1, double q2)
+{
+    c[0] += q0 * q0;
+    c[1] += 2 * q0 * q1;
+    c[2] += q1 * q1 + 2 * q0 * q2;
+    c[3] += 2 * q1 * q2;
+    c[4] += q2 * q2;
+}
+
+/**
+ * This function returns the first time in [0, limit] at which the gap polynomial c becomes
+ * negative. Objects that already overlap at time 0 only count as touching if they are still
+ * moving towards each other; otherwise they are left to separate.
+ */
+static double phylib_contact_time(const double *c, double limit)
+{
+    if (c[0] < 0.0 && c[1] < 0.0)
+    {
+        return 0.0;
+    }
+    return phylib_poly_first_negative(c, PHYLIB_POLY_DEGREE, 0.0, limit, c[0] < 0.0);
+}
+
+/**
+ * This function returns the time at which the ROLLING_BALL in slot i of the table first has
+ * phylib_distance < 0.0 to the object in slot j, or -1.0 if that does not happen before limit.
+ * Both balls are read from the table's state arrays, where a STILL_BALL has no velocity or
+ * acceleration.
+ */
+static double phylib_collision_time(phylib_table *table, unsigned int i, unsigned int j,
+                                    double limit)
+{
+    phylib_coord pos = table->pos[i];
+    phylib_coord vel = table->vel[i];
+    phylib_coord acc = table->acc[i];
+    phylib_object *b = table->object[j];
+    double c[PHYLIB_POLY_DEGREE + 1] = {0.0};
+
+    switch (b->type)
+    {
+    case PHYLIB_STILL_BALL:
+    case PHYLIB_ROLLING_BALL:
+        phylib_poly_square(c, pos.x - table->pos[j].x, vel.x - table->vel[j].x,
+                           0.5 * (acc.x - table->acc[j].x));
+        phylib_poly_square(c, pos.y - table->pos[j].y, vel.y - table->vel[j].y,
+                           0.5 * (acc.y - table->acc[j].y));
+        c[0] -= PHYLIB_BALL_DIAMETER * PHYLIB_BALL_DIAMETER;
+        break;
+    case PHYLIB_HOLE:
+        phylib_poly_square(c, pos.x - b->obj.hole.pos.x, vel.x, 0.5 * acc.x);
+        phylib_poly_square(c, pos.y - b->obj.hole.pos.y, vel.y, 0.5 * acc.y);
+        c[0] -= PHYLIB_HOLE_RADIUS * PHYLIB_HOLE_RADIUS;
+        break;
+    case PHYLIB_HCUSHION:
+        phylib_poly_square(c, pos.y - b->obj.hcushion.y, vel.y, 0.5 * acc.y);
+        c[0] -= PHYLIB_BALL_RADIUS * PHYLIB_BALL_RADIUS;
+        break;
+    case PHYLIB_VCUSHION:
+        phylib_poly_square(c, pos.x - b->obj.vcushion.x, vel.x, 0.5 * acc.x);
+        c[0] -= PHYLIB_BALL_RADIUS * PHYLIB_BALL_RADIUS;
+        break;
+    default:
+        return -1.0;
+    }
+    return phylib_contact_time(c, limit);
+}
+
+/**
+ * This function returns the time at which phylib_stopped would first report a ROLLING_BALL with
+ * velocity vel and acceleration acc as stopped, or -1.0 if that does not happen before limit.
+ * Like phylib_roll, each velocity component is held at zero once it changes sign, so the speed
+ * is piecewise quadratic with a break at each of those times.
+ */
+static double phylib_stop_time(phylib_coord vel, phylib_coord acc, double limit)
+{
+    // the times at which the x and y velocities change sign and are zeroed by phylib_roll
+    double flipX = ((acc.x < 0 && vel.x >= 0) || (acc.x > 0 && vel.x < 0)) ? -vel.x / acc.x : limit;
+    double flipY = ((acc.y < 0 && vel.y >= 0) || (acc.y > 0 && vel.y < 0)) ? -vel.y / acc.y : limit;
+    double breaks[3] = {fmin(flipX, flipY), fmax(flipX, flipY), limit};
+
+    double start = 0.0;
+    for (int i = 0; i < 3 && start < limit; i++)
+    {
+        double end = fmin(breaks[i], limit);
+        double c[3] = {-PHYLIB_VEL_EPSILON * PHYLIB_VEL_EPSILON, 0.0, 0.0};
+        if (start < flipX)
+        {
+            c[0] += vel.x * vel.x;
+            c[1] += 2 * vel.x * acc.x;
+            c[2] += acc.x * acc.x;
+        }
+        if (start < flipY)
+        {
+            c[0] += vel.y * vel.y;
+            c[1] += 2 * vel.y * acc.y;
+            c[2] += acc.y * acc.y;
+        }
+        double time = phylib_poly_first_negative(c, 2, start, end, 0);
+        if (time >= 0.0)
+        {
+            return time;
+        }
+        start = end;
+    }
+    return -1.0;
+}
+
+/**
+ * This function advances the table in place to the end of its current segment, like
+ * phylib_step_table, but finds the end of the segment by computing the time of every possible
+ * event (a ball stopping, or a ball reaching a cushion, hole or another ball) and jumping
+ * straight to the earliest one. It records that event in event and returns its reason.
+ */
+static phylib_reason phylib_jump_table(phylib_table *table, phylib_event *event)
+{
+    unsigned int n = table->capacity;
+    phylib_load_state(table);
+
+    double time = PHYLIB_MAX_TIME;
+    unsigned int ball = n;
+    unsigned int other = n;
+
+    for (unsigned int i = 0; i < n; i++)
+    {
+        if (!phylib_is_rolling(table, i))
+        {
+            continue;
+        }
+
+        double stop = phylib_stop_time(table->vel[i], table->acc[i], time);
+        if (stop >= 0.0 && stop < time)
+        {
+            time = stop;
+            ball = i;
+            other = n;
+        }
+
+        for (unsigned int j = 0; j < n; j++)
+        {
+            // a pair of rolling balls is handled once, from the ball with the lower index,
+            // which is the order in which phylib_segment finds them
+            if (j == i || table->object[j] == NULL || (phylib_is_rolling(table, j) && j < i))
+            {
+                continue;
+            }
+
+            double contact = phylib_collision_time(table, i, j, time);
+            if (contact >= 0.0 && contact < time)
+            {
+                time = contact;
+                ball = i;
+                other = j;
+            }
+        }
+    }
+
+    for (unsigned int i = 0; i < n; i++)
+    {
+        if (phylib_is_rolling(table, i))
+        {
+            phylib_roll_state(&table->pos[i], &table->vel[i], &table->acc[i],
+                              table->pos[i], table->vel[i], table->acc[i], time);
+        }
+    }
+    phylib_store_state(table);
+    table->time += time;
+
+    if (ball == n)
+    {
+        return phylib_record_event(event, table, PHYLIB_REASON_TIMEOUT, -1, -1);
+    }
+
+    if (other == n)
+    {
+        // the stop time is only accurate to rounding, so make sure the ball does stop
+        if (!phylib_stopped(table->object[ball]))
+        {
+            table->object[ball]->obj.rolling_ball.vel = phylib_new_coord(0.0, 0.0);
+            phylib_stopped(table->object[ball]);
+        }
+        return phylib_record_event(event, table, PHYLIB_REASON_STOPPED, ball, -1);
+    }
+
+    phylib_object *obj2 = table->object[other];
+    phylib_record_event(event, table, phylib_contact_reason(obj2), ball, other);
+    phylib_bounce(&(table->object[ball]), &obj2);
+    return event->reason;
+}
+
+/**
+ * This function advances the table in place to the end of its current segment, using the given
+ * solver, so that a whole shot can be simulated in a single table without allocating any more
+ * tables. It returns the reason the segment ended, or PHYLIB_REASON_NONE (0) if there was
+ * nothing rolling (or no memory for the step solver), and records the event that ended it in
+ * event (which may be NULL).
+ */
+phylib_reason phylib_advance(phylib_table *table, phylib_solver solver, phylib_event *event)
+{
+    phylib_event ignored;
+
+    if (event == NULL)
+    {
+        event = &ignored;
+    }
+
+    if (phylib_rolling(table) == 0)
+    {
+        return phylib_record_event(event, table, PHYLIB_REASON_NONE, -1, -1);
+    }
+
+    switch (solver)
+    {
+    case PHYLIB_SOLVER_EVENT:
+        return phylib_jump_table(table, event);
+    case PHYLIB_SOLVER_STEP:
+    default:
+        return phylib_step_table(table, event);
+    }
+}
+
+/**
+ * This function returns a segment of a pool shot like phylib_segment, using the given solver to
+ * find where the segment ends.
+ */
+phylib_table *phylib_segment_solver(phylib_table *table, phylib_solver solver)
+{
+
+    if (phylib_rolling(table) == 0)
+    {
+        return NULL;
+    }
+
+    phylib_table *copiedTable = phylib_copy_table(table);
+
+    if (copiedTable != NULL)
+    {
+        phylib_advance(copiedTable, solver, NULL);
+    }
+    return copiedTable;
+}
+
+/**
+ * This function returns a copy of the table in which every ROLLING_BALL has rolled for a period
+ * of time (see phylib_roll), and whose time is that much later. Nothing bounces or stops.
+ */
+phylib_table *phylib_roll_table(phylib_table *table, double time)
+{
+
+    phylib_table *rolledTable = phylib_copy_table(table);
+
+    if (rolledTable == NULL)
+    {
+        return NULL;
+    }
+
+    for (unsigned int i = 0; i < rolledTable->capacity; i++)
+    {
+        if (phylib_is_rolling(rolledTable, i))
+        {
+            phylib_roll(rolledTable->object[i], table->object[i], time);
+        }
+    }
+    phylib_load_state(rolledTable);
+    rolledTable->time = table->time + time;
+
+    return rolledTable;
+}
+
+/**
+ * This function returns the number of balls on the table.
+ */
+unsigned int phylib_ball_count(phylib_table *table)
+{
+    unsigned int count = 0;
+
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        if (table->object[i] != NULL &&
+            (table->object[i]->type == PHYLIB_STILL_BALL ||
+             table->object[i]->type == PHYLIB_ROLLING_BALL))
+        {
+            count++;
+        }
+    }
+    return count;
+}
+
+/**
+ * This function returns the number of frames, one every rate seconds, in the segment that starts
+ * with the table start and ends with the table end.
+ */
+unsigned int phylib_frame_count(phylib_table *start, phylib_table *end, double rate)
+{
+    if (rate <= 0.0 || end->time <= start->time)
+    {
+        return 0;
+    }
+    return (unsigned int)floor((end->time - start->time) / rate);
+}
+
+/**
+ * This function fills frames with the balls of the segment from start to end every rate seconds.
+ * Frame k is start after every ROLLING_BALL has rolled for k * rate seconds (see
+ * phylib_roll_table). Each frame holds phylib_ball_count(start) balls, in table order, and each
+ * ball is PHYLIB_FRAME_FIELDS doubles: its number, x and y. frames must have room for
+ * phylib_frame_count(start, end, rate) such frames.
+ */
+void phylib_fill_frames(phylib_table *start, phylib_table *end, double rate, double *frames)
+{
+    unsigned int count = phylib_frame_count(start, end, rate);
+    unsigned int balls = phylib_ball_count(start);
+    size_t stride = (size_t)balls * PHYLIB_FRAME_FIELDS;
+    unsigned int ball = 0;
+
+    for (unsigned int i = 0; i < start->capacity; i++)
+    {
+        phylib_object *object = start->object[i];
+        if (object == NULL)
+        {
+            continue;
+        }
+
+        double *field = frames + (size_t)ball * PHYLIB_FRAME_FIELDS;
+        if (object->type == PHYLIB_STILL_BALL)
+        {
+            for (unsigned int k = 0; k < count; k++, field += stride)
+            {
+                field[0] = object->obj.still_ball.number;
+                field[1] = object->obj.still_ball.pos.x;
+                field[2] = object->obj.still_ball.pos.y;
+            }
+        }
+        else if (object->type == PHYLIB_ROLLING_BALL)
+        {
+            phylib_rolling_ball *rolling = &object->obj.rolling_ball;
+            for (unsigned int k = 0; k < count; k++, field += stride)
+            {
+                phylib_coord pos, vel, acc = rolling->acc;
+                phylib_roll_state(&pos, &vel, &acc, rolling->pos, rolling->vel, rolling->acc,
+                                  k * rate);
+                field[0] = rolling->number;
+                field[1] = pos.x;
+                field[2] = pos.y;
+            }
+        }
+        else
+        {
+            continue;
+        }
+        ball++;
+    }
+}
+
+/**
+ * This function stores every ball on the table in balls, in table order, as PHYLIB_BALL_FIELDS
+ * doubles each: its number, its type, and its position, velocity and acceleration (which are
+ * zero for a STILL_BALL). balls must have room for phylib_ball_count(table) balls.
+ */
+void phylib_export_balls(phylib_table *table, double *balls)
+{
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        phylib_object *object = table->object[i];
+        if (object == NULL ||
+            (object->type != PHYLIB_STILL_BALL && object->type != PHYLIB_ROLLING_BALL))
+        {
+            continue;
+        }
+
+        // the number and position are in the same place in both kinds of ball
+        phylib_rolling_ball *ball = &object->obj.rolling_ball;
+        unsigned char rolling = object->type == PHYLIB_ROLLING_BALL;
+        balls[0] = ball->number;
+        balls[1] = object->type;
+        balls[2] = ball->pos.x;
+        balls[3] = ball->pos.y;
+        balls[4] = rolling ? ball->vel.x : 0.0;
+        balls[5] = rolling ? ball->vel.y : 0.0;
+        balls[6] = rolling ? ball->acc.x : 0.0;
+        balls[7] = rolling ? ball->acc.y : 0.0;
+        balls += PHYLIB_BALL_FIELDS;
+    }
+}
+
+/**
+ * This function adds count balls, stored as phylib_export_balls stores them, to the table. It
+ * returns how many it added, which is less than count if the table fills up or a ball's type is
+ * not STILL_BALL or ROLLING_BALL.
+ */
+unsigned int phylib_import_balls(phylib_table *table, const double *balls, unsigned int count)
+{
+    for (unsigned int k = 0; k < count; k++, balls += PHYLIB_BALL_FIELDS)
+    {
+        phylib_object object;
+        phylib_coord pos = phylib_new_coord(balls[2], balls[3]);
+
+        if (balls[1] == PHYLIB_STILL_BALL)
+        {
+            object.type = PHYLIB_STILL_BALL;
+            object.obj.still_ball.number = (unsigned char)balls[0];
+            object.obj.still_ball.pos = pos;
+        }
+        else if (balls[1] == PHYLIB_ROLLING_BALL)
+        {
+            object.type = PHYLIB_ROLLING_BALL;
+            object.obj.rolling_ball.number = (unsigned char)balls[0];
+            object.obj.rolling_ball.pos = pos;
+            object.obj.rolling_ball.vel = phylib_new_coord(balls[4], balls[5]);
+            object.obj.rolling_ball.acc = phylib_new_coord(balls[6], balls[7]);
+        }
+        else
+        {
+            return k;
+        }
+
+        if (phylib_place_object(table, &object) < 0)
+        {
+            return k;
+        }
+    }
+    return count;
+}
+
+/**
+ * This function returns the chunk of the shot that holds table (and event) number i, and sets
+ * offset to its place in that chunk. Chunk k holds PHYLIB_SHOT_CHUNK << k of them.
+ */
+static unsigned int phylib_shot_chunk(unsigned int i, unsigned int *offset)
+{
+    unsigned int k = 0;
+    unsigned int size = PHYLIB_SHOT_CHUNK;
+
+    while (i >= size)
+    {
+        i -= size;
+        size *= 2;
+        k++;
+    }
+    *offset = i;
+    return k;
+}
+
+/**
+ * This function makes room for one more table at the end of the shot, adding a chunk twice as
+ * big as the last when the shot is full, and returns that table's (uninitialized) block, or
+ * NULL if the malloc fails. The tables already in the shot do not move.
+ */
+static phylib_table *phylib_shot_extend(phylib_shot *shot)
+{
+    if (shot->count == shot->size)
+    {
+        if (shot->chunks == PHYLIB_SHOT_CHUNKS)
+        {
+            return NULL;
+        }
+
+        size_t tables = (size_t)PHYLIB_SHOT_CHUNK << shot->chunks;
+        char *chunk = malloc(tables * (sizeof(phylib_event) + shot->stride));
+        if (chunk == NULL)
+        {
+            return NULL;
+        }
+        shot->chunk[shot->chunks++] = chunk;
+        shot->size += tables;
+    }
+
+    shot->count++;
+    return phylib_shot_table(shot, shot->count - 1);
+}
+
+/**
+ * This function starts a shot from a copy of table. It returns a phylib_shot holding only that
+ * table (see phylib_shot_step), or NULL if a malloc fails.
+ */
+phylib_shot *phylib_new_shot(phylib_table *table)
+{
+
+    phylib_shot *shot = malloc(sizeof(phylib_shot));
+
+    if (shot == NULL)
+    {
+        return NULL;
+    }
+
+    // every table in a chunk starts on a double boundary
+    size_t align = sizeof(double);
+    shot->count = 0;
+    shot->size = 0;
+    shot->chunks = 0;
+    shot->stride = (phylib_table_size(table->capacity) + align - 1) / align * align;
+
+    phylib_table *start = phylib_shot_extend(shot);
+    if (start == NULL)
+    {
+        phylib_free_shot(shot);
+        return NULL;
+    }
+    phylib_copy_table_into(start, table);
+    phylib_record_event(phylib_shot_event(shot, 0), start, PHYLIB_REASON_NONE, -1, -1);
+    return shot;
+}
+
+/**
+ * This function adds the next segment to the shot: a copy of the shot's last table, advanced in
+ * place to the end of the segment. It returns 1 if it added a segment, 0 if nothing is rolling
+ * on the last table (the shot is over), or -1 if a realloc fails.
+ */
+int phylib_shot_step(phylib_shot *shot, phylib_solver solver)
+{
+    if (phylib_rolling(phylib_shot_table(shot, shot->count - 1)) == 0)
+    {
+        return 0;
+    }
+
+    phylib_table *current = phylib_shot_extend(shot);
+    if (current == NULL)
+    {
+        return -1;
+    }
+    phylib_copy_table_into(current, phylib_shot_table(shot, shot->count - 2));
+    phylib_advance(current, solver, phylib_shot_event(shot, shot->count - 1));
+    return 1;
+}
+
+/**
+ * This function simulates a whole shot in one call. It returns a phylib_shot holding a copy of
+ * table followed by the table at the end of every segment until nothing is rolling, or NULL if
+ * a malloc fails. The tables are kept back to back in a few chunks (see phylib_shot).
+ */
+phylib_shot *phylib_simulate_shot(phylib_table *table, phylib_solver solver)
+{
+
+    phylib_shot *shot = phylib_new_shot(table);
+
+    if (shot == NULL)
+    {
+        return NULL;
+    }
+
+    int stepped;
+    do
+    {
+        stepped = phylib_shot_step(shot, solver);
+    } while (stepped > 0);
+
+    if (stepped < 0)
+    {
+        phylib_free_shot(shot);
+        return NULL;
+    }
+    return shot;
+}
+
+/**
+ * This function returns table number i of the shot: 0 is the table the shot started from, and i
+ * is the table at the end of segment i. The table belongs to the shot.
+ */
+phylib_table *phylib_shot_table(phylib_shot *shot, unsigned int i)
+{
+    if (i >= shot->count)
+    {
+        return NULL;
+    }
+
+    unsigned int offset;
+    unsigned int k = phylib_shot_chunk(i, &offset);
+    size_t tables = (size_t)PHYLIB_SHOT_CHUNK << k;
+    return (phylib_table *)(shot->chunk[k] + tables * sizeof(phylib_event) +
+                            offset * shot->stride);
+}
+
+/**
+ * This function returns the event that ended segment i of the shot (see phylib_shot_table), or
+ * NULL if there is no such segment. The event belongs to the shot.
+ */
+phylib_event *phylib_shot_event(phylib_shot *shot, unsigned int i)
+{
+    if (i >= shot->count)
+    {
+        return NULL;
+    }
+
+    unsigned int offset;
+    unsigned int k = phylib_shot_chunk(i, &offset);
+    return (phylib_event *)shot->chunk[k] + offset;
+}
+
+/**
+ * This function frees the shot and all of its tables.
+ */
+void phylib_free_shot(phylib_shot *shot)
+{
+    for (unsigned int k = 0; k < shot->chunks; k++)
+    {
+        free(shot->chunk[k]);
+    }
+    free(shot);
+}
+
+/**
+ * This function returns the slot of the cue ball (the ball numbered 0) on the table, or -1 if
+ * there is none.
+ */
+static int phylib_cue_slot(phylib_table *table)
+{
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        phylib_object *object = table->object[i];
+
+        // the number and position are in the same place in both kinds of ball
+        if (object != NULL &&
+            (object->type == PHYLIB_STILL_BALL || object->type == PHYLIB_ROLLING_BALL) &&
+            object->obj.still_ball.number == 0)
+        {
+            return i;
+        }
+    }
+    return -1;
+}
+
+/**
+ * This function strikes the cue ball (the ball numbered 0): it becomes a ROLLING_BALL where it
+ * is, with velocity (xvel, yvel) and an acceleration of PHYLIB_DRAG against that velocity (or
+ * none, if the speed is not above PHYLIB_VEL_EPSILON). It returns 0, or -1 if there is no cue
+ * ball on the table.
+ */
+int phylib_strike(phylib_table *table, double xvel, double yvel)
+{
+    int cue = phylib_cue_slot(table);
+
+    if (cue < 0)
+    {
+        return -1;
+    }
+
+    phylib_object *object = table->object[cue];
+    phylib_coord vel = phylib_new_coord(xvel, yvel);
+    phylib_coord acc = phylib_new_coord(0.0, 0.0);
+    double speed = phylib_length(vel);
+    if (speed > PHYLIB_VEL_EPSILON)
+    {
+        acc.x = -vel.x / speed * PHYLIB_DRAG;
+        acc.y = -vel.y / speed * PHYLIB_DRAG;
+    }
+
+    object->type = PHYLIB_ROLLING_BALL;
+    object->obj.rolling_ball.vel = vel;
+    object->obj.rolling_ball.acc = acc;
+    return 0;
+}
+
+/**
+ * The functions below run the shots of a batch together. With PHYLIB_SOLVER_STEP every shot of
+ * the batch is a lane: the segment it is stepping, with its step solver state in one block
+ * shared by all the lanes. Most steps of a shot cannot end its segment, so after each check a
+ * lane works out from the gaps and speeds how long it is certain to stay quiet, and each round
+ * takes it straight to the next step that needs a check. The time is still added up one step at
+ * a time, and the steps that are checked are checked exactly as phylib_step_table checks them,
+ * so every shot ends up bit for bit the same as phylib_simulate_shot leaves it.
+ */
+
+#define PHYLIB_QUIET_GAP (1e-6) // mm of every gap left out of the quiet time, for rounding
+#define PHYLIB_QUIET_STEPS (8)  // steps checked one by one before a short quiet time is redone
+
+typedef struct
+{
+    phylib_table *table; // the segment being stepped, or NULL between segments
+    phylib_step_state state;
+    double start;
+    double time;
+    double quiet; // no step before this time can end the segment
+    unsigned int plain; // checks left before the quiet time is worked out again
+    phylib_broad_phase counted;
+} phylib_lane;
+
+/**
+ * This function returns how long a gap that is closing at the rate closing (negative if it is
+ * opening) certainly stays above zero, when that rate can grow by at most drag every second.
+ */
+static double phylib_quiet_gap(double gap, double closing, double drag)
+{
+    gap -= PHYLIB_QUIET_GAP;
+    if (gap <= 0.0)
+    {
+        return 0.0;
+    }
+
+    // the first root of gap - closing t - (1/2)(drag t^2), in the form that keeps its precision
+    double root = sqrt(closing * closing + 2.0 * drag * gap);
+    if (closing > 0.0)
+    {
+        return 2.0 * gap / (closing + root);
+    }
+    if (drag == 0.0)
+    {
+        return PHYLIB_MAX_TIME;
+    }
+    return (root - closing) / drag;
+}
+
+/**
+ * This function returns how long the velocity component vel of a ball that started the segment
+ * with v1 and a1 stays at PHYLIB_VEL_EPSILON or more (0 if it already has not).
+ */
+static double phylib_quiet_stop(double v1, double a1, double vel)
+{
+    // a component that has changed sign is held at zero (see phylib_roll_state)
+    double held = (v1 < 0) != (vel < 0) ? 0.0 : fabs(vel);
+
+    if (held < PHYLIB_VEL_EPSILON)
+    {
+        return 0.0;
+    }
+    if (a1 == 0.0)
+    {
+        return PHYLIB_MAX_TIME;
+    }
+    return (held - PHYLIB_VEL_EPSILON) / fabs(a1);
+}
+
+/**
+ * This function returns how long a ball at pos, moving at vel and accelerating at acc, certainly
+ * stays clear of the HOLE or CUSHION b.
+ */
+static double phylib_quiet_fixed(phylib_coord pos, phylib_coord vel, phylib_coord acc,
+                                 phylib_object *b)
+{
+    double gap = phylib_fixed_distance(pos, b);
+
+    switch (b->type)
+    {
+    case PHYLIB_HOLE:
+    {
+        phylib_coord r = phylib_sub(pos, b->obj.hole.pos);
+        double d = phylib_length(r);
+        double closing = d > 0.0 ? -phylib_dot_product(r, vel) / d : phylib_length(vel);
+        return phylib_quiet_gap(gap, closing, phylib_length(acc));
+    }
+    case PHYLIB_HCUSHION:
+        return phylib_quiet_gap(gap, pos.y > b->obj.hcushion.y ? -vel.y : vel.y, fabs(acc.y));
+    case PHYLIB_VCUSHION:
+        return phylib_quiet_gap(gap, pos.x > b->obj.vcushion.x ? -vel.x : vel.x, fabs(acc.x));
+    default:
+        return 0.0;
+    }
+}
+
+/**
+ * This function returns how long after time seconds into the segment kept in state no ball of
+ * the table can stop or touch anything, from the positions the balls were rolled to at time.
+ * Within a segment every ball follows p = p1 + v1t + (1/2)(a1t^2) (a velocity held at zero
+ * does not change that), so a gap can close no faster than it is closing now, plus the sum of
+ * the drags for every second after; the bound never goes past the step that ends the segment.
+ */
+static double phylib_quiet_time(phylib_table *table, const phylib_step_state *state, double time)
+{
+    double quiet = PHYLIB_MAX_TIME;
+
+    for (unsigned int i = 0; i < table->capacity; i++)
+    {
+        if (!phylib_is_rolling(table, i))
+        {
+            continue;
+        }
+
+        // the velocity of the path, which no component held at zero changes
+        phylib_coord v1 = state->v1[i];
+        phylib_coord a1 = state->a1[i];
+        phylib_coord vel = phylib_new_coord(v1.x + a1.x * time, v1.y + a1.y * time);
+        double drag = phylib_length(a1);
+        double stop = fmax(phylib_quiet_stop(v1.x, a1.x, vel.x), phylib_quiet_stop(v1.y, a1.y, vel.y));
+
+        quiet = fmin(quiet, stop);
+        phylib_coord pos = table->pos[i];
+
+        for (unsigned int k = 0; k < state->fixedCount; k++)
+        {
+            quiet = fmin(quiet, phylib_quiet_fixed(pos, vel, a1, table->object[state->fixed[k]]));
+        }
+        for (unsigned int k = 0; k < state->ballCount; k++)
+        {
+            unsigned int j = state->balls[k];
+            phylib_coord vel2 = phylib_new_coord(0.0, 0.0);
+            double drag2 = 0.0;
+
+            if (j == i || (j < i && phylib_is_rolling(table, j)))
+            {
+                continue;
+            }
+            if (phylib_is_rolling(table, j))
+            {
+                vel2.x = state->v1[j].x + state->a1[j].x * time;
+                vel2.y = state->v1[j].y + state->a1[j].y * time;
+                drag2 = phylib_length(state->a1[j]);
+            }
+
+            // a pair further apart than both balls can roll before quiet cannot shorten it
+            phylib_coord r = phylib_sub(pos, table->pos[j]);
+            phylib_coord rel = phylib_sub(vel, vel2);
+            double reach = PHYLIB_BALL_DIAMETER + PHYLIB_QUIET_GAP + phylib_length(rel) * quiet +
+                           0.5 * (drag + drag2) * quiet * quiet;
+            if (phylib_dot_product(r, r) >= reach * reach)
+            {
+                continue;
+            }
+
+            double d = phylib_length(r);
+            double closing = -phylib_dot_product(r, rel) / d;
+            quiet = fmin(quiet, phylib_quiet_gap(d - PHYLIB_BALL_DIAMETER, closing, drag + drag2));
+        }
+    }
+    return quiet;
+}
+
+/**
+ * This function works out when the lane next needs a check, time seconds into its segment.
+ */
+static void phylib_lane_quiet(phylib_lane *lane, double time)
+{
+    double quiet = phylib_quiet_time(lane->table, &lane->state, time);
+
+    if (quiet < PHYLIB_QUIET_STEPS * PHYLIB_SIM_RATE)
+    {
+        // nearly at an event: check the next steps one by one before working it out again
+        lane->quiet = 0.0;
+        lane->plain = PHYLIB_QUIET_STEPS;
+    }
+    else
+    {
+        // a step short, for the rounding in adding the time up
+        lane->quiet = time + quiet - PHYLIB_SIM_RATE;
+    }
+}
+
+/**
+ * This function starts the next segment of shot in lane. It returns 1 if it did, 0 if nothing
+ * is rolling on the shot's last table (the shot is over), or -1 if a malloc fails.
+ */
+static int phylib_lane_start(phylib_lane *lane, phylib_shot *shot)
+{
+    if (phylib_rolling(phylib_shot_table(shot, shot->count - 1)) == 0)
+    {
+        return 0;
+    }
+
+    phylib_table *table = phylib_shot_extend(shot);
+    if (table == NULL)
+    {
+        return -1;
+    }
+    phylib_copy_table_into(table, phylib_shot_table(shot, shot->count - 2));
+    phylib_start_step(table, &lane->state);
+
+    lane->table = table;
+    lane->start = table->time;
+    lane->time = PHYLIB_SIM_RATE;
+    lane->counted.tested = 0;
+    lane->counted.avoided = 0;
+
+    // a segment often ends within a few steps of a bounce, so those are checked one by one
+    lane->quiet = 0.0;
+    lane->plain = PHYLIB_QUIET_STEPS;
+    return 1;
+}
+
+/**
+ * This function moves the lane, which is stepping the last segment of shot, forward to its next
+ * check, exactly as phylib_step_table would. Once the segment has ended, the lane's table is
+ * NULL.
+ */
+static void phylib_lane_step(phylib_lane *lane, phylib_shot *shot)
+{
+    phylib_table *table = lane->table;
+    phylib_event *event = phylib_shot_event(shot, shot->count - 1);
+    phylib_reason reason = PHYLIB_REASON_NONE;
+
+    // The steps before the quiet time are only added up, so the time of every step is the same
+    // as in phylib_step_table.
+    while (lane->time <= PHYLIB_MAX_TIME)
+    {
+        lane->time += PHYLIB_SIM_RATE;
+        if (lane->time < lane->quiet)
+        {
+            continue;
+        }
+
+        reason = phylib_check_step(table, &lane->state, lane->start, lane->time, event,
+                                   &lane->counted);
+        if (reason != PHYLIB_REASON_NONE)
+        {
+            break;
+        }
+        if (lane->plain > 0)
+        {
+            lane->plain--;
+        }
+        else
+        {
+            phylib_lane_quiet(lane, lane->time);
+        }
+        return;
+    }
+
+    if (reason == PHYLIB_REASON_NONE)
+    {
+        // the last steps were only added up, so the balls are rolled to the end here
+        phylib_roll_step(table, &lane->state, lane->time);
+        phylib_store_state(table);
+        phylib_record_event(event, table, PHYLIB_REASON_TIMEOUT, -1, -1);
+    }
+    event->broad = lane->counted;
+    lane->table = NULL;
+}
+
+/**
+ * This function will allocate memory for a new, empty phylib_batch (see phylib_batch_add).
+ */
+phylib_batch *phylib_new_batch(void)
+{
+
+    phylib_batch *batch = malloc(sizeof(phylib_batch));
+
+    if (batch == NULL)
+    {
+        return NULL;
+    }
+
+    batch->count = 0;
+    batch->size = 0;
+    batch->shot = NULL;
+    batch->active = NULL;
+    return batch;
+}
+
+/**
+ * This function adds a shot that starts from a copy of table to the batch. It returns the
+ * shot's index in the batch, or -1 if a malloc fails.
+ */
+int phylib_batch_add(phylib_batch *batch, phylib_table *table)
+{
+    if (batch->count == batch->size)
+    {
+        unsigned int size = batch->size == 0 ? 16 : 2 * batch->size;
+
+        phylib_shot **shots = realloc(batch->shot, size * sizeof(phylib_shot *));
+        if (shots == NULL)
+        {
+            return -1;
+        }
+        batch->shot = shots;
+
+        unsigned char *active = realloc(batch->active, size);
+        if (active == NULL)
+        {
+            return -1;
+        }
+        batch->active = active;
+        batch->size = size;
+    }
+
+    phylib_shot *shot = phylib_new_shot(table);
+    if (shot == NULL)
+    {
+        return -1;
+    }
+
+    batch->shot[batch->count] = shot;
+    batch->active[batch->count] = 1;
+    return batch->count++;
+}
+
+/**
+ * This function adds count shots to the batch, each from a copy of table with the cue ball
+ * struck (see phylib_strike) with the velocity (velocities[2k], velocities[2k + 1]). It returns
+ * the index of the first of them, -1 if a malloc fails, or -2 if there is no cue ball on the
+ * table.
+ */
+int phylib_batch_strikes(phylib_batch *batch, phylib_table *table, const double *velocities,
+                         unsigned int count)
+{
+    if (phylib_cue_slot(table) < 0)
+    {
+        return -2;
+    }
+
+    int first = batch->count;
+    for (unsigned int k = 0; k < count; k++)
+    {
+        int index = phylib_batch_add(batch, table);
+        if (index < 0)
+        {
+            return -1;
+        }
+        phylib_strike(phylib_shot_table(batch->shot[index], 0), velocities[2 * k],
+                      velocities[2 * k + 1]);
+    }
+    return first;
+}
+
+/**
+ * This function simulates every shot in the batch to the end, and returns the number of rounds,
+ * or -1 if a malloc fails. The shots advance in lock step, and a shot is masked out (active
+ * becomes 0) once nothing on it is rolling. With PHYLIB_SOLVER_STEP the shots are kept in lanes
+ * (see phylib_lane) and each round takes every active shot to its next check; with
+ * PHYLIB_SOLVER_EVENT each round adds the next segment to every active shot. Either way every
+ * shot ends up exactly as phylib_simulate_shot leaves it: the tables and events are bit for bit
+ * the same.
+ */
+int phylib_batch_run(phylib_batch *batch, phylib_solver solver)
+{
+    unsigned int remaining = 0;
+    unsigned int capacity = 0;
+    int rounds = 0;
+
+    for (unsigned int i = 0; i < batch->count; i++)
+    {
+        unsigned int size = phylib_shot_table(batch->shot[i], 0)->capacity;
+        capacity = size > capacity ? size : capacity;
+    }
+
+    // the shots still going, packed at the front so the masked out ones cost nothing
+    unsigned int *live = malloc(batch->count * sizeof(unsigned int) + 1);
+    phylib_lane *lanes = NULL;
+    char *block = NULL;
+
+    if (solver == PHYLIB_SOLVER_STEP)
+    {
+        lanes = malloc(batch->count * sizeof(phylib_lane) + 1);
+        block = malloc(batch->count * phylib_step_size(capacity) + 1);
+    }
+    if (live == NULL || (solver == PHYLIB_SOLVER_STEP && (lanes == NULL || block == NULL)))
+    {
+        free(live);
+        free(lanes);
+        free(block);
+        return -1;
+    }
+
+    for (unsigned int i = 0; i < batch->count; i++)
+    {
+        if (batch->active[i])
+        {
+            live[remaining++] = i;
+        }
+        if (lanes != NULL)
+        {
+            phylib_layout_step(&lanes[i].state, block + i * phylib_step_size(capacity), capacity);
+            lanes[i].table = NULL;
+        }
+    }
+
+    while (remaining > 0 && rounds >= 0)
+    {
+        unsigned int kept = 0;
+
+        for (unsigned int k = 0; k < remaining; k++)
+        {
+            unsigned int i = live[k];
+            int stepped = 1;
+
+            if (lanes == NULL)
+            {
+                stepped = phylib_shot_step(batch->shot[i], solver);
+            }
+            else
+            {
+                if (lanes[i].table == NULL)
+                {
+                    stepped = phylib_lane_start(&lanes[i], batch->shot[i]);
+                }
+                if (stepped > 0)
+                {
+                    phylib_lane_step(&lanes[i], batch->shot[i]);
+                }
+            }
+
+            if (stepped < 0)
+            {
+                rounds = -1;
+                break;
+            }
+            if (stepped == 0)
+            {
+                batch->active[i] = 0;
+            }
+            else
+            {
+                live[kept++] = i;
+            }
+        }
+        if (rounds >= 0)
+        {
+            remaining = kept;
+            rounds++;
+        }
+    }
+
+    free(live);
+    free(lanes);
+    free(block);
+    return rounds;
+}
+
+/**
+ * This function returns shot number i of the batch. The shot belongs to the batch.
+ */
+phylib_shot *phylib_batch_shot(phylib_batch *batch, unsigned int i)
+{
+    if (i >= batch->count)
+    {
+        return NULL;
+    }
+    return batch->shot[i];
+}
+
+/**
+ * This function frees the batch and all of its shots.
+ */
+void phylib_free_batch(phylib_batch *batch)
+{
+    for (unsigned int i = 0; i < batch->count; i++)
+    {
+        phylib_free_shot(batch->shot[i]);
+    }
+    free(batch->shot);
+    free(batch->active);
+    free(batch);
+}
+
+char *phylib_object_string(phylib_object *object)
+{
+    static char string[80];
+    if (object == NULL)
+    {
+        snprintf(string, 80, "NULL;");
+        return string;
+    }
+    switch (object->type)
+    {
+    case PHYLIB_STILL_BALL:
+        snprintf(string, 80,
+                 "STILL_BALL (%d,%6.1lf,%6.1lf)",
+                 object->obj.still_ball.number,
+                 object->obj.still_ball.pos.x,
+                 object->obj.still_ball.pos.y);
+        break;
+    case PHYLIB_ROLLING_BALL:
+        snprintf(string, 80,
+                 "ROLLING_BALL (%d,%6.1lf,%6.1lf,%6.1lf,%6.1lf,%6.1lf,%6.1lf)",
+                 object->obj.rolling_ball.number,
+                 object->obj.rolling_ball.pos.x,
+                 object->obj.rolling_ball.pos.y,
+                 object->obj.rolling_ball.vel.x,
+                 object->obj.rolling_ball.vel.y,
+                 object->obj.rolling_ball.acc.x,
+                 object->obj.rolling_ball.acc.y);
+        break;
+    case PHYLIB_HOLE:
+        snprintf(string, 80,
+                 "HOLE (%6.1lf,%6.1lf)",
+                 object->obj.hole.pos.x,
+                 object->obj.hole.pos.y);
+        break;
+    case PHYLIB_HCUSHION:
+        snprintf(string, 80,
+                 "HCUSHION (%6.1lf)",
+                 object->obj.hcushion.y);
+        break;
+    case PHYLIB_VCUSHION:
+        snprintf(string, 80,
+                 "VCUSHION (%6.1lf)",
+                 object->obj.vcushion.x);
+        break;
+    case PHYLIB_NO_OBJECT:
+        snprintf(string, 80, "NULL;");
+        break;
+    }
+    return string;
+}
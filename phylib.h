@@ -1,139 +1,256 @@
-#ifndef PHYLIB_H
-#define PHYLIB_H
-
-// Constants
-#define PHYLIB_BALL_RADIUS (28.5) // mm
-#define PHYLIB_BALL_DIAMETER (2 * PHYLIB_BALL_RADIUS)
-#define PHYLIB_HOLE_RADIUS (2 * PHYLIB_BALL_DIAMETER)
-#define PHYLIB_TABLE_LENGTH (2700.0)                   // mm
-#define PHYLIB_TABLE_WIDTH (PHYLIB_TABLE_LENGTH / 2.0) // mm
-#define PHYLIB_SIM_RATE (0.0001)                       // s
-#define PHYLIB_VEL_EPSILON (0.01)                      // mm/s
-#define PHYLIB_DRAG (150.0)                            // mm/s^2
-#define PHYLIB_MAX_TIME (600)                          // s
-#define PHYLIB_MAX_OBJECTS (26)
-
-// Polymorphic object types defined as enum (enums are like grouped constants)
-typedef enum
-{
-    PHYLIB_STILL_BALL = 0,
-    PHYLIB_ROLLING_BALL = 1,
-    PHYLIB_HOLE = 2,
-    PHYLIB_HCUSHION = 3,
-    PHYLIB_VCUSHION = 4,
-} phylib_obj;
-
-// Class representing a vector in 2 dimensions
-typedef struct
-{
-    double x;
-    double y;
-} phylib_coord;
-
-/**
- * (Child) Classes representing objects on the table
- */
-
-// First, a ball that is not in motion (i.e. still). It has a number (cue ball is 0)
-// and a position on the table.
-typedef struct
-{
-    unsigned char number;
-    phylib_coord pos;
-} phylib_still_ball;
-
-// Next, a ball that is rolling (i.e. not still). It has a number (cue ball is 0)
-// and a position on the table. It also has a velocity and a (negative) acceleration
-//(due to friction).
-typedef struct
-{
-    unsigned char number;
-    phylib_coord pos;
-    phylib_coord vel;
-    phylib_coord acc;
-} phylib_rolling_ball;
-
-// Next, one of the 6 holes on the table. It has a position.
-typedef struct
-{
-    phylib_coord pos;
-} phylib_hole;
-
-// Next, a horizontal cushion (i.e. a cushion along either of the two the short sides of the table).
-// It has only a y-coordinate.
-typedef struct
-{
-    double y;
-} phylib_hcushion;
-
-// Rather predictably, a vertical cushion
-//(i.e. a cushion along either of the two the long sides of the table).
-// It has only an x-coordinate.
-typedef struct
-{
-    double x;
-} phylib_vcushion;
-
-/**
- * Polymorphic Parent Class of objects on the table
- */
-
-// First, we need a C union that can store any of the above classes/structure in the same space.
-// While this union can store an object of any of the above classes/structures,
-// it cannot identify what the class of the object is, so we need another structure for that.
-typedef union
-{
-    phylib_still_ball still_ball;
-    phylib_rolling_ball rolling_ball;
-    phylib_hole hole;
-    phylib_hcushion hcushion;
-    phylib_vcushion vcushion;
-} phylib_untyped;
-
-// Here, the type is the enum indicating the class of the object, and obj is the object itself.
-// We can now use phylib_object to represent a generic object in the billiards world
-typedef struct
-{
-    phylib_obj type;
-    phylib_untyped obj;
-} phylib_object;
-
-// Finally, the table. As the game proceeds there will be multiple table configurations at
-// different points in time, so each table “knows” its time. There can be a maximum of 26 objects
-// on the table: 15 numbered balls, 1 cue ball, 4 cushions, and 6 holes.
-typedef struct
-{
-    double time;
-    phylib_object *object[PHYLIB_MAX_OBJECTS];
-} phylib_table;
-
-// Function prototypes
-phylib_object *phylib_new_still_ball(unsigned char number, phylib_coord *pos);
-phylib_object *phylib_new_rolling_ball(unsigned char number,
-                                       phylib_coord *pos,
-                                       phylib_coord *vel,
-                                       phylib_coord *acc);
-phylib_object *phylib_new_hole(phylib_coord *pos);
-phylib_object *phylib_new_hcushion(double y);
-phylib_object *phylib_new_vcushion(double x);
-phylib_table *phylib_new_table(void);
-
-phylib_coord phylib_new_coord(double x, double y);
-
-void phylib_copy_object(phylib_object **dest, phylib_object **src);
-phylib_table *phylib_copy_table(phylib_table *table);
-void phylib_add_object(phylib_table *table, phylib_object *object);
-void phylib_free_table(phylib_table *table);
-phylib_coord phylib_sub(phylib_coord c1, phylib_coord c2);
-double phylib_length(phylib_coord c);
-double phylib_dot_product(phylib_coord a, phylib_coord b);
-double phylib_distance(phylib_object *obj1, phylib_object *obj2);
-void phylib_roll(phylib_object *new, phylib_object *old, double time);
-unsigned char phylib_stopped(phylib_object *object);
-void phylib_bounce(phylib_object **a, phylib_object **b);
-unsigned char phylib_rolling(phylib_table *t);
-phylib_table *phylib_segment(phylib_table *table);
-
-char *phylib_object_string(phylib_object *object);
-
-#endif
+#ifndef PHYLIB_H
+#define PHYLIB_H
+
+#include <stddef.h>
+
+// Constants
+#define PHYLIB_BALL_RADIUS (28.5) // mm
+#define PHYLIB_BALL_DIAMETER (2 * PHYLIB_BALL_RADIUS)
+#define PHYLIB_HOLE_RADIUS (2 * PHYLIB_BALL_DIAMETER)
+#define PHYLIB_TABLE_LENGTH (2700.0)                   // mm
+#define PHYLIB_TABLE_WIDTH (PHYLIB_TABLE_LENGTH / 2.0) // mm
+#define PHYLIB_SIM_RATE (0.0001)                       // s
+#define PHYLIB_VEL_EPSILON (0.01)                      // mm/s
+#define PHYLIB_DRAG (150.0)                            // mm/s^2
+#define PHYLIB_MAX_TIME (600)                          // s
+#define PHYLIB_MAX_OBJECTS (26)
+#define PHYLIB_FIXED_OBJECTS (10) // 4 cushions and 6 holes
+#define PHYLIB_FRAME_FIELDS (3)   // number, x and y of a ball in a frame
+#define PHYLIB_BALL_FIELDS (8)    // number, type, x, y, vx, vy, ax, ay of an exported ball
+#define PHYLIB_SHOT_CHUNK (16)    // tables in the first chunk of a shot; each chunk doubles
+#define PHYLIB_SHOT_CHUNKS (28)   // enough chunks for any unsigned int number of tables
+
+// Polymorphic object types defined as enum (enums are like grouped constants)
+typedef enum
+{
+    PHYLIB_STILL_BALL = 0,
+    PHYLIB_ROLLING_BALL = 1,
+    PHYLIB_HOLE = 2,
+    PHYLIB_HCUSHION = 3,
+    PHYLIB_VCUSHION = 4,
+    PHYLIB_NO_OBJECT = 5, // only used in a table's type array, for an empty slot
+} phylib_obj;
+
+// The ways phylib_segment_solver can find the end of a segment: by stepping time forward in
+// PHYLIB_SIM_RATE increments, or by computing the time of the next event directly.
+typedef enum
+{
+    PHYLIB_SOLVER_STEP = 0,
+    PHYLIB_SOLVER_EVENT = 1,
+} phylib_solver;
+
+// Class representing a vector in 2 dimensions
+typedef struct
+{
+    double x;
+    double y;
+} phylib_coord;
+
+/**
+ * (Child) Classes representing objects on the table
+ */
+
+// First, a ball that is not in motion (i.e. still). It has a number (cue ball is 0)
+// and a position on the table.
+typedef struct
+{
+    unsigned char number;
+    phylib_coord pos;
+} phylib_still_ball;
+
+// Next, a ball that is rolling (i.e. not still). It has a number (cue ball is 0)
+// and a position on the table. It also has a velocity and a (negative) acceleration
+//(due to friction).
+typedef struct
+{
+    unsigned char number;
+    phylib_coord pos;
+    phylib_coord vel;
+    phylib_coord acc;
+} phylib_rolling_ball;
+
+// Next, one of the 6 holes on the table. It has a position.
+typedef struct
+{
+    phylib_coord pos;
+} phylib_hole;
+
+// Next, a horizontal cushion (i.e. a cushion along either of the two the short sides of the table).
+// It has only a y-coordinate.
+typedef struct
+{
+    double y;
+} phylib_hcushion;
+
+// Rather predictably, a vertical cushion
+//(i.e. a cushion along either of the two the long sides of the table).
+// It has only an x-coordinate.
+typedef struct
+{
+    double x;
+} phylib_vcushion;
+
+/**
+ * Polymorphic Parent Class of objects on the table
+ */
+
+// First, we need a C union that can store any of the above classes/structure in the same space.
+// While this union can store an object of any of the above classes/structures,
+// it cannot identify what the class of the object is, so we need another structure for that.
+typedef union
+{
+    phylib_still_ball still_ball;
+    phylib_rolling_ball rolling_ball;
+    phylib_hole hole;
+    phylib_hcushion hcushion;
+    phylib_vcushion vcushion;
+} phylib_untyped;
+
+// Here, the type is the enum indicating the class of the object, and obj is the object itself.
+// We can now use phylib_object to represent a generic object in the billiards world
+typedef struct
+{
+    phylib_obj type;
+    phylib_untyped obj;
+} phylib_object;
+
+// Finally, the table. As the game proceeds there will be multiple table configurations at
+// different points in time, so each table “knows” its time. The number of objects a table can
+// hold is set when it is created; the standard table holds PHYLIB_MAX_OBJECTS = 26 objects:
+// 15 numbered balls, 1 cue ball, 4 cushions, and 6 holes.
+// The objects are stored in the table itself (slot), and object[i] is either NULL or &slot[i].
+// Alongside the objects, the table keeps the state of its balls as a struct of arrays indexed
+// by slot (number, pos, vel and acc are zero where type is not a ball). The simulation works
+// on these contiguous arrays; phylib_load_state refreshes them from the objects.
+// The table and all of its arrays are a single block of memory.
+typedef struct
+{
+    double time;
+    unsigned int capacity;
+    phylib_object *slot;
+    phylib_object **object;
+    phylib_obj *type;
+    unsigned char *number;
+    phylib_coord *pos;
+    phylib_coord *vel;
+    phylib_coord *acc;
+} phylib_table;
+
+// Why a segment of a shot ended: a ball stopped, a ball reached a cushion, a hole or another
+// ball, or PHYLIB_MAX_TIME passed. PHYLIB_REASON_NONE means there was nothing rolling.
+typedef enum
+{
+    PHYLIB_REASON_NONE = 0,
+    PHYLIB_REASON_STOPPED = 1,
+    PHYLIB_REASON_CUSHION = 2,
+    PHYLIB_REASON_HOLE = 3,
+    PHYLIB_REASON_BALL = 4,
+    PHYLIB_REASON_TIMEOUT = 5,
+} phylib_reason;
+
+// The counts the step solver keeps for a segment: pairs given the exact phylib_distance test, and
+// pairs that the broad phase (a bounding-box check for cushions and holes, sweep and prune along
+// y for balls) ruled out without one. They are zero for the event solver, and a batch only counts
+// the steps it checks (see phylib_batch_run).
+typedef struct
+{
+    unsigned long tested;
+    unsigned long avoided;
+} phylib_broad_phase;
+
+// What ended a segment: the reason, the slot of the ball it happened to (or -1 for
+// PHYLIB_REASON_NONE and PHYLIB_REASON_TIMEOUT) and that ball's number, the slot of the object
+// the ball touched (or -1 if it stopped), and the time and position of the ball when it
+// happened. broad is the broad-phase counts of the segment.
+typedef struct
+{
+    phylib_reason reason;
+    int ball;
+    int other;
+    unsigned char number;
+    double time;
+    phylib_coord pos;
+    phylib_broad_phase broad;
+} phylib_event;
+
+// A whole shot: the table the shot started from, followed by the table at the end of each
+// segment, and the event that ended each segment (event 0, for the starting table, is
+// PHYLIB_REASON_NONE). They are stored in chunks of PHYLIB_SHOT_CHUNK, then twice as many, and so
+// on; each chunk holds its events and then its tables back to back (stride bytes apart). A chunk
+// never moves once it is allocated, so a table of the shot stays put while the shot grows.
+typedef struct
+{
+    unsigned int count;
+    unsigned int size;
+    unsigned int chunks;
+    size_t stride;
+    char *chunk[PHYLIB_SHOT_CHUNKS];
+} phylib_shot;
+
+// A batch of shots that are simulated together (see phylib_batch_run). active[i] is 0 once
+// shot i is over.
+typedef struct
+{
+    unsigned int count;
+    unsigned int size;
+    phylib_shot **shot;
+    unsigned char *active;
+} phylib_batch;
+
+// Function prototypes
+phylib_object *phylib_new_still_ball(unsigned char number, phylib_coord *pos);
+phylib_object *phylib_new_rolling_ball(unsigned char number,
+                                       phylib_coord *pos,
+                                       phylib_coord *vel,
+                                       phylib_coord *acc);
+phylib_object *phylib_new_hole(phylib_coord *pos);
+phylib_object *phylib_new_hcushion(double y);
+phylib_object *phylib_new_vcushion(double x);
+phylib_table *phylib_new_table(void);
+phylib_table *phylib_new_sized_table(unsigned int capacity);
+
+phylib_coord phylib_new_coord(double x, double y);
+
+void phylib_copy_object(phylib_object **dest, phylib_object **src);
+phylib_table *phylib_copy_table(phylib_table *table);
+void phylib_copy_table_into(phylib_table *dest, phylib_table *table);
+void phylib_add_object(phylib_table *table, phylib_object *object);
+int phylib_place_object(phylib_table *table, const phylib_object *object);
+void phylib_free_table(phylib_table *table);
+void phylib_load_state(phylib_table *table);
+void phylib_store_state(phylib_table *table);
+phylib_coord phylib_sub(phylib_coord c1, phylib_coord c2);
+double phylib_length(phylib_coord c);
+double phylib_dot_product(phylib_coord a, phylib_coord b);
+double phylib_distance(phylib_object *obj1, phylib_object *obj2);
+void phylib_roll(phylib_object *new, phylib_object *old, double time);
+unsigned char phylib_stopped(phylib_object *object);
+void phylib_bounce(phylib_object **a, phylib_object **b);
+unsigned int phylib_rolling(phylib_table *t);
+phylib_table *phylib_segment(phylib_table *table);
+phylib_table *phylib_segment_solver(phylib_table *table, phylib_solver solver);
+phylib_reason phylib_advance(phylib_table *table, phylib_solver solver, phylib_event *event);
+phylib_table *phylib_roll_table(phylib_table *table, double time);
+unsigned int phylib_ball_count(phylib_table *table);
+unsigned int phylib_frame_count(phylib_table *start, phylib_table *end, double rate);
+void phylib_fill_frames(phylib_table *start, phylib_table *end, double rate, double *frames);
+void phylib_export_balls(phylib_table *table, double *balls);
+unsigned int phylib_import_balls(phylib_table *table, const double *balls, unsigned int count);
+phylib_shot *phylib_new_shot(phylib_table *table);
+int phylib_shot_step(phylib_shot *shot, phylib_solver solver);
+phylib_shot *phylib_simulate_shot(phylib_table *table, phylib_solver solver);
+phylib_table *phylib_shot_table(phylib_shot *shot, unsigned int i);
+phylib_event *phylib_shot_event(phylib_shot *shot, unsigned int i);
+void phylib_free_shot(phylib_shot *shot);
+int phylib_strike(phylib_table *table, double xvel, double yvel);
+phylib_batch *phylib_new_batch(void);
+int phylib_batch_add(phylib_batch *batch, phylib_table *table);
+int phylib_batch_strikes(phylib_batch *batch, phylib_table *table, const double *velocities,
+                         unsigned int count);
+int phylib_batch_run(phylib_batch *batch, phylib_solver solver);
+phylib_shot *phylib_batch_shot(phylib_batch *batch, unsigned int i);
+void phylib_free_batch(phylib_batch *batch);
+
+char *phylib_object_string(phylib_object *object);
+
+#endif
@@ -7,13 +7,71 @@
 /******************************************************************************/
 
 /* based on phylib.c and phylib.h */
-%module phylib
+%module(threads="1") phylib
 %{
   #include "phylib.h"
 %}
 
+/* a (char *buffer, size_t size) argument is any writable Python buffer (bytearray, array, ...) */
+%include <pybuffer.i>
+%pybuffer_mutable_binary(char *buffer, size_t size);
+
+/* (char *frames, size_t size) is the same, but the buffer stays held until the call returns, */
+/* so it cannot be resized or freed while a call that released the GIL is writing into it.   */
+%typemap(in) (char *frames, size_t size) (Py_buffer view, int held = 0) {
+  if ( PyObject_GetBuffer( $input, &view, PyBUF_WRITABLE ) < 0 )
+  {
+    PyErr_Clear();
+    SWIG_exception_fail( SWIG_TypeError, "in method '$symname', argument $argnum of type "
+                         "'(char *frames, size_t size)'" );
+  }
+  held = 1;
+  $1 = (char *)view.buf;
+  $2 = (size_t)view.len;
+}
+%typemap(freearg) (char *frames, size_t size) {
+  if ( held$argnum )
+  {
+    PyBuffer_Release( &view$argnum );
+  }
+}
+
+/******************************************************************************/
+
+/* Only the simulation calls, which never touch Python objects, release the   */
+/* GIL, so other Python threads can run (or simulate) while they work. The    */
+/* buffer fill_frames writes into is held until it returns (see above).       */
+%nothread;
+%thread phylib_table::segment;
+%thread phylib_table::advance;
+%thread phylib_table::simulate;
+%thread phylib_table::fill_frames;
+%thread phylib_batch::simulate;
+
 /******************************************************************************/
 
+/* the table's capacity and arrays are owned by the C library */
+%immutable phylib_table::capacity;
+%immutable phylib_table::slot;
+%immutable phylib_table::object;
+%immutable phylib_table::type;
+%immutable phylib_table::number;
+%immutable phylib_table::pos;
+%immutable phylib_table::vel;
+%immutable phylib_table::acc;
+%immutable phylib_shot::count;
+%immutable phylib_shot::size;
+%immutable phylib_shot::chunks;
+%immutable phylib_shot::stride;
+%immutable phylib_shot::chunk;
+%immutable phylib_batch::count;
+%immutable phylib_batch::size;
+%immutable phylib_batch::shot;
+%immutable phylib_batch::active;
+
+/* shots only come from phylib_table.simulate */
+%nodefaultctor phylib_shot;
+
 %include "phylib.h"
 
 /******************************************************************************/
@@ -105,43 +163,199 @@
 
 /******************************************************************************/
 
+/* these return new tables, which Python frees when it is done with them */
+%newobject phylib_table::copy;
+%newobject phylib_table::segment;
+%newobject phylib_table::roll;
+%newobject phylib_table::simulate;
+
+/* the constructor sets a Python exception when it returns NULL */
+%exception phylib_table::phylib_table {
+  $action
+  if ( !result ) SWIG_fail;
+}
+
+/* fill_frames fails when the buffer is too small */
+%exception phylib_table::fill_frames {
+  $action
+  if ( result < 0 )
+  {
+    PyErr_SetString( PyExc_ValueError, "buffer too small" );
+    SWIG_fail;
+  }
+}
+
+/* export_balls fails when the buffer is too small */
+%exception phylib_table::export_balls {
+  $action
+  if ( result < 0 )
+  {
+    PyErr_SetString( PyExc_ValueError, "buffer too small" );
+    SWIG_fail;
+  }
+}
+
+/* copy, roll and simulate fail when a malloc fails */
+%exception phylib_table::copy {
+  $action
+  if ( !result )
+  {
+    PyErr_SetString( PyExc_ValueError, "malloc error" );
+    SWIG_fail;
+  }
+}
+
+%exception phylib_table::roll {
+  $action
+  if ( !result )
+  {
+    PyErr_SetString( PyExc_ValueError, "malloc error" );
+    SWIG_fail;
+  }
+}
+
+%exception phylib_table::simulate {
+  $action
+  if ( !result )
+  {
+    PyErr_SetString( PyExc_ValueError, "malloc error" );
+    SWIG_fail;
+  }
+}
+
 %extend phylib_table {
 
   /****************************************************************************/
 
   /* constructor methods that calls new array */
-  phylib_table()
+  phylib_table( unsigned int capacity = PHYLIB_MAX_OBJECTS )
   {
-    return phylib_new_table();
+    phylib_table *ptr = phylib_new_sized_table( capacity );
+    if (!ptr)
+    {
+      PyErr_SetString( PyExc_ValueError, "bad capacity or malloc error" );
+      return NULL;
+    }
+    return ptr;
   }
 
   /****************************************************************************/
 
   phylib_table *copy()
   {
-    phylib_table *ptr = phylib_copy_table( $self );
-    if (!ptr)
+    return phylib_copy_table( $self );
+  }
+
+  /****************************************************************************/
+
+  phylib_table *segment( phylib_solver solver = PHYLIB_SOLVER_STEP )
+  {
+    return phylib_segment_solver( $self, solver );
+  }
+
+  /****************************************************************************/
+
+  /* advance this table in place to the end of its segment */
+  phylib_event advance( phylib_solver solver = PHYLIB_SOLVER_STEP )
+  {
+    phylib_event event;
+    phylib_advance( $self, solver, &event );
+    return event;
+  }
+
+  /****************************************************************************/
+
+  phylib_table *roll( double time )
+  {
+    return phylib_roll_table( $self, time );
+  }
+
+  /****************************************************************************/
+
+  unsigned int ball_count()
+  {
+    return phylib_ball_count( $self );
+  }
+
+  /****************************************************************************/
+
+  unsigned int frame_count( phylib_table *end, double rate )
+  {
+    return phylib_frame_count( $self, end, rate );
+  }
+
+  /****************************************************************************/
+
+  /* fill frames with the frames of the segment from this table to end */
+  int fill_frames( phylib_table *end, double rate, char *frames, size_t size )
+  {
+    size_t needed = (size_t)phylib_frame_count( $self, end, rate ) *
+                    phylib_ball_count( $self ) * PHYLIB_FRAME_FIELDS * sizeof( double );
+    if ( size < needed )
     {
-      PyErr_SetString( PyExc_ValueError, "malloc error" );
-      return NULL;
+      return -1;
     }
-    return ptr;
+    phylib_fill_frames( $self, end, rate, (double *)frames );
+    return 0;
+  }
+
+  /****************************************************************************/
+
+  /* fill buffer with every ball on the table, PHYLIB_BALL_FIELDS doubles each */
+  int export_balls( char *buffer, size_t size )
+  {
+    if ( size < (size_t)phylib_ball_count( $self ) * PHYLIB_BALL_FIELDS * sizeof( double ) )
+    {
+      return -1;
+    }
+    phylib_export_balls( $self, (double *)buffer );
+    return 0;
   }
 
   /****************************************************************************/
 
-  phylib_table *segment()
+  /* add the balls in buffer, returning how many were added */
+  unsigned int import_balls( char *buffer, size_t size )
   {
-    return phylib_segment( $self );
+    return phylib_import_balls( $self, (double *)buffer,
+                                size / ( PHYLIB_BALL_FIELDS * sizeof( double ) ) );
+  }
+
+  /****************************************************************************/
+
+  /* a tuple of ( index, type ) for every occupied slot */
+  PyObject *occupied()
+  {
+    unsigned int count = 0;
+    for ( unsigned int i = 0; i < $self->capacity; i++ )
+    {
+      count += $self->object[i] != NULL;
+    }
+
+    PyObject *slots = PyTuple_New( count );
+    if ( !slots )
+    {
+      return NULL;
+    }
+    count = 0;
+    for ( unsigned int i = 0; i < $self->capacity; i++ )
+    {
+      if ( $self->object[i] != NULL )
+      {
+        PyTuple_SET_ITEM( slots, count++,
+                          Py_BuildValue( "(Ii)", i, (int)$self->object[i]->type ) );
+      }
+    }
+    return slots;
   }
 
   /****************************************************************************/
 
-  phylib_object *get_object( unsigned char i )
+  phylib_object *get_object( unsigned int i )
   {
     // added if statement to make this not generate segmentation fault when
     // invalid indices are provided
-    if ( (i>=0) && (i<PHYLIB_MAX_OBJECTS))
+    if ( i < $self->capacity )
     {
       return $self->object[i];
     }
@@ -150,12 +364,26 @@
 
   /****************************************************************************/
 
-  void add_object( phylib_object *object1 )
+  /* simulate the whole shot in one call */
+  phylib_shot *simulate( phylib_solver solver = PHYLIB_SOLVER_STEP )
+  {
+    return phylib_simulate_shot( $self, solver );
+  }
+
+  /****************************************************************************/
+
+  /* make the cue ball roll with the given velocity; -1 if there is none */
+  int strike( double xvel, double yvel )
   {
-    phylib_object *ptr;
+    return phylib_strike( $self, xvel, yvel );
+  }
+
+  /****************************************************************************/
 
-    phylib_copy_object( &ptr, &object1 );
-    phylib_add_object( self, ptr );
+  void add_object( phylib_object *object1 )
+  {
+    // the object is copied into the table's own storage
+    phylib_place_object( $self, object1 );
   }
 
   /****************************************************************************/
@@ -166,3 +394,144 @@
     phylib_free_table( $self );
   }
 };
+
+/******************************************************************************/
+
+%extend phylib_shot {
+
+  /****************************************************************************/
+
+  /* the tables belong to the shot */
+  phylib_table *get_table( unsigned int i )
+  {
+    return phylib_shot_table( $self, i );
+  }
+
+  /****************************************************************************/
+
+  phylib_reason get_reason( unsigned int i )
+  {
+    if ( i < $self->count )
+    {
+      return phylib_shot_event( $self, i )->reason;
+    }
+    return PHYLIB_REASON_NONE;
+  }
+
+  /****************************************************************************/
+
+  /* the events belong to the shot */
+  phylib_event *get_event( unsigned int i )
+  {
+    return phylib_shot_event( $self, i );
+  }
+
+  /****************************************************************************/
+
+  ~phylib_shot()
+  {
+    phylib_free_shot( $self );
+  }
+};
+
+/******************************************************************************/
+
+/* batch methods set a Python exception when a malloc fails */
+%exception phylib_batch::phylib_batch {
+  $action
+  if ( !result ) SWIG_fail;
+}
+%exception phylib_batch::add_table {
+  $action
+  if ( result < 0 ) SWIG_fail;
+}
+%exception phylib_batch::add_strikes {
+  $action
+  if ( result < 0 ) SWIG_fail;
+}
+%exception phylib_batch::simulate {
+  $action
+  if ( result < 0 )
+  {
+    PyErr_SetString( PyExc_MemoryError, "malloc error" );
+    SWIG_fail;
+  }
+}
+
+%extend phylib_batch {
+
+  /****************************************************************************/
+
+  phylib_batch()
+  {
+    phylib_batch *ptr = phylib_new_batch();
+    if (!ptr)
+    {
+      PyErr_SetString( PyExc_MemoryError, "malloc error" );
+      return NULL;
+    }
+    return ptr;
+  }
+
+  /****************************************************************************/
+
+  /* start a new shot from a copy of table, returning its index */
+  int add_table( phylib_table *table )
+  {
+    int index = phylib_batch_add( $self, table );
+    if ( index < 0 )
+    {
+      PyErr_SetString( PyExc_MemoryError, "malloc error" );
+    }
+    return index;
+  }
+
+  /****************************************************************************/
+
+  /* start a shot from a copy of table for every ( xvel, yvel ) pair of doubles */
+  /* in buffer, with the cue ball struck, returning the index of the first      */
+  int add_strikes( phylib_table *table, char *buffer, size_t size )
+  {
+    int index = phylib_batch_strikes( $self, table, (double *)buffer,
+                                      size / ( 2 * sizeof( double ) ) );
+    if ( index == -1 )
+    {
+      PyErr_SetString( PyExc_MemoryError, "malloc error" );
+    }
+    else if ( index < 0 )
+    {
+      PyErr_SetString( PyExc_ValueError, "the table has no cue ball" );
+    }
+    return index;
+  }
+
+  /****************************************************************************/
+
+  /* simulate every shot to the end, returning the number of rounds */
+  int simulate( phylib_solver solver = PHYLIB_SOLVER_STEP )
+  {
+    return phylib_batch_run( $self, solver );
+  }
+
+  /****************************************************************************/
+
+  /* the shots belong to the batch */
+  phylib_shot *get_shot( unsigned int i )
+  {
+    return phylib_batch_shot( $self, i );
+  }
+
+  /****************************************************************************/
+
+  unsigned char is_active( unsigned int i )
+  {
+    return i < $self->count && $self->active[i];
+  }
+
+  /****************************************************************************/
+
+  ~phylib_batch()
+  {
+    phylib_free_batch( $self );
+  }
+};
@@ -0,0 +1,144 @@
+// Player for the shots returned by Shot.replay in Physics.py (and the /replay.json page of
+// server.py). A shot is the state of the table at the start of every segment, and every ball
+// moves with constant acceleration until the next one, so the frames are worked out here in
+// the browser instead of on the server.
+
+// Returns the segments of replay with every ball on the table in each one, as
+// [ { time: time, balls: Map( number -> ball ) }, ... ] (a segment of replay only lists the
+// balls that changed since the one before it).
+function replaySegments( replay )
+{
+    var segments = [];
+    var balls = new Map();
+    replay.segments.forEach( function( segment )
+    {
+        balls = new Map( balls );
+        segment.gone.forEach( function( number )
+        {
+            balls.delete( number );
+        } );
+        segment.balls.forEach( function( ball )
+        {
+            balls.set( ball[0], ball );
+        } );
+        segments.push( { time: segment.time, balls: balls } );
+    } );
+    return segments;
+}
+
+// Returns [ x, y, vx, vy, ax, ay ] of ball after it has rolled for time seconds, the same way
+// as phylib_roll in phylib.c: p = p1 + v1t + (1/2)(a1t^2) and v = v1 + a1t, and a velocity that
+// changes sign is set to zero along with its acceleration. A still ball doesn't move.
+function rollBall( ball, time )
+{
+    if ( ball.length < 7 )
+    {
+        return [ ball[1], ball[2], 0, 0, 0, 0 ];
+    }
+    var x = ball[1], y = ball[2], vx = ball[3], vy = ball[4], ax = ball[5], ay = ball[6];
+    var state = [ x + vx * time + 0.5 * ax * time * time,
+                  y + vy * time + 0.5 * ay * time * time,
+                  vx + ax * time,
+                  vy + ay * time,
+                  ax,
+                  ay ];
+    if ( ( vx < 0 ) != ( state[2] < 0 ) )
+    {
+        state[2] = 0;
+        state[4] = 0;
+    }
+    if ( ( vy < 0 ) != ( state[3] < 0 ) )
+    {
+        state[3] = 0;
+        state[5] = 0;
+    }
+    return state;
+}
+
+// Returns the frame of segments (see replaySegments) at the time time of the shot, as
+// [ [ number, x, y ], ... ].
+function replayFrame( segments, time )
+{
+    var i = 0;
+    while ( i + 1 < segments.length && segments[i + 1].time <= time )
+    {
+        i++;
+    }
+    var frame = [];
+    segments[i].balls.forEach( function( ball )
+    {
+        var state = rollBall( ball, Math.max( time - segments[i].time, 0 ) );
+        frame.push( [ ball[0], state[0], state[1] ] );
+    } );
+    return frame;
+}
+
+// Returns every frame of the shot, one every rate seconds, as Shot.all_frames does in
+// Physics.py: the frames of each segment in turn, then the last table.
+function replayFrames( replay, rate )
+{
+    var segments = replaySegments( replay );
+    var frames = [];
+    for ( var i = 1; i < segments.length; i++ )
+    {
+        var start = segments[i - 1];
+        var count = Math.floor( ( segments[i].time - start.time ) / rate );
+        for ( var k = 0; k < count; k++ )
+        {
+            var frame = [];
+            start.balls.forEach( function( ball )
+            {
+                var state = rollBall( ball, k * rate );
+                frame.push( [ ball[0], state[0], state[1] ] );
+            } );
+            frames.push( frame );
+        }
+    }
+    var last = segments[segments.length - 1];
+    frames.push( replayFrame( segments, last.time ) );
+    return frames;
+}
+
+// Plays replay in real time by moving the circles of svg, whose ids are the ball numbers (see
+// Table.svg in Physics.py). A ball that leaves the table is hidden.
+function playReplay( replay, svg )
+{
+    var segments = replaySegments( replay );
+    var begin = segments[0].time;
+    var end = segments[segments.length - 1].time;
+    var started = null;
+
+    function draw( now )
+    {
+        if ( started === null )
+        {
+            started = now;
+        }
+        var time = Math.min( begin + ( now - started ) / 1000.0, end );
+        var shown = new Set();
+        replayFrame( segments, time ).forEach( function( ball )
+        {
+            var circle = svg.getElementById( String( ball[0] ) );
+            if ( circle )
+            {
+                circle.setAttribute( "cx", ball[1] );
+                circle.setAttribute( "cy", ball[2] );
+                circle.setAttribute( "visibility", "visible" );
+                shown.add( ball[0] );
+            }
+        } );
+        segments[0].balls.forEach( function( ball, number )
+        {
+            var circle = svg.getElementById( String( number ) );
+            if ( circle && !shown.has( number ) )
+            {
+                circle.setAttribute( "visibility", "hidden" );
+            }
+        } );
+        if ( time < end )
+        {
+            window.requestAnimationFrame( draw );
+        }
+    }
+    window.requestAnimationFrame( draw );
+}